@@ -0,0 +1,45 @@
+# agent_streaming.py
+# Streaming helpers shared by the tutorials' utils/interaction.py and notion_agent/chat.py.
+import time
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.genai import types
+
+
+def _event_text(event):
+    return "".join(part.text for part in event.content.parts if part.text and not part.thought)
+
+
+async def stream_agent_async(query, runner, user_id, session_id, timings=None):
+    """Yields the agent's response text in chunks, as soon as the runner emits them.
+
+    The run uses SSE streaming, so the model's partial events arrive while it
+    is still generating. The aggregated event that closes each streamed
+    response is not yielded again; a response that arrives in one piece
+    (a model without streaming support) is yielded whole.
+
+    Pass a dict as `timings` to get `time_to_first_token` and `time_to_final`
+    (seconds since the query was sent) filled in.
+    """
+    content = types.Content(role='user', parts=[types.Part(text=query)])
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+    start = time.perf_counter()
+    streamed = False  # whether the current model response already went out as chunks
+    async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content,
+                                        run_config=run_config):
+        text = _event_text(event) if event.content and event.content.parts else ""
+        if event.partial:
+            if text:
+                streamed = True
+                if timings is not None and "time_to_first_token" not in timings:
+                    timings["time_to_first_token"] = time.perf_counter() - start
+                yield text
+            continue
+        if event.is_final_response():
+            if timings is not None:
+                timings["time_to_final"] = time.perf_counter() - start
+            if text and not streamed:
+                if timings is not None and "time_to_first_token" not in timings:
+                    timings["time_to_first_token"] = timings["time_to_final"]
+                yield text
+        streamed = False
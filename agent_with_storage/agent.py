@@ -0,0 +1,40 @@
+from google.adk.agents import Agent
+from google.adk.tools.tool_context import ToolContext
+
+
+def add_reminder(reminder: str, tool_context: ToolContext) -> dict:
+    """Adds a reminder to the user's list.
+
+    Args:
+        reminder (str): The reminder text.
+
+    Returns:
+        dict: status and the updated list of reminders.
+    """
+    reminders = tool_context.state.get("reminders", []) + [reminder]
+    # Assigning the key records it in the event's state_delta, which is all
+    # the session service has to write.
+    tool_context.state["reminders"] = reminders
+    return {"status": "success", "reminders": reminders}
+
+
+def get_reminders(tool_context: ToolContext) -> dict:
+    """Returns the user's reminders.
+
+    Returns:
+        dict: status and the list of reminders.
+    """
+    return {"status": "success", "reminders": tool_context.state.get("reminders", [])}
+
+
+root_agent = Agent(
+    name="reminder_agent",
+    model="gemini-2.0-flash",
+    description="Keeps a list of reminders that survives restarts.",
+    instruction=(
+        "You help the user keep track of reminders. "
+        "Use 'add_reminder' to store a new reminder and 'get_reminders' to list them. "
+        "The user's name is {user_name}."
+    ),
+    tools=[add_reminder, get_reminders],
+)
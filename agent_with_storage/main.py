@@ -0,0 +1,53 @@
+# Run from the repo root: python -m agent_with_storage.main
+# Sessions are kept in sessions.db, so running it again continues the same conversation.
+import asyncio
+
+from dotenv import load_dotenv
+from google.adk.runners import Runner
+from google.genai import types
+
+from agent_with_storage.agent import root_agent
+from agent_with_storage.sqlite_session_service import SqliteSessionService
+
+load_dotenv()
+
+APP_NAME = "Reminder Bot"
+USER_ID = "user_1"
+
+initial_state = {
+    "user_name": "Brandon Hancock",
+    "reminders": [],
+}
+
+
+async def main():
+    session_service = SqliteSessionService("sessions.db")
+
+    existing = await session_service.list_sessions(app_name=APP_NAME, user_id=USER_ID)
+    if existing.sessions:
+        session_id = existing.sessions[-1].id
+        print(f"Continuing session: {session_id}")
+    else:
+        session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, state=initial_state)
+        session_id = session.id
+        print(f"Created new session: {session_id}")
+
+    runner = Runner(agent=root_agent, app_name=APP_NAME, session_service=session_service)
+    print("Type 'exit' to quit.")
+    try:
+        while True:
+            user_input = input("You: ")
+            if user_input.lower() in ("exit", "quit"):
+                break
+            new_message = types.Content(role="user", parts=[types.Part(text=user_input)])
+            async for event in runner.run_async(user_id=USER_ID, session_id=session_id, new_message=new_message):
+                if event.is_final_response() and event.content and event.content.parts:
+                    print(f"Agent: {event.content.parts[0].text}")
+    finally:
+        # Writes any buffered events before exiting.
+        await runner.close()
+        session_service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
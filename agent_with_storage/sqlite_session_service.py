@@ -0,0 +1,288 @@
+# sqlite_session_service.py
+import json
+import sqlite3
+import time
+import uuid
+from typing import Any, Optional
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.errors.session_not_found_error import SessionNotFoundError
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS session_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, key)
+);
+CREATE TABLE IF NOT EXISTS user_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, key)
+);
+CREATE TABLE IF NOT EXISTS app_state (
+    app_name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, key)
+);
+"""
+
+# Every statement is a fixed, parameterised string, so sqlite3's per-connection
+# statement cache compiles each one once and reuses it (prepared statements).
+INSERT_SESSION = "INSERT INTO sessions (app_name, user_id, id, update_time) VALUES (?, ?, ?, ?)"
+TOUCH_SESSION = "UPDATE sessions SET update_time = ? WHERE app_name = ? AND user_id = ? AND id = ?"
+SELECT_SESSION = "SELECT update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?"
+INSERT_EVENT = "INSERT INTO events (app_name, user_id, session_id, timestamp, event) VALUES (?, ?, ?, ?, ?)"
+SELECT_EVENTS = ("SELECT event FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+                 " AND timestamp >= ? ORDER BY seq")
+SELECT_RECENT_EVENTS = ("SELECT event FROM (SELECT seq, event FROM events WHERE app_name = ? AND user_id = ?"
+                        " AND session_id = ? AND timestamp >= ? ORDER BY seq DESC LIMIT ?) ORDER BY seq")
+UPSERT_SESSION_STATE = ("INSERT INTO session_state (app_name, user_id, session_id, key, value) VALUES (?, ?, ?, ?, ?)"
+                        " ON CONFLICT (app_name, user_id, session_id, key) DO UPDATE SET value = excluded.value")
+UPSERT_USER_STATE = ("INSERT INTO user_state (app_name, user_id, key, value) VALUES (?, ?, ?, ?)"
+                     " ON CONFLICT (app_name, user_id, key) DO UPDATE SET value = excluded.value")
+UPSERT_APP_STATE = ("INSERT INTO app_state (app_name, key, value) VALUES (?, ?, ?)"
+                    " ON CONFLICT (app_name, key) DO UPDATE SET value = excluded.value")
+SELECT_SESSION_STATE = "SELECT key, value FROM session_state WHERE app_name = ? AND user_id = ? AND session_id = ?"
+SELECT_USER_STATE = "SELECT key, value FROM user_state WHERE app_name = ? AND user_id = ?"
+SELECT_APP_STATE = "SELECT key, value FROM app_state WHERE app_name = ?"
+LIST_SESSIONS = "SELECT user_id, id, update_time FROM sessions WHERE app_name = ? ORDER BY update_time, user_id, id"
+LIST_USER_SESSIONS = ("SELECT user_id, id, update_time FROM sessions WHERE app_name = ? AND user_id = ?"
+                      " ORDER BY update_time, user_id, id")
+DELETE_SESSION = "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?"
+DELETE_EVENTS = "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+DELETE_SESSION_STATE = "DELETE FROM session_state WHERE app_name = ? AND user_id = ? AND session_id = ?"
+
+
+def split_state(state):
+    """Split a state dict into (app, user, session) parts by key prefix;
+    temp: keys are never persisted."""
+    app, user, session = {}, {}, {}
+    for key, value in (state or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            app[key[len(State.APP_PREFIX):]] = value
+        elif key.startswith(State.USER_PREFIX):
+            user[key[len(State.USER_PREFIX):]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session[key] = value
+    return app, user, session
+
+
+class SqliteSessionService(BaseSessionService):
+    """Drop-in replacement for InMemorySessionService that persists to SQLite.
+
+    - WAL journal with synchronous=NORMAL: readers never block the writer and
+      a commit is an append to the log rather than an fsync of the database.
+    - State is stored one row per key, and an event only upserts the keys in
+      its state_delta, so a write costs O(delta) instead of O(state).
+    - Appended events are buffered and written `batch_size` at a time in a
+      single transaction. Reads, deletes and flush() (which Runner.close()
+      calls) write the buffer first, so callers always see their own writes;
+      a crash can lose at most the unflushed batch. batch_size=1 writes
+      every event through immediately.
+    """
+
+    def __init__(self, db_path="sessions.db", batch_size=32):
+        self.batch_size = max(1, batch_size)
+        self.connection = sqlite3.connect(db_path, isolation_level=None, cached_statements=64)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self._known_sessions = set()
+        self._pending = {
+            "events": [],
+            "touch": {},            # (app, user, session) -> update_time
+            "session_state": {},    # (app, user, session, key) -> json
+            "user_state": {},       # (app, user, key) -> json
+            "app_state": {},        # (app, key) -> json
+        }
+        self._pending_events = 0
+
+    def close(self):
+        self._write_pending()
+        self.connection.close()
+
+    async def flush(self) -> None:
+        self._write_pending()
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        self._write_pending()
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        now = time.time()
+        app_state, user_state, session_state = split_state(state)
+        with self._transaction():
+            try:
+                self.connection.execute(INSERT_SESSION, (app_name, user_id, session_id, now))
+            except sqlite3.IntegrityError:
+                raise AlreadyExistsError(f"Session with id {session_id} already exists.") from None
+            self._upsert_state(app_name, user_id, session_id, app_state, user_state, session_state)
+        self._known_sessions.add((app_name, user_id, session_id))
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=self._merged_state(app_name, user_id, session_id),
+            last_update_time=now,
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        self._write_pending()
+        row = self.connection.execute(SELECT_SESSION, (app_name, user_id, session_id)).fetchone()
+        if row is None:
+            return None
+        self._known_sessions.add((app_name, user_id, session_id))
+
+        after = config.after_timestamp if config and config.after_timestamp is not None else float("-inf")
+        if config and config.num_recent_events is not None:
+            rows = self.connection.execute(
+                SELECT_RECENT_EVENTS, (app_name, user_id, session_id, after, config.num_recent_events))
+        else:
+            rows = self.connection.execute(SELECT_EVENTS, (app_name, user_id, session_id, after))
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=self._merged_state(app_name, user_id, session_id),
+            events=[Event.model_validate_json(event) for (event,) in rows],
+            last_update_time=row[0],
+        )
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        self._write_pending()
+        if user_id is None:
+            rows = self.connection.execute(LIST_SESSIONS, (app_name,)).fetchall()
+        else:
+            rows = self.connection.execute(LIST_USER_SESSIONS, (app_name, user_id)).fetchall()
+        return ListSessionsResponse(sessions=[
+            Session(app_name=app_name, user_id=uid, id=sid, state=self._merged_state(app_name, uid, sid),
+                    last_update_time=update_time)
+            for uid, sid, update_time in rows
+        ])
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._write_pending()
+        key = (app_name, user_id, session_id)
+        with self._transaction():
+            self.connection.execute(DELETE_EVENTS, key)
+            self.connection.execute(DELETE_SESSION_STATE, key)
+            self.connection.execute(DELETE_SESSION, key)
+        self._known_sessions.discard(key)
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> dict[str, Any]:
+        self._write_pending()
+        return {key: json.loads(value)
+                for key, value in self.connection.execute(SELECT_USER_STATE, (app_name, user_id))}
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        if key not in self._known_sessions:
+            if self.connection.execute(SELECT_SESSION, key).fetchone() is None:
+                raise SessionNotFoundError(f"Session {session.id} not found.")
+            self._known_sessions.add(key)
+
+        # Applies the delta to the caller's session object and drops temp: keys.
+        event = await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        pending = self._pending
+        pending["events"].append((*key, event.timestamp, event.model_dump_json(exclude_none=True)))
+        pending["touch"][key] = event.timestamp
+        if event.actions and event.actions.state_delta:
+            app_state, user_state, session_state = split_state(event.actions.state_delta)
+            for name, value in session_state.items():
+                pending["session_state"][(*key, name)] = json.dumps(value)
+            for name, value in user_state.items():
+                pending["user_state"][(session.app_name, session.user_id, name)] = json.dumps(value)
+            for name, value in app_state.items():
+                pending["app_state"][(session.app_name, name)] = json.dumps(value)
+
+        if len(pending["events"]) >= self.batch_size:
+            self._write_pending()
+        return event
+
+    def _write_pending(self):
+        pending = self._pending
+        if not pending["events"]:
+            return
+        # Later deltas to the same key overwrite earlier ones in the buffer,
+        # so each key is written once per batch.
+        with self._transaction():
+            self.connection.executemany(INSERT_EVENT, pending["events"])
+            self.connection.executemany(UPSERT_SESSION_STATE, [(*k, v) for k, v in pending["session_state"].items()])
+            self.connection.executemany(UPSERT_USER_STATE, [(*k, v) for k, v in pending["user_state"].items()])
+            self.connection.executemany(UPSERT_APP_STATE, [(*k, v) for k, v in pending["app_state"].items()])
+            self.connection.executemany(TOUCH_SESSION, [(t, *k) for k, t in pending["touch"].items()])
+        for buffer in pending.values():
+            buffer.clear()
+
+    def _upsert_state(self, app_name, user_id, session_id, app_state, user_state, session_state):
+        self.connection.executemany(UPSERT_APP_STATE, [(app_name, k, json.dumps(v)) for k, v in app_state.items()])
+        self.connection.executemany(UPSERT_USER_STATE,
+                                    [(app_name, user_id, k, json.dumps(v)) for k, v in user_state.items()])
+        self.connection.executemany(UPSERT_SESSION_STATE,
+                                    [(app_name, user_id, session_id, k, json.dumps(v)) for k, v in session_state.items()])
+
+    def _merged_state(self, app_name, user_id, session_id):
+        state = {key: json.loads(value)
+                 for key, value in self.connection.execute(SELECT_SESSION_STATE, (app_name, user_id, session_id))}
+        for key, value in self.connection.execute(SELECT_USER_STATE, (app_name, user_id)):
+            state[State.USER_PREFIX + key] = json.loads(value)
+        for key, value in self.connection.execute(SELECT_APP_STATE, (app_name,)):
+            state[State.APP_PREFIX + key] = json.loads(value)
+        return state
+
+    def _transaction(self):
+        return _Transaction(self.connection)
+
+
+class _Transaction:
+    """BEGIN/COMMIT around a block (the connection runs in autocommit mode)."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
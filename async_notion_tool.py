@@ -0,0 +1,163 @@
+# async_notion_tool.py
+import asyncio
+import os
+import weakref
+import httpx
+from notion_tool import NotionDatabaseTool, RETRY_STATUSES, MAX_PAGE_SIZE, PREFETCH_DEPTH
+
+# Shared by every AsyncNotionDatabaseTool (and so every agent session) in the
+# process. Notion allows about three requests per second per integration, so
+# more in-flight requests than that only buys 429s.
+NOTION_MAX_CONCURRENCY = int(os.getenv("NOTION_MAX_CONCURRENCY", "3"))
+# One semaphore per event loop: asyncio primitives are bound to the loop that
+# first uses them, and every asyncio.run() starts a new one.
+_request_slots_by_loop = weakref.WeakKeyDictionary()
+
+
+def _request_slots():
+    loop = asyncio.get_running_loop()
+    slots = _request_slots_by_loop.get(loop)
+    if slots is None:
+        slots = _request_slots_by_loop[loop] = asyncio.Semaphore(NOTION_MAX_CONCURRENCY)
+    return slots
+
+# End-of-stream marker for the prefetch queue.
+_DONE = object()
+
+
+class AsyncNotionDatabaseTool(NotionDatabaseTool):
+    """NotionDatabaseTool with non-blocking queries for use inside the ADK event loop.
+
+    The replica, delta filter, retry policy and property mapping are shared
+    with the blocking tool; only the transport is swapped for httpx.
+    """
+
+    def __init__(self, notion_token, database_id, **kwargs):
+        super().__init__(notion_token, database_id, **kwargs)
+        self._loop = None
+        self._client = None
+        self._sync_lock = None
+
+    def _bind_loop(self):
+        """Rebuild the loop-bound client and lock when called from a new event loop.
+
+        The old client's connections belong to a loop that is gone (or busy
+        elsewhere), so it is dropped rather than closed from here.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._client = None
+            self._sync_lock = asyncio.Lock()
+
+    @property
+    def client(self):
+        # Created lazily so it is bound to the loop the runner is actually using.
+        self._bind_loop()
+        if self._client is None:
+            connect_timeout, read_timeout = self.timeout
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_keepalive_connections=NOTION_MAX_CONCURRENCY,
+                                    max_connections=NOTION_MAX_CONCURRENCY),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+
+    async def query_database_with_pagination_async(self, filter=None, sorts=None, page_size=MAX_PAGE_SIZE, limit=None):
+        all_results = []
+        async for results in self.iter_result_pages_async(filter, sorts, page_size, limit):
+            all_results.extend(results)
+        return all_results
+
+    async def iter_result_pages_async(self, filter=None, sorts=None, page_size=MAX_PAGE_SIZE, limit=None):
+        url = self.query_url
+        fetched = 0
+        has_more = True
+        start_cursor = None
+
+        while has_more:
+            payload = self._page_payload(filter, sorts, page_size, limit, fetched, start_cursor)
+
+            data = await self._post_async(url, payload)
+
+            results = data.get('results', [])
+            if limit is not None:
+                results = results[:limit - fetched]
+            fetched += len(results)
+            yield results
+            if limit is not None and fetched >= limit:
+                return
+            has_more = data.get('has_more', False)
+            start_cursor = data.get('next_cursor', None)
+
+    async def iter_result_pages_prefetched_async(self, filter=None, sorts=None, page_size=MAX_PAGE_SIZE, limit=None,
+                                                 depth=PREFETCH_DEPTH):
+        """iter_result_pages_async with a producer task that keeps up to
+        `depth` pages in flight ahead of the consumer."""
+        pages = asyncio.Queue(maxsize=max(1, depth))
+
+        async def produce():
+            try:
+                async for results in self.iter_result_pages_async(filter, sorts, page_size, limit):
+                    await pages.put(results)
+                await pages.put(_DONE)
+            except Exception as e:
+                await pages.put(e)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await pages.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
+
+    async def sync_async(self, full=False, prefetch=PREFETCH_DEPTH):
+        """Async counterpart of sync(); concurrent callers are serialised so
+        the replica is only updated by one sync at a time."""
+        self._bind_loop()
+        async with self._sync_lock:
+            batch = self._start_sync(self._needs_full_sync(full))
+            async for results in self.iter_result_pages_prefetched_async(filter=batch["filter"], depth=prefetch):
+                self._stage_results(batch, results)
+            return self._commit_sync(batch)
+
+    async def _post_async(self, url, payload):
+        attempt = 0
+        while True:
+            self.stats["requests"] += 1
+            try:
+                async with _request_slots():
+                    response = await self.client.post(url, json=payload)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response.json()
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+
+            attempt += 1
+            self.stats["retries"] += 1
+            self.stats["backoff_seconds"] += delay
+            # Back off outside the semaphore so other sessions can use the slot.
+            await asyncio.sleep(delay)
+
+
+async def sync_all_async(tools, prefetch=PREFETCH_DEPTH):
+    """Sync several databases concurrently (still within the shared request cap).
+    Returns {database_id: pages}."""
+    results = await asyncio.gather(*(tool.sync_async(prefetch=prefetch) for tool in tools))
+    return {tool.database_id: pages for tool, pages in zip(tools, results)}
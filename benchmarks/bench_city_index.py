@@ -0,0 +1,78 @@
+# benchmarks/bench_city_index.py
+# Run from the repo root: python -m benchmarks.bench_city_index
+import random
+import time
+import tracemalloc
+
+from weather_backend.city_index import CityIndex
+
+SIZES = (1_000, 100_000, 200_000)
+QUERIES = 2_000
+SYLLABLES = ("ka", "ro", "mi", "lan", "do", "ber", "sto", "vil", "ne", "port", "sa", "ta", "gra", "ham",
+             "bur", "ton", "li", "ma", "zu", "ok", "el", "an", "del", "cas", "fu", "wen", "ri", "quo")
+
+
+def synthetic_cities(count, seed=0):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        if rng.random() < 0.2:
+            name += " " + "".join(rng.choice(SYLLABLES) for _ in range(2)).capitalize()
+        names.add(name)
+    return sorted(names)
+
+
+def typo(name, rng):
+    """One random deletion, insertion, substitution or transposition."""
+    chars = list(name.lower())
+    i = rng.randrange(len(chars))
+    edit = rng.randrange(4)
+    if edit == 0 and len(chars) > 3:
+        del chars[i]
+    elif edit == 1:
+        chars.insert(i, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+    elif edit == 2:
+        chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    elif i + 1 < len(chars):
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return "".join(chars)
+
+
+def main():
+    rng = random.Random(1)
+    for size in SIZES:
+        names = synthetic_cities(size)
+        start = time.perf_counter()
+        index = CityIndex(names)
+        build_seconds = time.perf_counter() - start
+        # Memory from a second build, so tracing does not slow the timed one.
+        tracemalloc.start()
+        CityIndex(names)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        targets = [rng.choice(names) for _ in range(QUERIES)]
+        queries = [typo(name, rng) for name in targets]
+        start = time.perf_counter()
+        results = [index.resolve(query) for query in queries]
+        lookup_seconds = time.perf_counter() - start
+        # A typo can turn one synthetic name into another real one, so count both.
+        # Unresolved queries are ambiguous or too far off: the tools answer them
+        # with suggestions instead of a guess, so "wrong" is the number to watch.
+        hits = sum(1 for target, result in zip(targets, results) if result and result[0] == target)
+        resolved = sum(1 for result in results if result)
+
+        start = time.perf_counter()
+        for name in targets:
+            index.resolve(name)
+        exact_seconds = time.perf_counter() - start
+
+        print(f"{size:>9,} cities  build {build_seconds:6.2f} s  peak {peak / 1e6:6.1f} MB  |  "
+              f"typo lookup {lookup_seconds / QUERIES * 1e6:7.1f} µs  top-1 {hits / QUERIES:6.1%}  "
+              f"resolved {resolved / QUERIES:6.1%}  wrong {(resolved - hits) / QUERIES:5.1%}  |  "
+              f"exact {exact_seconds / QUERIES * 1e6:5.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
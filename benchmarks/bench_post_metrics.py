@@ -0,0 +1,51 @@
+# benchmarks/bench_post_metrics.py
+# Run from the repo root: python -m benchmarks.bench_post_metrics
+import time
+
+from benchmarks.synthetic_posts import synthetic_table
+from post_metrics import add_standard_metrics, engagement_rate, percentile_rank, rolling_mean
+
+ROWS = 100_000
+REPEATS = 5
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def loop_engagement_rate(rows):
+    # The per-post loop get_all_posts_data used before post_metrics existed.
+    for post in rows:
+        if post['Impression Count'] > 0:
+            post['Engagement Rate'] = round(
+                (post['Like Count'] + post['Retweet Count'] + post['Reply Count']) / post['Impression Count'] * 100, 2
+            )
+        else:
+            post['Engagement Rate'] = 0
+
+
+def main():
+    table = synthetic_table(ROWS)
+    rows = table.rows()
+    rate = engagement_rate(table)
+
+    cases = {
+        "engagement_rate (python loop)": lambda: loop_engagement_rate(rows),
+        "engagement_rate": lambda: engagement_rate(table),
+        "percentile_rank": lambda: percentile_rank(rate),
+        "rolling_mean (30 days)": lambda: rolling_mean(table, rate, 30),
+        "add_standard_metrics": lambda: add_standard_metrics(table),
+    }
+    print(f"{ROWS:,} posts, best of {REPEATS}")
+    for name, fn in cases.items():
+        seconds = best_of(fn)
+        print(f"  {name:<32} {seconds * 1000:9.2f} ms  {seconds / ROWS * 1e9:8.1f} ns/post")
+
+
+if __name__ == "__main__":
+    main()
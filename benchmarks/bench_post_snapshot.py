@@ -0,0 +1,45 @@
+# benchmarks/bench_post_snapshot.py
+# Run from the repo root: python -m benchmarks.bench_post_snapshot
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic_posts import synthetic_table
+from notion_export import write_json
+from post_snapshot import load_snapshot, write_snapshot
+from post_table import PostTable
+
+SIZES = (1_000, 100_000)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return PostTable.from_records(json.load(f)["data"])
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in SIZES:
+            table = synthetic_table(rows)
+            json_path = os.path.join(directory, f"posts-{rows}.json")
+            snapshot_path = os.path.join(directory, f"posts-{rows}.snap")
+            write_json((table.row(i) for i in range(rows)), json_path)
+            write_snapshot(table, snapshot_path)
+
+            _, json_seconds = timed(lambda: load_json(json_path))
+            loaded, snapshot_seconds = timed(lambda: load_snapshot(snapshot_path))
+            _, sum_seconds = timed(lambda: int(loaded.counts["Impression Count"].sum()))
+            print(f"{rows:>9,} posts  json {os.path.getsize(json_path) / 1e6:7.1f} MB  load {json_seconds * 1000:9.2f} ms"
+                  f"  |  snapshot {os.path.getsize(snapshot_path) / 1e6:7.1f} MB  load {snapshot_seconds * 1000:7.3f} ms"
+                  f"  first column scan {sum_seconds * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_session_service.py
+# Run from the repo root: python -m benchmarks.bench_session_service
+import asyncio
+import os
+import tempfile
+import time
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from agent_with_storage.sqlite_session_service import SqliteSessionService
+
+APP_NAME = "bench"
+SESSIONS = 200
+EVENTS_PER_SESSION = 50
+
+
+def make_event(i):
+    return Event(
+        author="user" if i % 2 == 0 else "agent",
+        invocation_id=f"inv-{i // 2}",
+        content=types.Content(role="user", parts=[types.Part(text=f"message number {i} " + "x" * 200)]),
+        actions=EventActions(state_delta={"turn": i, "user:last_seen": i}),
+    )
+
+
+async def run(service):
+    timings = {}
+    start = time.perf_counter()
+    sessions = [await service.create_session(app_name=APP_NAME, user_id=f"user-{i % 20}", state={"n": i})
+                for i in range(SESSIONS)]
+    timings["create"] = (SESSIONS, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(EVENTS_PER_SESSION):
+        for session in sessions:
+            await service.append_event(session, make_event(i))
+    await service.flush()
+    timings["append"] = (SESSIONS * EVENTS_PER_SESSION, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for session in sessions:
+        loaded = await service.get_session(app_name=APP_NAME, user_id=session.user_id, session_id=session.id)
+        assert len(loaded.events) == EVENTS_PER_SESSION
+    timings["get"] = (SESSIONS, time.perf_counter() - start)
+    return timings
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        services = [
+            ("in-memory", InMemorySessionService()),
+            ("sqlite batch=1", SqliteSessionService(os.path.join(directory, "one.db"), batch_size=1)),
+            ("sqlite batch=32", SqliteSessionService(os.path.join(directory, "batched.db"))),
+        ]
+        for name, service in services:
+            timings = await run(service)
+            line = "  ".join(f"{op} {count / seconds:10,.0f}/s" for op, (count, seconds) in timings.items())
+            print(f"{name:<16} {line}")
+            if isinstance(service, SqliteSessionService):
+                service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+# benchmarks/bench_weather_backend.py
+# Run from the repo root: python -m benchmarks.bench_weather_backend
+import json
+import os
+import tempfile
+import timeit
+
+from weather_backend.backend import JsonFileProvider, WeatherBackend, load_backend
+
+CALLS = 200_000
+QUERIES = ("London", "new york", "NYC", "Londn", "Atlantis")
+
+
+def get_weather_per_call(city, preferred_unit="Celsius"):
+    """The tools before the shared backend: rebuild the data and format the report on every call."""
+    city_normalized = city.lower().replace(" ", "")
+    mock_weather_db = {
+        "newyork": {"temp_c": 25, "condition": "sunny"},
+        "london": {"temp_c": 15, "condition": "cloudy"},
+        "tokyo": {"temp_c": 18, "condition": "light rain"},
+    }
+    if city_normalized in mock_weather_db:
+        data = mock_weather_db[city_normalized]
+        temp_c = data["temp_c"]
+        if preferred_unit == "Fahrenheit":
+            temp_value, temp_unit = temp_c * 9 / 5 + 32, "°F"
+        else:
+            temp_value, temp_unit = temp_c, "°C"
+        report = f"The weather in {city.capitalize()} is {data['condition']} with a temperature of {temp_value:.0f}{temp_unit}."
+        return {"status": "success", "report": report}
+    return {"status": "error", "error_message": f"Sorry, I don't have weather information for '{city}'."}
+
+
+def get_weather_backend(backend, city, preferred_unit="Celsius"):
+    match = backend.resolve(city)
+    if match is not None:
+        return match.tool_result(match.report.text(preferred_unit))
+    return {"status": "error", "error_message": f"Sorry, I don't have weather information for '{city}'."}
+
+
+def per_call_ns(fn, *args):
+    return min(timeit.repeat(lambda: fn(*args), number=CALLS, repeat=3)) / CALLS * 1e9
+
+
+def main():
+    backend = load_backend()
+    print(f"{'query':>10}  {'per call':>10}  {'backend':>10}")
+    for query in QUERIES:
+        before = per_call_ns(get_weather_per_call, query, "Fahrenheit")
+        after = per_call_ns(get_weather_backend, backend, query, "Fahrenheit")
+        print(f"{query:>10}  {before:8.0f} ns  {after:8.0f} ns")
+
+    # Loading from a file only happens at startup or on reload().
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "weather.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({f"City {i}": {"temp_c": i % 40, "condition": "sunny"} for i in range(10_000)}, f)
+        seconds = min(timeit.repeat(lambda: WeatherBackend(JsonFileProvider(path)), number=1, repeat=3))
+        print(f"\nload + index 10,000 cities from JSON: {seconds * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
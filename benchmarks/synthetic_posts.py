@@ -0,0 +1,40 @@
+# benchmarks/synthetic_posts.py
+import numpy as np
+
+from post_table import COUNT_COLUMNS, FLAG_COLUMNS, PostTable, StringColumn
+
+OPENERS = [
+    "Over 392 dumbbell exercises, and you only need these basic 6.",
+    "I've lifted for 15 years.",
+    "Stop doing endless cardio.",
+    "Here's the simplest home workout.",
+    "Most people skip this warm-up.",
+]
+
+
+def synthetic_table(n, seed=0):
+    """A PostTable of `n` random but plausibly shaped posts."""
+    rng = np.random.default_rng(seed)
+    impressions = rng.lognormal(mean=8, sigma=2, size=n).astype(np.int64)
+    counts = {
+        "Impression Count": impressions,
+        "Like Count": (impressions * rng.uniform(0.001, 0.03, n)).astype(np.int64),
+        "Retweet Count": (impressions * rng.uniform(0, 0.003, n)).astype(np.int64),
+        "Reply Count": (impressions * rng.uniform(0, 0.002, n)).astype(np.int64),
+        "Bookmark Count": (impressions * rng.uniform(0, 0.01, n)).astype(np.int64),
+    }
+    assert set(counts) == set(COUNT_COLUMNS)
+    names = [f"{OPENERS[i % len(OPENERS)]}\n\nPost number {i} about training." for i in range(n)]
+    created_ms = np.sort(rng.integers(1_600_000_000_000, 1_750_000_000_000, n))
+    return PostTable(
+        ids=StringColumn(f"page-{i}" for i in range(n)),
+        text={
+            "Name": StringColumn(names),
+            "URL": StringColumn(f"https://x.com/user/status/{1_900_000_000_000_000_000 + i}" for i in range(n)),
+            "Created At": StringColumn("" for _ in range(n)),
+        },
+        tweet_ids=np.arange(1_900_000_000_000_000_000, 1_900_000_000_000_000_000 + n, dtype=np.int64),
+        counts=counts,
+        flags={name: rng.random(n) < 0.2 for name in FLAG_COLUMNS},
+        created_ms=created_ms,
+    )
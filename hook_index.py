@@ -0,0 +1,143 @@
+# hook_index.py
+import re
+
+import numpy as np
+
+URL_RE = re.compile(r"https?://\S+")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Single words that say nothing about a hook on their own.
+STOPWORDS = frozenset("""
+a an and are as at be but by for from had has have i i'm i've in is it it's me my of on or so
+that the this to was we were with you your
+""".split())
+
+# Prefix marking n-grams that open the hook ("^ stop doing" vs "stop doing" anywhere).
+OPENING = "^ "
+
+
+def extract_hook(text):
+    """The opening line of a post, cut at its first sentence."""
+    text = URL_RE.sub("", text or "")
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            return SENTENCE_END_RE.split(line, maxsplit=1)[0]
+    return ""
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def hook_ngrams(tokens, max_n=3):
+    """Distinct n-grams of a hook (stopword-only unigrams dropped), plus the
+    opening n-grams tagged with OPENING, in first-seen order so pattern ids
+    (and ties between equivalent patterns) don't depend on string hashing."""
+    grams = {}
+    for n in range(1, max_n + 1):
+        for start in range(len(tokens) - n + 1):
+            gram = tokens[start:start + n]
+            if n == 1 and gram[0] in STOPWORDS:
+                continue
+            grams[" ".join(gram)] = None
+        if len(tokens) >= n:
+            grams[OPENING + " ".join(tokens[:n])] = None
+    return list(grams)
+
+
+class HookIndex:
+    """Inverted index from hook n-grams to the posts that use them.
+
+    Built once per sync from a PostTable. Postings are stored as flat
+    (pattern id, row) arrays, so the mean of any metric per pattern is a
+    single np.bincount over the whole index.
+    """
+
+    def __init__(self, table, hooks, patterns, pattern_ids, row_ids):
+        self.table = table
+        self.hooks = hooks
+        self.patterns = patterns
+        self.pattern_ids = pattern_ids
+        self.row_ids = row_ids
+        self.support = np.bincount(pattern_ids, minlength=len(patterns))
+        self.is_opening = np.fromiter((p.startswith(OPENING) for p in patterns), dtype=bool, count=len(patterns))
+        self.lengths = np.fromiter((p.count(" ") + 1 for p in patterns), dtype=np.int64, count=len(patterns))
+        # CSR view of the postings: rows of pattern p are _sorted_rows[_offsets[p]:_offsets[p + 1]].
+        self._sorted_rows = row_ids[np.argsort(pattern_ids, kind="stable")]
+        self._offsets = np.concatenate(([0], np.cumsum(self.support)))
+        self._means = {}
+
+    @classmethod
+    def build(cls, table, max_n=3):
+        vocabulary = {}
+        hooks, pattern_ids, row_ids = [], [], []
+        names = table.text["Name"]
+        for row in range(len(table)):
+            hook = extract_hook(names[row])
+            hooks.append(hook)
+            for gram in hook_ngrams(tokenize(hook), max_n):
+                pattern_ids.append(vocabulary.setdefault(gram, len(vocabulary)))
+                row_ids.append(row)
+        patterns = [None] * len(vocabulary)
+        for gram, pattern_id in vocabulary.items():
+            patterns[pattern_id] = gram
+        return cls(table, hooks,
+                   patterns,
+                   np.asarray(pattern_ids, dtype=np.int64),
+                   np.asarray(row_ids, dtype=np.int64))
+
+    def pattern_means(self, metric):
+        """Mean of `metric` over the posts using each pattern (cached per metric)."""
+        means = self._means.get(metric)
+        if means is None:
+            values = np.asarray(self.table.column(metric), dtype=np.float64)
+            sums = np.bincount(self.pattern_ids, weights=values[self.row_ids], minlength=len(self.patterns))
+            means = np.divide(sums, self.support, out=np.zeros(len(self.patterns)), where=self.support > 0)
+            self._means[metric] = means
+        return means
+
+    def top_patterns(self, metric="Impression Count", k=10, min_posts=3, opening_only=False, largest=True, examples=2):
+        """Hook patterns ranked by the mean `metric` of the posts that use them.
+
+        `lift` is that mean divided by the mean over all posts; patterns used
+        by fewer than `min_posts` posts are skipped as noise. When several
+        patterns cover exactly the same posts only the shortest is reported.
+        """
+        means = self.pattern_means(metric)
+        values = np.asarray(self.table.column(metric), dtype=np.float64)
+        baseline = float(values.mean()) if len(values) else 0.0
+
+        eligible = self.support >= min_posts
+        if opening_only:
+            eligible &= self.is_opening
+        candidates = np.flatnonzero(eligible)
+        keyed = -means[candidates] if largest else means[candidates]
+        ranked = candidates[np.lexsort((self.lengths[candidates], -self.support[candidates], keyed))]
+
+        results = []
+        seen = set()
+        for pattern_id in ranked:
+            if len(results) == k:
+                break
+            rows = self.rows_for(pattern_id)
+            key = (bool(self.is_opening[pattern_id]), rows.tobytes())
+            if key in seen:
+                continue
+            seen.add(key)
+            best = rows[np.argsort(-values[rows], kind="stable")][:examples]
+            opening = bool(self.is_opening[pattern_id])
+            pattern = self.patterns[pattern_id]
+            results.append({
+                "pattern": pattern[len(OPENING):] if opening else pattern,
+                "position": "opening" if opening else "anywhere",
+                "posts": int(self.support[pattern_id]),
+                f"mean {metric}": round(float(means[pattern_id]), 4),
+                "lift": round(float(means[pattern_id]) / baseline, 3) if baseline else 0.0,
+                "example_hooks": [self.hooks[row] for row in best],
+            })
+        return results
+
+    def rows_for(self, pattern_id):
+        return self._sorted_rows[self._offsets[pattern_id]:self._offsets[pattern_id + 1]]
@@ -1,33 +1,288 @@
 # agent.py
-from notion_tool import NotionDatabaseTool
+from async_notion_tool import AsyncNotionDatabaseTool
+from notion_tool import all_of, count_at_least, created_between, flag_is, sort_by
+from hook_index import HookIndex
+from post_cache import post_cache
+import post_analysis
+from post_metrics import add_standard_metrics, rolling_mean
+from post_search import PostSearchIndex
+from post_table import COUNT_COLUMNS, FLAG_COLUMNS, MISSING_TIME, PostTable, parse_created_at
+from tweet_ids import tweet_id_from_text, tweet_id_from_url
 from google.adk.agents import Agent
+import numpy as np
 import os
+from typing import NamedTuple
 
 notion_token = os.getenv("NOTION_TOKEN")
 database_id = os.getenv("DATABASE_ID")
 
-notion_tool = NotionDatabaseTool(notion_token=notion_token, database_id=database_id)
+notion_tool = AsyncNotionDatabaseTool(notion_token=notion_token, database_id=database_id)
+# Lives across cache reloads so each sync only re-indexes the rows it changed.
+search_index = PostSearchIndex()
 
-def get_all_posts_data() -> dict:
+class PostData(NamedTuple):
+    """Everything built from one sync; cached together so it stays consistent."""
+    table: PostTable
+    hooks: HookIndex
+    search: PostSearchIndex
+
+async def _load_posts():
+    await notion_tool.sync_async()
+    # Pages were mapped while the sync was still downloading the next ones.
+    table = add_standard_metrics(PostTable.from_mapped(notion_tool.mapped_replica))
+    search_index.apply_sync(table, notion_tool.last_sync_changes)
+    return PostData(table=table, hooks=HookIndex.build(table), search=search_index)
+
+async def _get_posts():
+    return await post_cache.get_or_load(database_id, _load_posts)
+
+async def get_all_posts_data() -> dict:
     """Get all posts with their content and performance metrics - let AI analyze patterns"""
-    data = notion_tool.query_database_with_pagination()
-    mapped_data = notion_tool.map_properties(data)
-    
-    # Just return the raw data with basic calculations
-    for post in mapped_data:
-        if post['Impression Count'] > 0:
-            post['Engagement Rate'] = round(
-                (post['Like Count'] + post['Retweet Count'] + post['Reply Count']) / post['Impression Count'] * 100, 2
-            )
-        else:
-            post['Engagement Rate'] = 0
-    
+    table = (await _get_posts()).table
+    mapped_data = table.rows(table.order_by('Impression Count'))
+
     return {
         "type": "all_posts_data",
         "posts": mapped_data,
         "total_posts": len(mapped_data)
     }
 
+async def query_posts(
+    created_after: str = "",
+    created_before: str = "",
+    min_impressions: int = 0,
+    min_likes: int = 0,
+    thread_heads_only: bool = False,
+    sort_metric: str = "Impression Count",
+    descending: bool = True,
+    limit: int = 20,
+) -> dict:
+    """Fetch only the posts matching the given filters, already sorted, straight from Notion.
+    Prefer this over get_all_posts_data for questions like "top 20 posts last month".
+
+    Args:
+        created_after (str): ISO date (e.g. "2025-05-01"); only posts created on or after it.
+        created_before (str): ISO date; only posts created before it.
+        min_impressions (int): Minimum Impression Count.
+        min_likes (int): Minimum Like Count.
+        thread_heads_only (bool): Only posts that start a thread.
+        sort_metric (str): One of "Impression Count", "Like Count", "Retweet Count",
+            "Reply Count", "Bookmark Count" or "Created At".
+        descending (bool): Sort from highest to lowest.
+        limit (int): Maximum number of posts to return.
+    """
+    # Notion can only sort by its own properties; anything else would come back as a 400.
+    if sort_metric not in COUNT_COLUMNS and sort_metric != "Created At":
+        return {"status": "error", "error_message": (
+            f"Can't sort by '{sort_metric}'; use one of {', '.join(COUNT_COLUMNS)} or 'Created At'. "
+            "For derived metrics such as 'Engagement Rate' use get_top_posts.")}
+    filter = all_of(
+        created_between(created_after, created_before) if created_after or created_before else None,
+        count_at_least("Impression Count", min_impressions) if min_impressions else None,
+        count_at_least("Like Count", min_likes) if min_likes else None,
+        flag_is("Is Thread Head") if thread_heads_only else None,
+    )
+    data = await notion_tool.query_database_with_pagination_async(
+        filter=filter, sorts=[sort_by(sort_metric, descending)], limit=max(1, limit)
+    )
+    # A subset of the database: percentile ranks against it would be misleading.
+    posts = add_standard_metrics(PostTable.from_notion(data, notion_tool), percentiles=False).rows()
+    return {
+        "type": "filtered_posts",
+        "posts": posts,
+        "total_posts": len(posts)
+    }
+
+async def get_rolling_average(metric: str = "Engagement Rate", window_days: int = 30, points: int = 30) -> dict:
+    """Trend of a metric over time: for each post, the average of `metric` over all posts
+    published in the preceding `window_days`. Returns at most `points` evenly spaced samples.
+
+    Args:
+        metric (str): Any count ("Impression Count", "Like Count", ...) or derived metric
+            ("Engagement Rate", "Bookmark Rate", "Virality Ratio").
+        window_days (int): Size of the trailing window in days.
+        points (int): Maximum number of samples to return.
+    """
+    table = (await _get_posts()).table
+    try:
+        _check_numeric(table, metric)
+    except KeyError as e:
+        return {"status": "error", "error_message": e.args[0]}
+    values = table.column(metric)
+
+    averages = rolling_mean(table, values, window_days)
+    dated = np.flatnonzero(table.created_ms != MISSING_TIME)
+    dated = dated[np.argsort(table.created_ms[dated], kind="stable")]
+    samples = dated
+    if len(dated) > points:
+        samples = dated[np.linspace(0, len(dated) - 1, num=max(1, points)).astype(int)]
+    return {
+        "status": "success",
+        "metric": metric,
+        "window_days": window_days,
+        "trend": [
+            {"Created At": table.text['Created At'][i], f"Rolling {metric}": round(float(averages[i]), 4)}
+            for i in samples
+        ],
+    }
+
+def _check_numeric(table, name):
+    """Raises KeyError unless `name` is a count or a derived metric; flags and text can't be ranked."""
+    if name in table.counts or name in table.metrics:
+        return
+    if name in table.flags or name in table.text:
+        raise KeyError(f"'{name}' is not a numeric metric; use a count such as 'Impression Count' "
+                       f"or a derived metric such as 'Engagement Rate'.")
+    raise KeyError(f"Unknown metric '{name}'.")
+
+async def _posts_with_metric(metric):
+    table = (await _get_posts()).table
+    _check_numeric(table, metric)
+    return table
+
+async def get_top_posts(metric: str = "Impression Count", k: int = 10) -> dict:
+    """The k best posts by a metric, with shortened text. Much cheaper than get_all_posts_data.
+
+    Args:
+        metric (str): Any count ("Impression Count", "Like Count", "Bookmark Count", ...) or derived
+            metric ("Engagement Rate", "Bookmark Rate", "Virality Ratio").
+        k (int): Number of posts to return.
+    """
+    try:
+        table = await _posts_with_metric(metric)
+    except KeyError as e:
+        return {"status": "error", "error_message": e.args[0]}
+    return {"status": "success", "metric": metric, "posts": post_analysis.top_posts(table, metric, k)}
+
+async def get_bottom_posts(metric: str = "Impression Count", k: int = 10) -> dict:
+    """The k worst posts by a metric, with shortened text.
+
+    Args:
+        metric (str): Same choices as get_top_posts.
+        k (int): Number of posts to return.
+    """
+    try:
+        table = await _posts_with_metric(metric)
+    except KeyError as e:
+        return {"status": "error", "error_message": e.args[0]}
+    return {"status": "success", "metric": metric, "posts": post_analysis.top_posts(table, metric, k, largest=False)}
+
+async def compare_cohorts(by: str = "Is Thread Head", metric: str = "Engagement Rate") -> dict:
+    """Compare two groups of posts on a metric (plus impressions and engagement rate).
+
+    Args:
+        by (str): A flag ("Is Thread Head", "Is Thread Part", "Is Note Tweet") to compare flagged vs
+            other posts, or a numeric column (e.g. "Impression Count") to compare its top vs bottom quartile.
+        metric (str): The metric to compare and to pick example posts by.
+    """
+    try:
+        table = await _posts_with_metric(metric)
+        if by not in FLAG_COLUMNS:
+            _check_numeric(table, by)
+    except KeyError as e:
+        return {"status": "error", "error_message": e.args[0]}
+    metrics = list(dict.fromkeys([metric, "Impression Count", "Engagement Rate"]))
+    return {"status": "success", "by": by, "cohorts": post_analysis.compare_cohorts(table, by, metrics)}
+
+async def summarize_distribution(metric: str = "Impression Count") -> dict:
+    """Count, mean, spread, percentiles and concentration of a metric across all posts.
+
+    Args:
+        metric (str): Same choices as get_top_posts.
+    """
+    try:
+        table = await _posts_with_metric(metric)
+    except KeyError as e:
+        return {"status": "error", "error_message": e.args[0]}
+    return {"status": "success", "metric": metric, "summary": post_analysis.summarize(table.column(metric))}
+
+async def get_hook_patterns(
+    metric: str = "Impression Count",
+    k: int = 10,
+    min_posts: int = 3,
+    opening_only: bool = True,
+    worst: bool = False,
+) -> dict:
+    """Which opening words and phrases (hooks) go with high or low performance.
+    Uses a precomputed index of every post's first sentence, so prefer it over reading all posts for hook analysis.
+
+    Args:
+        metric (str): Metric to rank patterns by, e.g. "Impression Count" or "Engagement Rate".
+        k (int): Number of patterns to return.
+        min_posts (int): Ignore patterns used by fewer posts than this.
+        opening_only (bool): Only patterns the hook starts with (e.g. "over", "i've lifted");
+            False also includes phrases anywhere in the first sentence.
+        worst (bool): Return the worst-performing patterns instead of the best.
+    """
+    posts = await _get_posts()
+    try:
+        _check_numeric(posts.table, metric)
+    except KeyError as e:
+        return {"status": "error", "error_message": e.args[0]}
+    patterns = posts.hooks.top_patterns(metric, k, min_posts, opening_only, largest=not worst)
+    return {"status": "success", "metric": metric, "patterns": patterns}
+
+async def search_posts(
+    query: str,
+    k: int = 10,
+    min_impressions: int = 0,
+    min_engagement_rate: float = 0.0,
+    thread_heads_only: bool = False,
+    created_after: str = "",
+) -> dict:
+    """Find posts about a topic by searching their text (BM25 ranking), e.g. "dumbbells" or "fat loss tips".
+
+    Args:
+        query (str): Words to search for.
+        k (int): Maximum number of posts to return.
+        min_impressions (int): Only posts with at least this Impression Count.
+        min_engagement_rate (float): Only posts with at least this Engagement Rate (percent).
+        thread_heads_only (bool): Only posts that start a thread.
+        created_after (str): ISO date; only posts created on or after it.
+    """
+    try:
+        after_ms = parse_created_at(created_after)
+    except ValueError:
+        return {"status": "error",
+                "error_message": f"'{created_after}' is not a date; use ISO format, e.g. \"2025-05-01\"."}
+    posts = await _get_posts()
+    table = posts.table
+    mask = (table.counts['Impression Count'] >= min_impressions) & (table.metrics['Engagement Rate'] >= min_engagement_rate)
+    if thread_heads_only:
+        mask &= table.flags['Is Thread Head']
+    if created_after:
+        mask &= table.created_ms >= after_ms
+
+    row_by_id = table.row_index()
+    hits = posts.search.search(query, k, allowed=lambda doc: doc in row_by_id and mask[row_by_id[doc]])
+    results = []
+    for doc, score in hits:
+        row = post_analysis.compact_row(table, row_by_id[doc], 'Impression Count')
+        row['Relevance'] = round(score, 3)
+        results.append(row)
+    return {"status": "success", "query": query, "posts": results, "total_matches": len(results)}
+
+async def get_post(tweet: str) -> dict:
+    """Look up one post by its tweet URL or tweet ID and return its full text and metrics.
+
+    Args:
+        tweet (str): A status URL (e.g. "https://x.com/user/status/1933843969110315258") or the bare ID.
+    """
+    tweet_id = tweet_id_from_url(tweet) or tweet_id_from_text(tweet)
+    if tweet_id is None:
+        return {"status": "error", "error_message": f"'{tweet}' is not a tweet URL or ID."}
+    table = (await _get_posts()).table
+    row = table.find_tweet(tweet_id)
+    if row is None:
+        return {"status": "error", "error_message": f"No post with tweet ID {tweet_id} in the database."}
+    return {"status": "success", "post": table.row(row)}
+
+def refresh_posts_data() -> dict:
+    """Discard the cached posts so the next get_all_posts_data call fetches fresh data from Notion.
+    Use this when the user says they just posted or updated their metrics."""
+    post_cache.invalidate(database_id)
+    return {"status": "success", "message": "Cached posts cleared; the next fetch will sync with Notion."}
+
 # Simple, smart agent that can analyze anything you throw at it
 root_agent = Agent(
     name="content_intelligence_agent",
@@ -35,12 +290,19 @@ root_agent = Agent(
     description="An intelligent content analyst who can discover patterns and insights from social media data.",
     instruction="""You are an expert content strategist and data analyst. When analyzing content performance:
 
-1. ALWAYS use the get_all_posts_data tool first to get the raw data
+1. ALWAYS fetch the data first, using the smallest tool that answers the question:
+   - get_top_posts / get_bottom_posts for best and worst performers
+   - compare_cohorts and summarize_distribution for comparisons and overall numbers
+   - get_rolling_average for trends over time
+   - query_posts for a date range or threshold
+   - search_posts to find posts about a topic
+   - get_all_posts_data only when you truly need every post's full text
 2. Look at the actual content text and performance metrics together
 3. Find patterns, trends, and insights that humans might miss
 4. Be specific with numbers and examples from the actual data
 
 For hook analysis specifically:
+- Start with get_hook_patterns (best and worst) to see which openings perform, then pull examples with get_top_posts / get_bottom_posts
 - Examine the opening words/sentences of top-performing vs low-performing posts
 - Identify what types of openings get the most engagement
 - Look for patterns in language, tone, structure, or approach
@@ -54,5 +316,17 @@ For any analysis:
 - Be concrete, not generic
 
 Don't just categorize - DISCOVER what actually works for this specific person's audience.""",
-    tools=[get_all_posts_data],
+    tools=[
+        get_top_posts,
+        get_bottom_posts,
+        compare_cohorts,
+        summarize_distribution,
+        get_hook_patterns,
+        search_posts,
+        get_post,
+        get_rolling_average,
+        query_posts,
+        get_all_posts_data,
+        refresh_posts_data,
+    ],
 )
\ No newline at end of file
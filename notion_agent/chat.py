@@ -0,0 +1,35 @@
+# Run from the repo root: python -m notion_agent.chat
+# Terminal chat with the Notion agent that prints answers as they stream in.
+import asyncio
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from agent_streaming import stream_agent_async
+from notion_agent.agent import root_agent
+
+APP_NAME = "notion_agent"
+USER_ID = "user_1"
+SESSION_ID = "notion_chat"
+
+
+async def main():
+    session_service = InMemorySessionService()
+    await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+    runner = Runner(agent=root_agent, app_name=APP_NAME, session_service=session_service)
+    print("Type 'exit' to quit.")
+    while True:
+        query = input("\nYou: ")
+        if query.lower() in ("exit", "quit"):
+            break
+        timings = {}
+        print("Agent: ", end="", flush=True)
+        async for chunk in stream_agent_async(query, runner, USER_ID, SESSION_ID, timings=timings):
+            print(chunk, end="", flush=True)
+        print(f"\n--- first token {timings.get('time_to_first_token', 0):.2f}s, "
+              f"final {timings.get('time_to_final', 0):.2f}s ---")
+    await runner.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+# notion_export.py
+import heapq
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Records held in memory per sorted run during an external sort.
+SORT_CHUNK_SIZE = 50_000
+
+
+def iter_records(notion_tool, **query):
+    """Mapped post dicts, one Notion page of results at a time."""
+    for results in notion_tool.iter_result_pages(**query):
+        yield from notion_tool.iter_mapped(results)
+
+
+def _current_umask():
+    """The process umask, read without changing it where /proc allows."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    # Elsewhere os.umask is the only way, and it briefly sets the umask;
+    # done once at import, before the exporter starts any threads.
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _current_umask()
+
+
+def _file_mode(path):
+    """Permissions for a file written to `path`: those of the file it replaces,
+    else what open(path, "w") would give (0o666 minus the umask)."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_writer(path, binary=False):
+    """Write to a temp file next to `path` and rename it into place on success,
+    so readers never see a half-written export."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".export-", suffix=".tmp", dir=directory)
+    try:
+        # Wrapped first so the fd is closed on any error below.
+        with (os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="utf-8")) as f:
+            # mkstemp creates the file 0600; give it the permissions a plain write would.
+            os.fchmod(f.fileno(), _file_mode(path))
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_json_lines(records, path):
+    """One JSON object per line. Returns the number of records written."""
+    count = 0
+    with atomic_writer(path) as f:
+        for record in records:
+            f.write(json.dumps(record))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def write_json(records, path):
+    """The {"data": [...], "record_count": N} document, pretty-printed like
+    json.dump(..., indent=4) but written record by record. record_count comes
+    last because it is only known once every record has been written."""
+    count = 0
+    with atomic_writer(path) as f:
+        f.write('{\n    "data": [')
+        for record in records:
+            f.write(",\n        " if count else "\n        ")
+            f.write(json.dumps(record, indent=4).replace("\n", "\n        "))
+            count += 1
+        f.write("\n    ]" if count else "]")
+        f.write(f',\n    "record_count": {count}\n}}')
+    return count
+
+
+def sort_by_impressions(records, chunk_size=SORT_CHUNK_SIZE):
+    """Yield `records` ordered by Impression Count, highest first, in bounded memory.
+
+    Records are cut into sorted runs of `chunk_size` that are spilled to temp
+    JSON Lines files and then k-way merged. Ties keep their input order, so
+    the result matches sorted(..., reverse=True) on the whole list.
+    """
+    def key(record):
+        return record.get("Impression Count") or 0
+
+    runs = []
+    try:
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                runs.append(_spill_run(sorted(chunk, key=key, reverse=True)))
+                chunk = []
+        chunk.sort(key=key, reverse=True)
+        if not runs:
+            # Everything fitted in one chunk: no need to touch the disk.
+            yield from chunk
+            return
+        if chunk:
+            runs.append(_spill_run(chunk))
+            chunk = []
+        readers = [_read_run(f) for f in runs]
+        yield from heapq.merge(*readers, key=key, reverse=True)
+    finally:
+        for f in runs:
+            f.close()
+
+
+def _spill_run(sorted_records):
+    f = tempfile.TemporaryFile("w+", encoding="utf-8")
+    for record in sorted_records:
+        f.write(json.dumps(record))
+        f.write("\n")
+    f.seek(0)
+    return f
+
+
+def _read_run(f):
+    for line in f:
+        yield json.loads(line)
+
+
+def export_posts(notion_tool, path, sort=True, chunk_size=SORT_CHUNK_SIZE, **query):
+    """Stream every post in the database to `path`.
+
+    A path ending in .jsonl gets JSON Lines, anything else the
+    {"data": [...], "record_count": N} document. Returns the record count.
+    """
+    records = iter_records(notion_tool, **query)
+    if sort:
+        records = sort_by_impressions(records, chunk_size)
+    if path.endswith(".jsonl"):
+        return write_json_lines(records, path)
+    return write_json(records, path)
@@ -1,47 +1,338 @@
 # notion_tool.py
+import math
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 import os
+from tweet_ids import exact_tweet_id
 
 load_dotenv()
 
+# Rate limiting (429) and transient server errors are worth retrying; anything
+# else is a real error and is raised instead of silently ending pagination.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Notion caps page_size at 100.
+MAX_PAGE_SIZE = 100
+
+# How many pages a prefetching sync may fetch ahead of the page being processed.
+PREFETCH_DEPTH = 2
+
+# End-of-stream marker for the prefetch queues.
+_DONE = object()
+
+# Mapped field names (as produced by map_properties) -> Notion property names,
+# so filters and sorts can be written against either.
+PROPERTY_NAMES = {
+    "Reply Count": "reply_count",
+    "Retweet Count": "retweet_count",
+    "Bookmark Count": "bookmark_count",
+    "Impression Count": "impression_count",
+    "Like Count": "like_count",
+    "Created At": "created_at",
+    "Is Thread Head": "is_thread_head",
+    "Is Thread Part": "is_thread_part",
+    "Is Note Tweet": "is_note_tweet",
+}
+
+
+def _property(name):
+    return PROPERTY_NAMES.get(name, name)
+
+
+def created_between(after=None, before=None):
+    """Date-range filter on created_at; either bound may be omitted (ISO 8601 strings)."""
+    condition = {}
+    if after:
+        condition["on_or_after"] = after
+    if before:
+        condition["before"] = before
+    return {"property": "created_at", "date": condition}
+
+
+def count_at_least(metric, minimum):
+    """Filter for posts whose numeric `metric` is >= `minimum`."""
+    return {"property": _property(metric), "number": {"greater_than_or_equal_to": minimum}}
+
+
+def count_at_most(metric, maximum):
+    """Filter for posts whose numeric `metric` is <= `maximum`."""
+    return {"property": _property(metric), "number": {"less_than_or_equal_to": maximum}}
+
+
+def flag_is(flag, value=True):
+    """Checkbox filter, e.g. flag_is("Is Thread Head")."""
+    return {"property": _property(flag), "checkbox": {"equals": value}}
+
+
+def all_of(*filters):
+    """Combine filters with AND, skipping empty ones."""
+    filters = [f for f in filters if f]
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return {"and": filters}
+
+
+def sort_by(metric, descending=True):
+    """A single Notion sort entry; pass a list of these as `sorts`."""
+    return {"property": _property(metric), "direction": "descending" if descending else "ascending"}
+
 class NotionDatabaseTool:
-    def __init__(self, notion_token, database_id):
+    def __init__(self, notion_token, database_id, resync_interval=3600,
+                 timeout=(5, 30), max_retries=5, backoff_base=0.5, backoff_cap=30.0,
+                 pool_maxsize=10):
         self.notion_token = notion_token
         self.database_id = database_id
         self.headers = {
             "Authorization": f"Bearer {self.notion_token}",
             "Notion-Version": "2022-06-28"
         }
+        # One pooled keep-alive session per tool so pagination reuses the same
+        # TCP/TLS connection instead of reconnecting for every page.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=pool_maxsize))
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.stats = {"requests": 0, "retries": 0, "backoff_seconds": 0.0}
+        # Local replica of the database (page id -> raw Notion page) and the
+        # newest last_edited_time seen so far, used by sync().
+        self.replica = {}
+        self.high_water_mark = None
+        # Delta queries never return deleted pages, so a full walk is still
+        # done every `resync_interval` seconds to drop them from the replica.
+        self.resync_interval = resync_interval
+        self.last_full_sync = None
+        self.last_sync_changes = {"full": False, "changed": [], "removed": []}
+        # Mapped form of every replica page (page id -> map_properties dict),
+        # kept up to date page by page while a sync is still downloading.
+        self.mapped_replica = {}
+
+    @property
+    def query_url(self):
+        return f"https://api.notion.com/v1/databases/{self.database_id}/query"
+
+    def query_database_with_pagination(self, filter=None, sorts=None, page_size=MAX_PAGE_SIZE, limit=None):
+        """Query the database page by page.
 
-    def query_database_with_pagination(self):
-        url = f"https://api.notion.com/v1/databases/{self.database_id}/query"
+        `filter` and `sorts` are passed through to Notion so the server does
+        the work; with `limit` set, pagination stops as soon as that many rows
+        have been fetched.
+        """
         all_results = []
+        for results in self.iter_result_pages(filter, sorts, page_size, limit):
+            all_results.extend(results)
+        return all_results
+
+    def iter_result_pages(self, filter=None, sorts=None, page_size=MAX_PAGE_SIZE, limit=None):
+        """Yield each page of results as soon as it arrives, so callers can
+        process a database without holding all of it in memory."""
+        url = self.query_url
+        fetched = 0
         has_more = True
         start_cursor = None
 
         while has_more:
-            payload = {}
-            if start_cursor:
-                payload["start_cursor"] = start_cursor
+            payload = self._page_payload(filter, sorts, page_size, limit, fetched, start_cursor)
 
-            response = requests.post(url, headers=self.headers, json=payload)
-            data = response.json()
+            data = self._post(url, payload)
 
-            all_results.extend(data.get('results', []))
+            results = data.get('results', [])
+            if limit is not None:
+                results = results[:limit - fetched]
+            fetched += len(results)
+            yield results
+            if limit is not None and fetched >= limit:
+                return
             has_more = data.get('has_more', False)
             start_cursor = data.get('next_cursor', None)
 
-        return all_results
+    def iter_result_pages_prefetched(self, filter=None, sorts=None, page_size=MAX_PAGE_SIZE, limit=None,
+                                     depth=PREFETCH_DEPTH):
+        """iter_result_pages with the requests issued from a background thread
+        that stays up to `depth` pages ahead of the consumer."""
+        pages = queue.Queue(maxsize=max(1, depth))
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for results in self.iter_result_pages(filter, sorts, page_size, limit):
+                    if not put(results):
+                        return
+                put(_DONE)
+            except BaseException as e:
+                put(e)
+
+        threading.Thread(target=produce, name="notion-prefetch", daemon=True).start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Lets the producer exit if the consumer stopped early.
+            stop.set()
+
+    @staticmethod
+    def _page_payload(filter, sorts, page_size, limit, fetched, start_cursor):
+        payload = {"filter": filter} if filter else {}
+        if sorts:
+            payload["sorts"] = sorts
+        if limit is not None:
+            page_size = min(page_size, limit - fetched)
+        payload["page_size"] = max(1, min(page_size, MAX_PAGE_SIZE))
+        if start_cursor:
+            payload["start_cursor"] = start_cursor
+        return payload
+
+    def _post(self, url, payload):
+        """POST to Notion, retrying rate limits and transient failures."""
+        attempt = 0
+        while True:
+            self.stats["requests"] += 1
+            try:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response.json()
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+
+            attempt += 1
+            self.stats["retries"] += 1
+            self.stats["backoff_seconds"] += delay
+            time.sleep(delay)
+
+    def _retry_delay(self, attempt, retry_after=None):
+        """Seconds to wait before the next attempt.
+
+        Notion's Retry-After header wins when it is a finite number of
+        seconds, clamped to [0, backoff_cap]; otherwise this is exponential
+        backoff with jitter, capped at `backoff_cap`.
+        """
+        if retry_after is not None:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                seconds = math.nan
+            # float() also accepts "nan", "inf" and negatives.
+            if math.isfinite(seconds):
+                return min(max(seconds, 0.0), self.backoff_cap)
+        delay = min(self.backoff_cap, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def sync(self, full=False, prefetch=PREFETCH_DEPTH):
+        """Bring the local replica up to date and return every page in it.
+
+        The first call walks the whole database. Later calls only ask Notion
+        for pages edited since the high-water mark and merge them in. Pages
+        are fetched `prefetch` ahead on a background thread, so mapping one
+        page overlaps with downloading the next.
+        """
+        batch = self._start_sync(self._needs_full_sync(full))
+        for results in self.iter_result_pages_prefetched(filter=batch["filter"], depth=prefetch):
+            self._stage_results(batch, results)
+        return self._commit_sync(batch)
 
-    def map_properties(self, data):
-        mapped_data = []
+    def _needs_full_sync(self, full):
+        if full or self.high_water_mark is None:
+            return True
+        return (self.resync_interval is not None
+                and time.monotonic() - self.last_full_sync >= self.resync_interval)
+
+    def _delta_filter(self):
+        # last_edited_time is only minute-precise, so "on or after" re-reads
+        # the last minute's rows rather than risking a missed edit.
+        return {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": self.high_water_mark},
+        }
+
+    def _start_sync(self, full):
+        return {
+            "full": full,
+            "filter": None if full else self._delta_filter(),
+            "pages": {},
+            "mapped": {},
+            "archived": set(),
+            "high_water_mark": self.high_water_mark,
+        }
+
+    def _stage_results(self, batch, results):
+        """Map one page of results into the batch. Nothing touches the replica
+        until _commit_sync, so a sync that fails halfway changes nothing (and
+        in particular never advances the high-water mark past unseen edits)."""
+        live = []
+        for page in results:
+            page_id = page["id"]
+            if page.get("archived") or page.get("in_trash"):
+                batch["archived"].add(page_id)
+                batch["pages"].pop(page_id, None)
+                batch["mapped"].pop(page_id, None)
+            else:
+                batch["archived"].discard(page_id)
+                batch["pages"][page_id] = page
+                live.append(page)
+            edited = page.get("last_edited_time")
+            if edited and (batch["high_water_mark"] is None or edited > batch["high_water_mark"]):
+                batch["high_water_mark"] = edited
+        for page, mapped_item in zip(live, self.iter_mapped(live)):
+            batch["mapped"][page["id"]] = mapped_item
+
+    def _commit_sync(self, batch):
+        if batch["full"]:
+            removed = set(self.replica) - set(batch["pages"])
+            self.replica = batch["pages"]
+            self.mapped_replica = batch["mapped"]
+            self.last_full_sync = time.monotonic()
+        else:
+            removed = {page_id for page_id in batch["archived"] if page_id in self.replica}
+            for page_id in removed:
+                del self.replica[page_id]
+                del self.mapped_replica[page_id]
+            self.replica.update(batch["pages"])
+            self.mapped_replica.update(batch["mapped"])
+        self.high_water_mark = batch["high_water_mark"]
+
+        # What this sync touched, for consumers that maintain their own
+        # incremental indexes on top of the replica.
+        self.last_sync_changes = {"full": batch["full"], "changed": list(batch["pages"]), "removed": list(removed)}
+        return list(self.replica.values())
+
+    def iter_mapped(self, data):
+        """Yield one mapped post dict per Notion page without building a list."""
         for result in data:
             properties = result.get('properties', {})
-            mapped_item = {
+            url = properties.get("url", {}).get("url", "")
+            yield {
                 "Name": properties.get("Name", {}).get("title", [{}])[0].get("text", {}).get("content", ""),
-                "Tweet ID": properties.get("tweet_id", {}).get("number", None),
-                "URL": properties.get("url", {}).get("url", ""),
+                "Tweet ID": exact_tweet_id(properties.get("tweet_id"), url),
+                "URL": url,
                 "Reply Count": properties.get("reply_count", {}).get("number", 0),
                 "Retweet Count": properties.get("retweet_count", {}).get("number", 0),
                 "Bookmark Count": properties.get("bookmark_count", {}).get("number", 0),
@@ -52,7 +343,22 @@ class NotionDatabaseTool:
                 "Is Thread Part": properties.get("is_thread_part", {}).get("checkbox", False),
                 "Is Note Tweet": properties.get("is_note_tweet", {}).get("checkbox", False),
             }
-            mapped_data.append(mapped_item)
 
+    def map_properties(self, data, sort_by_impressions=True):
+        mapped_data = list(self.iter_mapped(data))
+
+        if not sort_by_impressions:
+            # Keep the order Notion returned, e.g. when sorts were pushed down.
+            return mapped_data
         sorted_data = sorted(mapped_data, key=lambda x: x['Impression Count'], reverse=True)
         return sorted_data
+
+
+def sync_all(tools, prefetch=PREFETCH_DEPTH):
+    """Sync several databases concurrently, one thread per tool.
+    Returns {database_id: pages}."""
+    if not tools:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(tools), thread_name_prefix="notion-sync") as pool:
+        futures = {tool.database_id: pool.submit(tool.sync, prefetch=prefetch) for tool in tools}
+        return {database_id: future.result() for database_id, future in futures.items()}
@@ -0,0 +1,117 @@
+# post_analysis.py
+import numpy as np
+
+from post_table import FLAG_COLUMNS
+
+# Text is cut to this many characters in compact rows; enough to read the hook.
+SNIPPET_CHARS = 160
+
+
+def top_indices(values, k, largest=True):
+    """Row indices of the k largest (or smallest) values, best first.
+
+    np.argpartition does an O(n) partial selection, so only the k winners
+    are fully sorted.
+    """
+    values = np.asarray(values)
+    k = max(0, min(k, len(values)))
+    if k == 0:
+        return np.zeros(0, dtype=np.intp)
+    keyed = -values if largest else values
+    if k < len(values):
+        candidates = np.argpartition(keyed, k - 1)[:k]
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(keyed[candidates], kind="stable")]
+
+
+def snippet(text, limit=SNIPPET_CHARS):
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def compact_row(table, i, metric):
+    """The few fields the model needs to talk about a post, with its text shortened."""
+    row = {
+        "Text": snippet(table.text["Name"][i]),
+        "URL": table.text["URL"][i],
+        "Created At": table.text["Created At"][i],
+        "Impression Count": int(table.counts["Impression Count"][i]),
+        "Like Count": int(table.counts["Like Count"][i]),
+    }
+    if "Engagement Rate" in table.metrics:
+        row["Engagement Rate"] = float(table.metrics["Engagement Rate"][i])
+    value = table.column(metric)[i]
+    row[metric] = value.item() if hasattr(value, "item") else value
+    return row
+
+
+def top_posts(table, metric, k, largest=True):
+    return [compact_row(table, i, metric) for i in top_indices(table.column(metric), k, largest)]
+
+
+def summarize(values):
+    """Count, mean, spread and percentiles of a numeric column."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {"count": 0}
+    p10, p25, p50, p75, p90, p99 = np.percentile(values, [10, 25, 50, 75, 90, 99])
+    total = values.sum()
+    top_decile = np.sort(values)[-max(1, len(values) // 10):]
+    return {
+        "count": int(len(values)),
+        "mean": round(float(values.mean()), 4),
+        "std": round(float(values.std()), 4),
+        "min": round(float(values.min()), 4),
+        "p10": round(float(p10), 4),
+        "p25": round(float(p25), 4),
+        "median": round(float(p50), 4),
+        "p75": round(float(p75), 4),
+        "p90": round(float(p90), 4),
+        "p99": round(float(p99), 4),
+        "max": round(float(values.max()), 4),
+        # How concentrated the metric is: share of the total from the top 10% of posts.
+        "top_10pct_share": round(float(top_decile.sum() / total), 4) if total else 0.0,
+    }
+
+
+def cohort_masks(table, by):
+    """Boolean masks for two cohorts.
+
+    `by` is either a flag column (e.g. "Is Thread Head": flagged vs the rest)
+    or a numeric column, which is split into its top and bottom quarter of
+    rows. The split is by rank, with ties broken by table order, so the two
+    cohorts never overlap even when many rows share the cut-off value.
+    """
+    if by in FLAG_COLUMNS:
+        flag = table.flags[by]
+        return {by: flag, f"Not {by}": ~flag}
+    values = table.column(by)
+    n = len(values)
+    # A quarter each, but at least one row apiece once there are two.
+    size = n // 4 if n >= 4 else n // 2
+    order = np.argsort(values, kind="stable")
+    top = np.zeros(n, dtype=bool)
+    bottom = np.zeros(n, dtype=bool)
+    top[order[n - size:]] = True
+    bottom[order[:size]] = True
+    return {f"Top 25% by {by}": top, f"Bottom 25% by {by}": bottom}
+
+
+def compare_cohorts(table, by, metrics, examples=3):
+    """Summary stats of each metric per cohort, plus the best examples from each."""
+    result = {}
+    for name, mask in cohort_masks(table, by).items():
+        rows = np.flatnonzero(mask)
+        cohort = {"count": int(len(rows))}
+        for metric in metrics:
+            values = np.asarray(table.column(metric), dtype=np.float64)[rows]
+            cohort[metric] = {
+                "mean": round(float(values.mean()), 4) if len(rows) else 0.0,
+                "median": round(float(np.median(values)), 4) if len(rows) else 0.0,
+            }
+        best = rows[top_indices(np.asarray(table.column(metrics[0]))[rows], examples)]
+        cohort["examples"] = [compact_row(table, i, metrics[0]) for i in best]
+        result[name] = cohort
+    return result
@@ -0,0 +1,81 @@
+# post_cache.py
+import asyncio
+import os
+import time
+
+
+class PostCache:
+    """Process-wide cache of mapped Notion posts, keyed by database id.
+
+    Entries expire after `ttl_seconds`. Loads are single-flight: when several
+    sessions miss at the same moment only one loader runs and the rest await
+    its result.
+    """
+
+    def __init__(self, ttl_seconds=60.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}      # database_id -> (loaded_at, value)
+        self._inflight = {}     # database_id -> asyncio.Task
+        self._generation = {}   # database_id -> bumped on every invalidate()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_load(self, database_id, loader):
+        """Return the cached value for `database_id`, awaiting `loader()` on a miss."""
+        entry = self._entries.get(database_id)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+            self.hits += 1
+            return entry[1]
+
+        task = self._inflight.get(database_id)
+        if task is None:
+            self.misses += 1
+            # The generation is read now: the task may not start until after an invalidate().
+            generation = self._generation.get(database_id, 0)
+            task = asyncio.ensure_future(self._load(database_id, loader, generation))
+            self._inflight[database_id] = task
+        else:
+            self.coalesced += 1
+        # Shielded so a cancelled caller doesn't cancel the load for everyone else.
+        return await asyncio.shield(task)
+
+    async def _load(self, database_id, loader, generation):
+        try:
+            value = await loader()
+            # An invalidate() during the load means this value may already be stale.
+            if self._generation.get(database_id, 0) == generation:
+                self._entries[database_id] = (time.monotonic(), value)
+            return value
+        finally:
+            # invalidate() may already have replaced this load with a fresh one.
+            if self._inflight.get(database_id) is asyncio.current_task():
+                del self._inflight[database_id]
+
+    def invalidate(self, database_id=None):
+        """Drop one database's entry, or every entry when no id is given.
+
+        A load already running is detached rather than joined: the next
+        get_or_load() starts a fresh one, and the old load's result is
+        discarded by the generation check.
+        """
+        keys = [database_id] if database_id is not None else list(self._entries) + list(self._inflight)
+        for key in keys:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+            self._generation[key] = self._generation.get(key, 0) + 1
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        now = time.monotonic()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds,
+            "entry_age_seconds": {key: round(now - loaded_at, 3) for key, (loaded_at, _) in self._entries.items()},
+        }
+
+
+post_cache = PostCache(ttl_seconds=float(os.getenv("NOTION_CACHE_TTL", "60")))
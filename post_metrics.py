@@ -0,0 +1,83 @@
+# post_metrics.py
+import numpy as np
+
+from post_table import MISSING_TIME
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def _ratio(numerator, denominator, scale=1.0):
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.zeros(numerator.shape, dtype=np.float64)
+    np.divide(numerator * scale, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def engagement_rate(table):
+    """(likes + retweets + replies) / impressions, in percent."""
+    interactions = table.column("Like Count") + table.column("Retweet Count") + table.column("Reply Count")
+    return _ratio(interactions, table.column("Impression Count"), 100.0)
+
+
+def bookmark_rate(table):
+    """Bookmarks / impressions, in percent."""
+    return _ratio(table.column("Bookmark Count"), table.column("Impression Count"), 100.0)
+
+
+def virality_ratio(table):
+    """Retweets per like: how often people who liked a post also shared it."""
+    return _ratio(table.column("Retweet Count"), table.column("Like Count"))
+
+
+def percentile_rank(values):
+    """Percentile rank (0-100) of every value; ties share their average rank."""
+    values = np.asarray(values)
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.float64)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    below = np.cumsum(counts) - counts
+    return ((2 * below + counts) / (2.0 * len(values)) * 100.0)[inverse]
+
+
+def rolling_mean(table, values, window_days=30):
+    """Mean of `values` over the posts created in the `window_days` up to and
+    including each post. Posts without a creation date get NaN.
+
+    One sort plus a prefix sum, so the whole column is O(n log n).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    created = table.created_ms
+    result = np.full(len(values), np.nan)
+    dated = np.flatnonzero(created != MISSING_TIME)
+    if len(dated) == 0:
+        return result
+
+    order = dated[np.argsort(created[dated], kind="stable")]
+    times = created[order]
+    prefix = np.concatenate(([0.0], np.cumsum(values[order])))
+    start = np.searchsorted(times, times - window_days * DAY_MS, side="left")
+    end = np.searchsorted(times, times, side="right")
+    result[order] = (prefix[end] - prefix[start]) / (end - start)
+    return result
+
+
+STANDARD_METRICS = {
+    "Engagement Rate": engagement_rate,
+    "Bookmark Rate": bookmark_rate,
+    "Virality Ratio": virality_ratio,
+}
+
+
+def add_standard_metrics(table, percentiles=True):
+    """Attach the derived columns every post view carries, rounded for display.
+
+    Percentiles rank each post against the rest of `table`, so only ask for
+    them when the table holds every post, not a filtered or limited subset.
+    """
+    for name, metric in STANDARD_METRICS.items():
+        table.add_metric(name, np.round(metric(table), 4 if name == "Virality Ratio" else 2))
+    if percentiles:
+        table.add_metric("Impression Percentile", np.round(percentile_rank(table.column("Impression Count")), 1))
+        table.add_metric("Engagement Percentile", np.round(percentile_rank(table.column("Engagement Rate")), 1))
+    return table
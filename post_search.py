@@ -0,0 +1,111 @@
+# post_search.py
+import math
+import re
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+URL_RE = re.compile(r"https?://\S+")
+
+
+def search_terms(text):
+    """Lowercased word tokens with a light plural strip ("dumbbells" -> "dumbbell")."""
+    terms = []
+    for token in TOKEN_RE.findall(URL_RE.sub(" ", text).lower()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+class PostSearchIndex:
+    """In-process BM25 index over post text, keyed by Notion page id.
+
+    Documents can be added, replaced and removed one at a time, and the
+    corpus statistics BM25 needs (document count, average length, document
+    frequencies) are kept up to date incrementally, so a delta sync only
+    touches the rows it changed.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}      # term -> {doc: term frequency}
+        self.doc_terms = {}     # doc -> {term: term frequency}
+        self.doc_lengths = {}   # doc -> number of terms
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def upsert(self, doc, text):
+        self.remove(doc)
+        terms = {}
+        for term in search_terms(text):
+            terms[term] = terms.get(term, 0) + 1
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[doc] = frequency
+        self.doc_terms[doc] = terms
+        length = sum(terms.values())
+        self.doc_lengths[doc] = length
+        self.total_length += length
+
+    def remove(self, doc):
+        terms = self.doc_terms.pop(doc, None)
+        if terms is None:
+            return
+        for term in terms:
+            docs = self.postings[term]
+            del docs[doc]
+            if not docs:
+                del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc)
+
+    def clear(self):
+        self.__init__(self.k1, self.b)
+
+    def apply_sync(self, table, changes):
+        """Bring the index in line with a NotionDatabaseTool sync.
+
+        `changes` is the tool's last_sync_changes; only those rows are
+        re-indexed, unless the index is empty or the sync was a full walk.
+        """
+        row_by_id = table.row_index()
+        names = table.text["Name"]
+        if changes["full"] or not self.doc_lengths:
+            self.clear()
+            for doc, row in row_by_id.items():
+                self.upsert(doc, names[row])
+            return
+        for doc in changes["removed"]:
+            self.remove(doc)
+        for doc in changes["changed"]:
+            row = row_by_id.get(doc)
+            if row is not None:
+                self.upsert(doc, names[row])
+
+    def scores(self, query):
+        """BM25 score of every document matching at least one query term."""
+        count = len(self.doc_lengths)
+        if count == 0:
+            return {}
+        average_length = self.total_length / count
+        scores = {}
+        for term in set(search_terms(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc, frequency in docs.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc] / average_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def search(self, query, k=10, allowed=None):
+        """Top-k (doc, score) pairs; `allowed(doc)` can veto documents (e.g. metric filters)."""
+        ranked = sorted(self.scores(query).items(), key=lambda item: item[1], reverse=True)
+        results = []
+        for doc, score in ranked:
+            if allowed is None or allowed(doc):
+                results.append((doc, score))
+                if len(results) == k:
+                    break
+        return results
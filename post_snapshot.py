@@ -0,0 +1,185 @@
+# post_snapshot.py
+"""Binary snapshot format for PostTable.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    b"POSTSNP1"                 magic
+    uint64                      length of the JSON header
+    JSON header                 row count and, per column, its kind, dtype and byte ranges
+    column sections             fixed-width arrays, or uint64 offsets + UTF-8 heap for text
+
+load_snapshot() memory-maps the file and wraps every section in a NumPy
+view, so opening a snapshot costs the same no matter how many posts it
+holds; text is only decoded for the rows that are actually read.
+
+Convert to and from the notion_data.json export:
+
+    python post_snapshot.py to-snapshot notion_data.json notion_data.snap
+    python post_snapshot.py to-json notion_data.snap notion_data.json
+"""
+import json
+import mmap
+import struct
+import sys
+
+import numpy as np
+
+from notion_export import atomic_writer, write_json
+from post_table import PostTable
+
+MAGIC = b"POSTSNP1"
+VERSION = 1
+ALIGNMENT = 8
+
+
+class HeapStringColumn:
+    """Read-only text column over an offsets array and a UTF-8 heap, both
+    views into the mapped file. `rows` (when set) selects and reorders rows
+    without copying the heap."""
+
+    def __init__(self, offsets, heap, rows=None):
+        self.offsets = offsets
+        self.heap = heap
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows) if self.rows is not None else len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if self.rows is not None:
+            i = self.rows[i]
+        return bytes(self.heap[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def take(self, indices):
+        rows = self.rows[indices] if self.rows is not None else np.asarray(indices, dtype=np.intp)
+        return HeapStringColumn(self.offsets, self.heap, rows)
+
+    def nbytes(self):
+        # The heap and offsets are file-backed pages, not Python heap memory.
+        return self.rows.nbytes if self.rows is not None else 0
+
+
+def _text_column(table, name):
+    return table.ids if name == "id" else table.text[name]
+
+
+def _numeric_columns(table):
+    columns = [("Tweet ID", "tweet_id", table.tweet_ids.astype("<i8")),
+               ("Created At (ms)", "created_ms", table.created_ms.astype("<i8"))]
+    columns += [(name, "count", array.astype("<i8")) for name, array in table.counts.items()]
+    columns += [(name, "flag", array.astype("|u1")) for name, array in table.flags.items()]
+    columns += [(name, "metric", array.astype("<f8")) for name, array in table.metrics.items()]
+    return columns
+
+
+def write_snapshot(table, path):
+    """Write `table` to `path` atomically. Returns the number of rows."""
+    sections = []   # (column descriptor, [byte chunks])
+    for name, kind, array in _numeric_columns(table):
+        sections.append(({"name": name, "kind": kind, "dtype": array.dtype.str}, [array.tobytes()]))
+    for name in ("id", *table.text):
+        column = _text_column(table, name)
+        encoded = [column[i].encode("utf-8") for i in range(len(column))]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        sections.append(({"name": name, "kind": "text", "dtype": "<u8"}, [offsets.tobytes(), b"".join(encoded)]))
+
+    # Section offsets depend on the header's size and are recorded in the
+    # header, so lay out until the (padded) header length stops changing.
+    header_length = 0
+    while True:
+        position = len(MAGIC) + 8 + header_length
+        descriptors = []
+        for descriptor, chunks in sections:
+            ranges = []
+            for chunk in chunks:
+                ranges.append([position, len(chunk)])
+                position = _align(position + len(chunk))
+            descriptors.append({**descriptor, "ranges": ranges})
+        header_bytes = json.dumps({"version": VERSION, "rows": len(table), "columns": descriptors}).encode("utf-8")
+        padded_length = _align(len(MAGIC) + 8 + len(header_bytes)) - len(MAGIC) - 8
+        if padded_length == header_length:
+            header_bytes += b" " * (padded_length - len(header_bytes))
+            break
+        header_length = padded_length
+
+    with atomic_writer(path, binary=True) as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        written = len(MAGIC) + 8 + len(header_bytes)
+        for _, chunks in sections:
+            for chunk in chunks:
+                f.write(chunk)
+                padded = _align(written + len(chunk))
+                f.write(b"\0" * (padded - written - len(chunk)))
+                written = padded
+    return len(table)
+
+
+def load_snapshot(path):
+    """Memory-map a snapshot and return a PostTable whose columns are views into it."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a post snapshot")
+    (header_length,) = struct.unpack_from("<Q", mapped, len(MAGIC))
+    header_start = len(MAGIC) + 8
+    header = json.loads(bytes(mapped[header_start:header_start + header_length]))
+    if header["version"] != VERSION:
+        raise ValueError(f"Unsupported snapshot version {header['version']}")
+    rows = header["rows"]
+    buffer = memoryview(mapped)
+
+    tweet_ids = created_ms = None
+    ids = None
+    text, counts, flags, metrics = {}, {}, {}, {}
+    for column in header["columns"]:
+        kind, name = column["kind"], column["name"]
+        if kind == "text":
+            (offsets_at, _), (heap_at, heap_length) = column["ranges"]
+            values = HeapStringColumn(np.frombuffer(buffer, dtype="<u8", count=rows + 1, offset=offsets_at),
+                                      buffer[heap_at:heap_at + heap_length])
+            if name == "id":
+                ids = values
+            else:
+                text[name] = values
+            continue
+        ((start, _),) = column["ranges"]
+        array = np.frombuffer(buffer, dtype=column["dtype"], count=rows, offset=start)
+        if kind == "tweet_id":
+            tweet_ids = array
+        elif kind == "created_ms":
+            created_ms = array
+        elif kind == "count":
+            counts[name] = array
+        elif kind == "flag":
+            flags[name] = array.view(np.bool_)
+        else:
+            metrics[name] = array
+
+    return PostTable(ids=ids, text=text, tweet_ids=tweet_ids, counts=counts,
+                     flags=flags, created_ms=created_ms, metrics=metrics)
+
+
+def json_to_snapshot(json_path, snapshot_path):
+    with open(json_path, encoding="utf-8") as f:
+        records = json.load(f)["data"]
+    return write_snapshot(PostTable.from_records(records), snapshot_path)
+
+
+def snapshot_to_json(snapshot_path, json_path):
+    table = load_snapshot(snapshot_path)
+    return write_json((table.row(i) for i in range(len(table))), json_path)
+
+
+def _align(position):
+    return (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+if __name__ == "__main__":
+    commands = {"to-snapshot": json_to_snapshot, "to-json": snapshot_to_json}
+    if len(sys.argv) != 4 or sys.argv[1] not in commands:
+        sys.exit("usage: python post_snapshot.py {to-snapshot|to-json} SOURCE DESTINATION")
+    count = commands[sys.argv[1]](sys.argv[2], sys.argv[3])
+    print(f"Converted {count} posts: {sys.argv[2]} -> {sys.argv[3]}")
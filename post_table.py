@@ -0,0 +1,226 @@
+# post_table.py
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+
+from tweet_ids import tweet_id_from_url
+
+COUNT_COLUMNS = ("Reply Count", "Retweet Count", "Bookmark Count", "Impression Count", "Like Count")
+FLAG_COLUMNS = ("Is Thread Head", "Is Thread Part", "Is Note Tweet")
+TEXT_COLUMNS = ("Name", "URL", "Created At")
+
+# Column order of the row dicts, matching NotionDatabaseTool.map_properties.
+FIELD_ORDER = (
+    "Name", "Tweet ID", "URL", "Reply Count", "Retweet Count", "Bookmark Count",
+    "Impression Count", "Like Count", "Created At", "Is Thread Head", "Is Thread Part", "Is Note Tweet",
+)
+
+MISSING_TIME = np.iinfo(np.int64).min
+
+
+def parse_created_at(value):
+    """Notion date string -> UTC epoch milliseconds (MISSING_TIME when empty)."""
+    if not value:
+        return MISSING_TIME
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def count_array(name, values):
+    """int64 array of a count column. Whole floats (12.0) are accepted; a
+    fractional, NaN or infinite count raises ValueError instead of being
+    truncated."""
+    array = np.asarray(values)
+    if array.dtype.kind in "iub":
+        return array.astype(np.int64)
+    try:
+        as_float = array.astype(np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' has a non-numeric value") from None
+    bad = ~np.isfinite(as_float) | (as_float != np.round(as_float))
+    if bad.any():
+        row = int(np.argmax(bad))
+        raise ValueError(f"'{name}' must be a whole number, got {values[row]!r} in row {row}")
+    return as_float.astype(np.int64)
+
+
+class StringColumn:
+    """Text column stored as int32 codes into a list of interned, de-duplicated strings."""
+
+    def __init__(self, values=(), _codes=None, _uniques=None):
+        if _codes is not None:
+            self.codes = _codes
+            self.uniques = _uniques
+            return
+        self.uniques = []
+        index = {}
+        codes = []
+        for value in values:
+            value = value or ""
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(self.uniques)
+                self.uniques.append(sys.intern(value))
+            codes.append(code)
+        self.codes = np.asarray(codes, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        return self.uniques[self.codes[i]]
+
+    def take(self, indices):
+        return StringColumn(_codes=self.codes[indices], _uniques=self.uniques)
+
+    def nbytes(self):
+        return self.codes.nbytes + sum(sys.getsizeof(value) for value in self.uniques)
+
+
+class PostTable:
+    """Columnar store for mapped posts.
+
+    Counts live in int64 arrays, flags in bool arrays and text in interned
+    StringColumns, so aggregations are vectorized and no per-post dict is kept
+    around. Row dicts in the map_properties format are only built on demand
+    by row() / rows().
+    """
+
+    def __init__(self, ids, text, tweet_ids, counts, flags, created_ms, metrics=None):
+        self.ids = ids
+        self.text = text
+        self.tweet_ids = tweet_ids
+        self.counts = counts
+        self.flags = flags
+        self.created_ms = created_ms
+        # Derived float columns (e.g. "Engagement Rate") that appear in row views.
+        self.metrics = metrics if metrics is not None else {}
+        self._row_by_id = None
+        self._row_by_tweet_id = None
+
+    @classmethod
+    def from_records(cls, records, ids=None):
+        """Build a table from mapped post dicts (any iterable, consumed once).
+
+        Tweet ids are re-derived from the status URL when it has one, which
+        repairs the float-rounded ids in older exports.
+        """
+        text = {name: [] for name in TEXT_COLUMNS}
+        counts = {name: [] for name in COUNT_COLUMNS}
+        flags = {name: [] for name in FLAG_COLUMNS}
+        tweet_ids = []
+        for record in records:
+            for name in TEXT_COLUMNS:
+                text[name].append(record.get(name) or "")
+            for name in COUNT_COLUMNS:
+                counts[name].append(record.get(name) or 0)
+            for name in FLAG_COLUMNS:
+                flags[name].append(bool(record.get(name)))
+            tweet_ids.append(tweet_id_from_url(record.get("URL")) or int(record.get("Tweet ID") or 0))
+
+        return cls(
+            ids=StringColumn(ids if ids is not None else [""] * len(tweet_ids)),
+            text={name: StringColumn(values) for name, values in text.items()},
+            tweet_ids=np.asarray(tweet_ids, dtype=np.int64),
+            counts={name: count_array(name, values) for name, values in counts.items()},
+            flags={name: np.asarray(values, dtype=bool) for name, values in flags.items()},
+            created_ms=np.fromiter((parse_created_at(v) for v in text["Created At"]),
+                                   dtype=np.int64, count=len(tweet_ids)),
+        )
+
+    @classmethod
+    def from_notion(cls, pages, notion_tool):
+        """Build a table straight from raw Notion pages, keeping their page ids."""
+        return cls.from_records(notion_tool.iter_mapped(pages), ids=[page.get("id", "") for page in pages])
+
+    @classmethod
+    def from_mapped(cls, mapped_by_id):
+        """Build a table from a page id -> mapped post dict, such as
+        NotionDatabaseTool.mapped_replica (already mapped during the sync)."""
+        return cls.from_records(mapped_by_id.values(), ids=list(mapped_by_id))
+
+    def __len__(self):
+        return len(self.tweet_ids)
+
+    def row_index(self):
+        """Notion page id -> row number, built on first use."""
+        if self._row_by_id is None:
+            self._row_by_id = {self.ids[i]: i for i in range(len(self)) if self.ids[i]}
+        return self._row_by_id
+
+    def tweet_id_index(self):
+        """Exact tweet id -> row number (hash index), built on first use."""
+        if self._row_by_tweet_id is None:
+            self._row_by_tweet_id = {tweet_id: i for i, tweet_id in enumerate(self.tweet_ids.tolist()) if tweet_id}
+        return self._row_by_tweet_id
+
+    def find_tweet(self, tweet_id):
+        """Row number of a tweet id, or None."""
+        return self.tweet_id_index().get(int(tweet_id))
+
+    def join_tweet_ids(self, tweet_ids):
+        """Row numbers for many tweet ids at once (-1 where a tweet is unknown)."""
+        index = self.tweet_id_index()
+        return np.fromiter((index.get(int(t), -1) for t in tweet_ids), dtype=np.int64, count=len(tweet_ids))
+
+    def column(self, name):
+        """The array (or StringColumn) backing a field or derived metric."""
+        for group in (self.counts, self.flags, self.metrics, self.text):
+            if name in group:
+                return group[name]
+        if name == "Tweet ID":
+            return self.tweet_ids
+        raise KeyError(f"Unknown column '{name}'")
+
+    def add_metric(self, name, values):
+        self.metrics[name] = np.asarray(values, dtype=np.float64)
+
+    def order_by(self, name, descending=True):
+        """Row indices sorted by a numeric column (stable, so ties keep table order)."""
+        values = self.column(name)
+        return np.argsort(-values if descending else values, kind="stable")
+
+    def take(self, indices):
+        """A new table holding only the given rows."""
+        indices = np.asarray(indices, dtype=np.intp)
+        return PostTable(
+            ids=self.ids.take(indices),
+            text={name: column.take(indices) for name, column in self.text.items()},
+            tweet_ids=self.tweet_ids[indices],
+            counts={name: column[indices] for name, column in self.counts.items()},
+            flags={name: column[indices] for name, column in self.flags.items()},
+            created_ms=self.created_ms[indices],
+            metrics={name: column[indices] for name, column in self.metrics.items()},
+        )
+
+    def row(self, i):
+        """Materialise row `i` as a dict in the map_properties format."""
+        tweet_id = int(self.tweet_ids[i])
+        row = {}
+        for name in FIELD_ORDER:
+            if name in self.counts:
+                row[name] = int(self.counts[name][i])
+            elif name in self.flags:
+                row[name] = bool(self.flags[name][i])
+            elif name == "Tweet ID":
+                row[name] = tweet_id or None
+            else:
+                row[name] = self.text[name][i]
+        for name, column in self.metrics.items():
+            row[name] = float(column[i])
+        return row
+
+    def rows(self, indices=None):
+        if indices is None:
+            indices = range(len(self))
+        return [self.row(i) for i in indices]
+
+    def nbytes(self):
+        """Approximate memory held by the table's columns."""
+        arrays = [self.tweet_ids, self.created_ms, *self.counts.values(), *self.flags.values(), *self.metrics.values()]
+        return (sum(array.nbytes for array in arrays)
+                + self.ids.nbytes()
+                + sum(column.nbytes() for column in self.text.values()))
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import async_notion_tool
+from async_notion_tool import AsyncNotionDatabaseTool
+
+
+@pytest.fixture
+def notion(monkeypatch):
+    """A tool whose HTTP client talks to an in-process fake of the query endpoint."""
+    requests = []
+
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        payload = json.loads(request.content)
+        requests.append(payload)
+        if len(requests) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"results": [{"id": "page-1"}], "has_more": False, "next_cursor": None})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(async_notion_tool.httpx, "AsyncClient",
+                        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs))
+    tool = AsyncNotionDatabaseTool(notion_token="token", database_id="db", backoff_base=0.0)
+    return tool, requests
+
+
+def test_retries_then_returns_the_page(notion):
+    tool, requests = notion
+    pages = asyncio.run(tool.query_database_with_pagination_async(limit=10))
+    assert pages == [{"id": "page-1"}]
+    assert tool.stats["retries"] == 1
+    assert requests[-1]["page_size"] == 10
+
+
+def test_works_across_event_loops(notion):
+    tool, _ = notion
+
+    async def queries():
+        # More than NOTION_MAX_CONCURRENCY at once, so requests wait on the semaphore.
+        return await asyncio.gather(*(tool.query_database_with_pagination_async() for _ in range(6)))
+
+    # Each asyncio.run() is a new loop, like each turn in the tutorials.
+    for _ in range(3):
+        assert asyncio.run(queries()) == [[{"id": "page-1"}]] * 6
+
+
+def test_prefetched_pages_arrive_in_order_and_errors_propagate():
+    tool = AsyncNotionDatabaseTool(notion_token="token", database_id="db")
+    calls = []
+
+    async def post(url, payload):
+        calls.append(payload)
+        start = int(payload.get("start_cursor") or 0)
+        if start == 3:
+            raise RuntimeError("network down")
+        return {"results": [{"id": f"page-{start}"}], "has_more": True, "next_cursor": str(start + 1)}
+
+    tool._post_async = post
+
+    seen = []
+
+    async def consume():
+        async for results in tool.iter_result_pages_prefetched_async(page_size=1, depth=1):
+            await asyncio.sleep(0.01)
+            # The page in hand, one queued, and one waiting to be queued.
+            assert len(calls) <= len(seen) + 1 + 1 + 1
+            seen.extend(p["id"] for p in results)
+
+    with pytest.raises(RuntimeError, match="network down"):
+        asyncio.run(consume())
+    assert seen == ["page-0", "page-1", "page-2"]
@@ -0,0 +1,104 @@
+# test_cached_llm.py
+import asyncio
+import importlib.util
+import os
+import sqlite3
+from typing import AsyncGenerator
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import BaseModel
+
+
+# tutorail_multiple_llms/__init__.py is an `adk web` entry point that imports
+# a missing agent module, so the file is loaded directly.
+_spec = importlib.util.spec_from_file_location("cached_llm", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "tutorail_multiple_llms", "models", "cached_llm.py"))
+cached_llm = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cached_llm)
+CachedLlm = cached_llm.CachedLlm
+
+
+class CountingLlm(BaseLlm):
+    model: str = "fake"
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=f"answer {self.calls}")]))
+
+
+def request(text, **config):
+    return LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+                      config=types.GenerateContentConfig(system_instruction="Be brief.", **config))
+
+
+def ask(llm, llm_request):
+    async def run():
+        return [r async for r in llm.generate_content_async(llm_request)]
+    return asyncio.run(run())[-1].content.parts[0].text
+
+
+def test_repeat_and_normalised_questions_hit_memory():
+    llm = CachedLlm(inner=CountingLlm())
+    assert ask(llm, request("What's the weather in London?")) == "answer 1"
+    assert ask(llm, request("what's the weather in london")) == "answer 1"
+    assert llm.stats["memory_hits"] == 1 and llm.inner.calls == 1
+
+
+def test_rephrasings_only_when_enabled_and_only_filler_words_differ():
+    llm = CachedLlm(inner=CountingLlm(), match_rephrasings=True)
+    ask(llm, request("What's the weather in London?"))
+    assert ask(llm, request("weather in london please")) == "answer 1"
+    assert ask(llm, request("weather in Paris please")) == "answer 2"
+    assert ask(llm, request("not the weather in london")) == "answer 3"
+    assert llm.stats["rephrase_hits"] == 1
+
+    plain = CachedLlm(inner=CountingLlm())
+    ask(plain, request("What's the weather in London?"))
+    assert ask(plain, request("weather in london please")) == "answer 2"
+
+
+def test_generation_config_is_part_of_the_key():
+    class Forecast(BaseModel):
+        city: str
+
+    class OtherForecast(BaseModel):
+        city: str
+        temp_c: float
+
+    llm = CachedLlm(inner=CountingLlm())
+    ask(llm, request("weather in london", temperature=0.0))
+    assert ask(llm, request("weather in london", temperature=0.0)) == "answer 1"
+    assert ask(llm, request("weather in london", temperature=1.0)) == "answer 2"
+    assert ask(llm, request("weather in london", temperature=0.0, response_schema=Forecast)) == "answer 3"
+    assert ask(llm, request("weather in london", temperature=0.0, response_schema=OtherForecast)) == "answer 4"
+    assert ask(llm, request("weather in london", temperature=0.0, response_schema=Forecast)) == "answer 3"
+
+
+def test_sqlite_tier_survives_restarts_including_rephrasings(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    first = CachedLlm(inner=CountingLlm(), db_path=db_path, match_rephrasings=True)
+    ask(first, request("What's the weather in London?"))
+
+    second = CachedLlm(inner=CountingLlm(), db_path=db_path, match_rephrasings=True)
+    assert ask(second, request("What's the weather in London?")) == "answer 1"
+    third = CachedLlm(inner=CountingLlm(), db_path=db_path, match_rephrasings=True)
+    assert ask(third, request("weather in london please")) == "answer 1"
+    assert second.stats["disk_hits"] == 1 and third.stats["rephrase_hits"] == 1
+    assert second.inner.calls == third.inner.calls == 0
+
+
+def test_old_cache_table_gets_the_rephrase_column(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    with sqlite3.connect(db_path) as db:
+        db.execute("CREATE TABLE llm_cache (key TEXT PRIMARY KEY, expires_at REAL, response TEXT, seconds REAL)")
+    llm = CachedLlm(inner=CountingLlm(), db_path=db_path, match_rephrasings=True)
+    ask(llm, request("weather in london"))
+    assert ask(llm, request("weather in london")) == "answer 1"
+
+
+def test_expired_entries_are_misses():
+    llm = CachedLlm(inner=CountingLlm(), ttl_seconds=0)
+    ask(llm, request("weather in london"))
+    assert ask(llm, request("weather in london")) == "answer 2"
@@ -0,0 +1,64 @@
+from weather_backend.backend import JsonFileProvider, Observation, StaticProvider, WeatherBackend
+from weather_backend.city_index import CityIndex, edit_distance, normalize_city
+
+CITIES = ["New York", "London", "Londonderry", "Tokyo", "Amsterdam", "São Paulo", "Lisbon"]
+
+
+def test_normalize_city():
+    assert normalize_city("São Paulo") == "saopaulo"
+    assert normalize_city(" New-York ") == "newyork"
+
+
+def test_edit_distance_counts_transpositions_and_respects_the_bound():
+    assert edit_distance("london", "lnodon") == 1
+    assert edit_distance("london", "londn") == 1
+    assert edit_distance("london", "tokyo", max_distance=2) == 3
+
+
+def test_typos_and_aliases_resolve():
+    index = CityIndex(CITIES)
+    assert index.resolve("lndon")[0] == "London"
+    assert index.resolve("Amsterdm")[0] == "Amsterdam"
+    assert index.resolve("sao paulo") == ("São Paulo", 1.0)
+    assert index.resolve("NYC") == ("New York", 1.0)
+
+
+def test_a_different_real_city_is_not_substituted():
+    index = CityIndex(CITIES)
+    assert index.resolve("Newark") is None
+    assert index.lookup("Newark")[0][0] == "New York"
+    assert index.resolve("Paris") is None
+
+
+def test_ambiguous_matches_are_not_resolved():
+    index = CityIndex(["Springfield", "Springdale"])
+    assert index.resolve("Springfeld")[0] == "Springfield"
+    assert index.resolve("Spring") is None
+
+
+def test_backend_marks_fuzzy_matches_and_suggests_on_misses():
+    backend = WeatherBackend(StaticProvider())
+    assert backend.resolve("London").exact
+    result = backend.resolve("Londn").tool_result("report")
+    assert (result["resolved_city"], result["match_score"]) == ("London", 0.833)
+    error = backend.error_result("Newark", "Unknown city.")
+    assert error["status"] == "error"
+    assert error["suggestions"] == ["New York"]
+    assert backend.resolve("Newark") is None
+
+
+def test_backend_reports_both_units(tmp_path):
+    path = tmp_path / "weather.json"
+    path.write_text('{"Oslo": {"temp_c": -5, "condition": "snowy"}}', encoding="utf-8")
+    report = WeatherBackend(JsonFileProvider(str(path))).lookup("oslo")
+    assert report.celsius == "The weather in Oslo is snowy with a temperature of -5°C."
+    assert report.text("Fahrenheit") == "The weather in Oslo is snowy with a temperature of 23°F."
+
+
+def test_reload_swaps_in_new_data():
+    provider = StaticProvider([Observation("Oslo", 1, "cloudy")])
+    backend = WeatherBackend(provider)
+    assert backend.lookup("Oslo").temp_c == 1
+    provider.observations = [Observation("Oslo", 2, "cloudy")]
+    backend.reload()
+    assert backend.lookup("Oslo").temp_c == 2
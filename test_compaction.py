@@ -0,0 +1,85 @@
+# test_compaction.py
+from types import SimpleNamespace
+
+from google.adk.models import LlmRequest
+from google.genai import types
+
+from tutorial_with_memory.sessions.compaction import LAST_TURN_KEY, HistoryCompactor
+
+
+def text(role, value):
+    return types.Content(role=role, parts=[types.Part(text=value)])
+
+
+def history(turns, filler="x" * 200):
+    contents = []
+    for i in range(turns):
+        contents.append(text("user", f"question {i} {filler}"))
+        contents.append(text("model", f"answer {i} {filler}"))
+    return contents
+
+
+def context(session_id="s1", state=None):
+    session = SimpleNamespace(app_name="app", user_id="u", id=session_id)
+    return SimpleNamespace(session=session, agent_name="agent", state={} if state is None else state)
+
+
+def compact(compactor, contents, ctx):
+    request = LlmRequest(contents=list(contents))
+    compactor.before_model_callback(ctx, request)
+    return request.contents
+
+
+def summary_text(contents):
+    return contents[0].parts[0].text
+
+
+def test_old_turns_are_summarized_and_recent_ones_kept():
+    compactor = HistoryCompactor(keep_turns=2, trigger_tokens=100)
+    contents = history(6)
+    result = compact(compactor, contents, context())
+    assert "question 0" in summary_text(result) and "question 3" in summary_text(result)
+    assert result[1:] == contents[-4:]
+    assert compactor.stats["compacted"] == 1
+
+
+def test_per_turn_numbers_are_kept_per_session():
+    compactor = HistoryCompactor(keep_turns=2, trigger_tokens=100)
+    long_state, short_state = {}, {}
+    compact(compactor, history(6), context("long", long_state))
+    compact(compactor, history(1), context("short", short_state))
+    assert long_state[LAST_TURN_KEY]["tokens_saved"] > 0
+    assert short_state[LAST_TURN_KEY]["tokens_saved"] == 0
+    assert not hasattr(compactor, "last_turn")
+
+
+def test_summary_is_rebuilt_when_the_summarized_prefix_changes():
+    compactor = HistoryCompactor(keep_turns=2, trigger_tokens=100)
+    ctx = context()
+    contents = history(6)
+    compact(compactor, contents, ctx)
+
+    # Same length, earlier turn edited: the cached lines no longer describe it.
+    edited = list(contents) + [text("user", "question 6"), text("model", "answer 6")]
+    edited[0] = text("user", "rewritten question " + "x" * 200)
+    summary = summary_text(compact(compactor, edited, ctx))
+    assert "rewritten question" in summary
+    assert "question 0" not in summary
+
+
+def test_summary_is_extended_when_the_prefix_is_unchanged():
+    compactor = HistoryCompactor(keep_turns=2, trigger_tokens=100)
+    ctx = context()
+    contents = history(6)
+    compact(compactor, contents, ctx)
+    summary = summary_text(compact(compactor, contents + history(7)[-2:], ctx))
+    assert summary.count("question 0") == 1
+    assert "question 4" in summary
+
+
+def test_compaction_logs_instead_of_printing(capsys, caplog):
+    compactor = HistoryCompactor(keep_turns=2, trigger_tokens=100)
+    with caplog.at_level("INFO", logger="tutorial_with_memory.sessions.compaction"):
+        compact(compactor, history(6), context())
+    assert capsys.readouterr().out == ""
+    assert "Compaction:" in caplog.text
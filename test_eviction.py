@@ -0,0 +1,72 @@
+# test_eviction.py
+import asyncio
+import gc
+import os
+
+from google.adk.events import Event
+from google.genai import types
+
+from tutorial_with_memory.sessions.eviction import EvictingSessionService
+
+APP, USER = "app", "u"
+
+
+async def create(service, *session_ids):
+    for session_id in session_ids:
+        session = await service.create_session(app_name=APP, user_id=USER, session_id=session_id,
+                                               state={"n": session_id})
+        await service.append_event(session, Event(
+            author="user", invocation_id="inv", content=types.Content(role="user", parts=[types.Part(text="hi")])))
+
+
+def test_lru_sessions_spill_and_come_back():
+    service = EvictingSessionService(max_sessions=2, ttl_seconds=None)
+
+    async def scenario():
+        await create(service, "a", "b", "c")
+        assert set(service.sessions[APP][USER]) == {"b", "c"}
+        assert len(os.listdir(service.spill_dir)) == 1
+        session = await service.get_session(app_name=APP, user_id=USER, session_id="a")
+        listed = await service.list_sessions(app_name=APP, user_id=USER)
+        return session, listed
+
+    session, listed = asyncio.run(scenario())
+    assert session.state["n"] == "a" and len(session.events) == 1
+    assert sorted(s.id for s in listed.sessions) == ["a", "b", "c"]
+    assert service.stats["evicted"] == 2 and service.stats["rehydrated"] == 1
+    service.close()
+
+
+def test_idle_sessions_expire_to_disk():
+    service = EvictingSessionService(ttl_seconds=0)
+    asyncio.run(create(service, "a", "b"))
+    assert list(service.sessions[APP][USER]) == ["b"]
+    assert service.stats["expired"] == 1
+    service.close()
+
+
+def test_close_removes_owned_spill_dir():
+    service = EvictingSessionService(max_sessions=1, ttl_seconds=None)
+    asyncio.run(create(service, "a", "b"))
+    spill_dir = service.spill_dir
+    assert os.listdir(spill_dir)
+    service.close()
+    assert not os.path.exists(spill_dir)
+    service.close()  # idempotent
+
+
+def test_garbage_collection_removes_owned_spill_dir():
+    service = EvictingSessionService(max_sessions=1, ttl_seconds=None)
+    asyncio.run(create(service, "a", "b"))
+    spill_dir = service.spill_dir
+    del service
+    gc.collect()
+    assert not os.path.exists(spill_dir)
+
+
+def test_close_keeps_a_given_spill_dir(tmp_path):
+    service = EvictingSessionService(spill_dir=str(tmp_path), max_sessions=1, ttl_seconds=None)
+    asyncio.run(create(service, "a", "b"))
+    assert os.listdir(tmp_path)
+    service.close()
+    assert tmp_path.exists() and os.listdir(tmp_path) == []
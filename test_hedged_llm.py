@@ -0,0 +1,98 @@
+# test_hedged_llm.py
+import asyncio
+import importlib.util
+import os
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+# tutorail_multiple_llms/__init__.py is an `adk web` entry point that imports
+# a missing agent module, so the file is loaded directly.
+_spec = importlib.util.spec_from_file_location("hedged_llm", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "tutorail_multiple_llms", "models", "hedged_llm.py"))
+hedged_llm = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(hedged_llm)
+HedgedLlm = hedged_llm.HedgedLlm
+
+
+class FakeLlm(BaseLlm):
+    """Answers "<model>: <chunk>" after `delay` seconds, or raises when `fail`."""
+    delay: float = 0.0
+    fail: bool = False
+    chunks: int = 1
+    cancelled: bool = False
+
+    async def generate_content_async(self, llm_request, stream=False) -> AsyncGenerator[LlmResponse, None]:
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError(f"{self.model} is down")
+            for i in range(self.chunks):
+                yield LlmResponse(partial=i < self.chunks - 1,
+                                  content=types.Content(role="model", parts=[types.Part(text=f"{self.model}: {i}")]))
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def request():
+    return LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="weather in london")])])
+
+
+def run(llm, stream=False, settle=0.0):
+    async def scenario():
+        texts = [r.content.parts[0].text async for r in llm.generate_content_async(request(), stream=stream)]
+        await asyncio.sleep(settle)
+        return texts
+    return asyncio.run(scenario())
+
+
+def hedged(primary, secondary, **kwargs):
+    return HedgedLlm(primary=primary, secondary=secondary, **kwargs)
+
+
+def test_fast_primary_answers_alone():
+    llm = hedged(FakeLlm(model="a", chunks=3), FakeLlm(model="b"), initial_hedge_delay=1.0)
+    assert run(llm, stream=True) == ["a: 0", "a: 1", "a: 2"]
+    assert llm.stats["hedged"] == 0 and len(llm._latencies[True]) == 1 and not llm._latencies[False]
+
+
+def test_slow_primary_is_hedged_and_still_sampled_after_losing():
+    primary = FakeLlm(model="a", delay=0.3)
+    llm = hedged(primary, FakeLlm(model="b"), initial_hedge_delay=0.05)
+    assert run(llm, settle=0.5) == ["b: 0"]
+    assert llm.stats["hedged"] == 1 and llm.stats["secondary_wins"] == 1
+    assert list(llm._latencies[False]) == [pytest.approx(0.3, abs=0.1)]
+
+
+def test_losing_primary_is_cancelled_at_max_hedge_delay():
+    primary = FakeLlm(model="a", delay=5.0)
+    llm = hedged(primary, FakeLlm(model="b"), initial_hedge_delay=0.05, max_hedge_delay=0.2)
+    assert run(llm, settle=0.4) == ["b: 0"]
+    assert primary.cancelled
+    assert list(llm._latencies[False]) == [pytest.approx(0.2, abs=0.1)]
+
+
+def test_primary_error_fails_over():
+    llm = hedged(FakeLlm(model="a", fail=True), FakeLlm(model="b"), initial_hedge_delay=1.0)
+    assert run(llm) == ["b: 0"]
+    assert llm.stats["failovers"] == 1 and llm.stats["errors"] == 1
+    assert not llm._latencies[False]
+
+
+def test_both_failing_raises_the_last_error():
+    llm = hedged(FakeLlm(model="a", fail=True), FakeLlm(model="b", fail=True), initial_hedge_delay=1.0)
+    with pytest.raises(RuntimeError, match="b is down"):
+        run(llm)
+    assert llm.stats["failovers"] == 1 and llm.stats["errors"] == 2
+
+
+def test_hedge_delay_is_per_stream_mode():
+    llm = hedged(FakeLlm(model="a"), FakeLlm(model="b"), initial_hedge_delay=3.0, min_samples=2,
+                 min_hedge_delay=0.5, max_hedge_delay=15.0)
+    llm._latencies[False].extend([8.0, 9.0])
+    llm._latencies[True].extend([0.1, 0.2])
+    assert llm.hedge_delay(stream=False) == 9.0
+    assert llm.hedge_delay(stream=True) == 0.5
@@ -0,0 +1,47 @@
+# test_hook_index.py
+import pytest
+
+from hook_index import HookIndex, extract_hook, hook_ngrams
+from post_table import PostTable
+
+
+def index_of(posts):
+    table = PostTable.from_records([{"Name": text, "Impression Count": impressions} for text, impressions in posts])
+    return HookIndex.build(table)
+
+
+def test_extract_hook_takes_the_first_sentence_of_the_first_line():
+    assert extract_hook("https://t.co/x\n\nStop doing curls. Do rows instead.\nMore") == "Stop doing curls."
+    assert extract_hook("") == ""
+
+
+def test_hook_ngrams_tag_openings_and_drop_stopword_unigrams():
+    grams = set(hook_ngrams(["stop", "the", "curls"], max_n=2))
+    assert {"stop", "curls", "stop the", "the curls", "^ stop", "^ stop the"} == grams
+
+
+def test_top_patterns_rank_by_mean_metric_with_lift():
+    index = index_of([
+        ("Stop doing curls.", 900), ("Stop doing squats.", 1100), ("Stop doing lunges.", 1000),
+        ("I lifted today.", 100), ("I lifted again.", 100), ("I lifted more.", 100),
+    ])
+    best = index.top_patterns("Impression Count", k=1, min_posts=3, opening_only=True)[0]
+    assert best["pattern"] == "stop" and best["position"] == "opening"
+    assert best["posts"] == 3 and best["mean Impression Count"] == 1000.0
+    assert best["lift"] == pytest.approx(1000 / 550, abs=1e-3)
+    assert best["example_hooks"] == ["Stop doing squats.", "Stop doing lunges."]
+
+    worst = index.top_patterns("Impression Count", k=1, min_posts=3, opening_only=True, largest=False)[0]
+    assert worst["pattern"] == "i"
+
+
+def test_patterns_covering_the_same_posts_are_reported_once():
+    index = index_of([("Stop doing curls.", 900), ("Stop doing squats.", 1100), ("Stop doing lunges.", 1000)])
+    patterns = [(p["pattern"], p["position"]) for p in index.top_patterns(min_posts=3)]
+    # Every pattern here covers the same three posts: one single word per position is kept.
+    assert sorted(patterns) == [("stop", "anywhere"), ("stop", "opening")]
+
+
+def test_min_posts_filters_rare_patterns():
+    index = index_of([("Rare hook.", 5000), ("Common hook.", 10), ("Common hook!", 10)])
+    assert all(p["posts"] >= 2 for p in index.top_patterns(min_posts=2, opening_only=False))
@@ -0,0 +1,87 @@
+# test_intent_router.py
+from types import SimpleNamespace
+
+import pytest
+from google.adk.events import Event
+from google.genai import types
+
+from tutorial_sub_agents.utils.intent_router import LLM_CALLS_PER_DELEGATION, IntentRouter, classify
+
+
+def make_router(shadow=False):
+    return IntentRouter(
+        handlers={"greeting": lambda: "Hello!", "farewell": lambda: "Goodbye!"},
+        agent_names={"greeting": "greeting_agent", "farewell": "farewell_agent"},
+        shadow=shadow,
+    )
+
+
+def context(text, invocation_id="inv-1", events=()):
+    return SimpleNamespace(
+        user_content=types.Content(role="user", parts=[types.Part(text=text)]),
+        invocation_id=invocation_id,
+        session=SimpleNamespace(events=list(events)),
+    )
+
+
+def event(author, invocation_id="inv-1", text=None, call=None, response=None, partial=None):
+    if call:
+        part = types.Part(function_call=types.FunctionCall(name=call, args={}))
+    elif response:
+        part = types.Part(function_response=types.FunctionResponse(name=response, response={}))
+    else:
+        part = types.Part(text=text)
+    return Event(author=author, invocation_id=invocation_id, partial=partial,
+                 content=types.Content(role="model", parts=[part]))
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("Hi!", "greeting"),
+    ("Good morning everyone", "greeting"),
+    ("Thanks, bye!", "farewell"),
+    ("See you later", "farewell"),
+])
+def test_classify_confident(text, intent):
+    assert classify(text) == (intent, 1.0)
+
+
+@pytest.mark.parametrize("text", ["What is the weather in London?", "", "hi and bye"])
+def test_classify_leaves_the_rest_to_the_model(text):
+    intent, confidence = classify(text)
+    assert intent is None or confidence < 0.8
+
+
+def test_live_fast_path_answers_without_printing(capsys):
+    router = make_router()
+    reply = router.before_agent_callback(context("Hello there!"))
+    assert reply.parts[0].text == "Hello!"
+    assert router.before_agent_callback(context("Weather in Tokyo?")) is None
+    assert capsys.readouterr().out == ""
+    assert router.stats["fast_path"] == 1 and router.stats["fallback"] == 1
+    assert router.llm_calls_saved() == LLM_CALLS_PER_DELEGATION
+    summary = router.summary()
+    assert "estimated" in summary and "misroute" not in summary
+
+
+def test_shadow_mode_measures_misroutes_and_llm_calls():
+    router = make_router(shadow=True)
+    delegated = [
+        event("user", text="Hi!"),
+        event("weather_agent_v2", call="transfer_to_agent"),
+        event("weather_agent_v2", response="transfer_to_agent"),
+        event("greeting_agent", call="say_hello"),
+        event("greeting_agent", response="say_hello"),
+        event("greeting_agent", text="Hel", partial=True),
+        event("greeting_agent", text="Hello!"),
+    ]
+    assert router.before_agent_callback(context("Hi!")) is None
+    router.after_agent_callback(context("Hi!", events=delegated))
+
+    answered_itself = [event("user", "inv-2", text="Bye"), event("weather_agent_v2", "inv-2", text="Bye!")]
+    router.before_agent_callback(context("Bye", "inv-2"))
+    router.after_agent_callback(context("Bye", "inv-2", events=answered_itself))
+
+    assert router.stats["fast_path"] == 0
+    assert router.misroute_rate() == 0.5
+    assert router.llm_calls_per_delegation() == 3
+    assert "misroute rate 50.0%" in router.summary()
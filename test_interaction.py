@@ -0,0 +1,95 @@
+# test_interaction.py
+import asyncio
+import filecmp
+import os
+
+from google.adk.events import Event
+from google.genai import types
+
+from agent_streaming import stream_agent_async
+from tutorial_sub_agents.utils.interaction import call_agent_async, run_batch
+
+
+def reply(text, partial=None):
+    return Event(author="agent", partial=partial, content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+class FakeSessionService:
+    def __init__(self):
+        self.sessions = set()
+
+    async def get_session(self, app_name, user_id, session_id, config=None):
+        return (user_id, session_id) if (user_id, session_id) in self.sessions else None
+
+    async def create_session(self, app_name, user_id, session_id):
+        self.sessions.add((user_id, session_id))
+
+
+class FakeRunner:
+    """Answers each query with "re: <query>"; "fail" raises."""
+
+    app_name = "app"
+
+    def __init__(self, events=None):
+        self.session_service = FakeSessionService()
+        self.events = events
+        self.in_flight = self.max_in_flight = 0
+        self.order = []
+
+    async def run_async(self, user_id, session_id, new_message, run_config=None):
+        query = new_message.parts[0].text
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            self.order.append((session_id, query))
+            if query == "fail":
+                raise RuntimeError("boom")
+            for event in self.events or [reply(f"re: {query}")]:
+                yield event
+        finally:
+            self.in_flight -= 1
+
+
+def test_copies_are_identical():
+    root = os.path.dirname(os.path.abspath(__file__))
+    original = os.path.join(root, "tutorial_sub_agents", "utils", "interaction.py")
+    for copy in ("tutorial_with_memory", "tutorail_multiple_llms"):
+        assert filecmp.cmp(original, os.path.join(root, copy, "utils", "interaction.py"), shallow=False)
+
+
+def test_run_batch_orders_turns_per_session_and_caps_concurrency():
+    runner = FakeRunner()
+    jobs = [("u", f"s{i % 4}", f"q{i}") for i in range(12)] + [("u", "s0", "fail")]
+    results = asyncio.run(run_batch(runner, jobs, concurrency=2))
+
+    assert [r["query"] for r in results] == [job[2] for job in jobs]
+    assert results[0]["response"] == "re: q0"
+    assert results[-1]["response"] is None and "boom" in results[-1]["error"]
+    assert runner.max_in_flight <= 2
+    assert [q for s, q in runner.order if s == "s0"] == ["q0", "q4", "q8", "fail"]
+    assert len(runner.session_service.sessions) == 4
+
+
+def test_run_batch_prints_only_when_verbose(capsys):
+    asyncio.run(run_batch(FakeRunner(), [("u", "s", "hi")]))
+    assert capsys.readouterr().out == ""
+    asyncio.run(run_batch(FakeRunner(), [("u", "s", "hi")], verbose=True))
+    out = capsys.readouterr().out
+    assert "Agent: re: hi" in out and "--- Batch: 1 turns" in out
+
+
+def test_stream_skips_the_aggregated_final_event():
+    runner = FakeRunner(events=[reply("Hel", partial=True), reply("lo", partial=True), reply("Hello")])
+    timings = {}
+
+    async def collect():
+        return [chunk async for chunk in stream_agent_async("hi", runner, "u", "s", timings=timings)]
+
+    assert asyncio.run(collect()) == ["Hel", "lo"]
+    assert 0 < timings["time_to_first_token"] <= timings["time_to_final"]
+
+
+def test_stream_yields_unstreamed_response_whole():
+    runner = FakeRunner(events=[reply("Hello")])
+    assert asyncio.run(call_agent_async("hi", runner, "u", "s", verbose=False, stream=True)) == "Hello"
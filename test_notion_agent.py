@@ -0,0 +1,104 @@
+# test_notion_agent.py
+import asyncio
+
+import pytest
+
+from notion_agent import agent
+from notion_tool import all_of, count_at_least, created_between, flag_is, sort_by
+
+
+def raw_page(page_id, likes, impressions):
+    return {"id": page_id, "properties": {
+        "Name": {"title": [{"text": {"content": f"post {page_id}"}}]},
+        "like_count": {"number": likes},
+        "impression_count": {"number": impressions},
+    }}
+
+
+@pytest.fixture
+def notion_queries(monkeypatch):
+    calls = []
+
+    async def query(filter=None, sorts=None, limit=None):
+        calls.append({"filter": filter, "sorts": sorts, "limit": limit})
+        return [raw_page("a", 5, 100), raw_page("b", 1, 50)][:limit]
+
+    monkeypatch.setattr(agent.notion_tool, "query_database_with_pagination_async", query)
+    return calls
+
+
+def test_filter_builders_use_notion_property_names():
+    assert count_at_least("Like Count", 3) == {"property": "like_count", "number": {"greater_than_or_equal_to": 3}}
+    assert flag_is("Is Thread Head") == {"property": "is_thread_head", "checkbox": {"equals": True}}
+    assert created_between("2025-05-01") == {"property": "created_at", "date": {"on_or_after": "2025-05-01"}}
+    assert sort_by("Created At", descending=False) == {"property": "created_at", "direction": "ascending"}
+    assert all_of(None, None) is None
+    assert all_of(flag_is("Is Note Tweet"), None) == flag_is("Is Note Tweet")
+
+
+def test_query_posts_pushes_filters_sorts_and_limit_down(notion_queries):
+    result = asyncio.run(agent.query_posts(created_after="2025-05-01", min_likes=2, thread_heads_only=True,
+                                           sort_metric="Like Count", limit=1))
+    call, = notion_queries
+    assert call["filter"] == {"and": [created_between("2025-05-01"), count_at_least("Like Count", 2),
+                                      flag_is("Is Thread Head")]}
+    assert call["sorts"] == [sort_by("Like Count")]
+    assert call["limit"] == 1
+    assert result["total_posts"] == 1 and result["posts"][0]["Like Count"] == 5
+    assert "Engagement Rate" in result["posts"][0]
+
+
+@pytest.mark.parametrize("metric", ["Engagement Rate", "Name", "likes"])
+def test_query_posts_rejects_sorts_notion_cannot_do(notion_queries, metric):
+    result = asyncio.run(agent.query_posts(sort_metric=metric))
+    assert result["status"] == "error" and metric in result["error_message"]
+    assert notion_queries == []
+
+
+@pytest.fixture
+def cached_posts(monkeypatch):
+    """Serve the agent's tools from a small in-memory table instead of Notion."""
+    from hook_index import HookIndex
+    from post_metrics import add_standard_metrics
+    from post_search import PostSearchIndex
+    from post_table import PostTable
+
+    records = [
+        {"Name": "Dumbbell row guide", "URL": "https://x.com/a/status/1933843969110315258",
+         "Impression Count": 1000, "Like Count": 50, "Created At": "2025-05-10"},
+        {"Name": "Dumbbell curls are overrated", "Impression Count": 200, "Like Count": 2, "Created At": "2025-04-01"},
+        {"Name": "Fat loss tips", "Impression Count": 500, "Like Count": 20, "Created At": "2025-05-20"},
+    ]
+    table = add_standard_metrics(PostTable.from_records(records, ids=["p0", "p1", "p2"]))
+    search = PostSearchIndex()
+    search.apply_sync(table, {"full": True, "changed": [], "removed": []})
+    posts = agent.PostData(table=table, hooks=HookIndex.build(table), search=search)
+
+    async def get_posts():
+        return posts
+
+    monkeypatch.setattr(agent, "_get_posts", get_posts)
+    return posts
+
+
+def test_search_posts_applies_metric_and_date_filters(cached_posts):
+    result = asyncio.run(agent.search_posts("dumbbells"))
+    assert [post["Text"] for post in result["posts"]] == ["Dumbbell row guide", "Dumbbell curls are overrated"]
+    result = asyncio.run(agent.search_posts("dumbbells", min_impressions=500))
+    assert result["total_matches"] == 1
+    result = asyncio.run(agent.search_posts("dumbbells", created_after="2025-05-01"))
+    assert [post["Text"] for post in result["posts"]] == ["Dumbbell row guide"]
+
+
+def test_search_posts_rejects_a_bad_date(cached_posts):
+    result = asyncio.run(agent.search_posts("dumbbells", created_after="last week"))
+    assert result["status"] == "error" and "ISO" in result["error_message"]
+
+
+def test_get_post_finds_a_post_by_url_or_id(cached_posts):
+    result = asyncio.run(agent.get_post("https://x.com/someone/status/1933843969110315258"))
+    assert result["post"]["Name"] == "Dumbbell row guide"
+    assert result["post"]["Tweet ID"] == 1933843969110315258
+    assert asyncio.run(agent.get_post("1933843969110315258"))["status"] == "success"
+    assert asyncio.run(agent.get_post("1933843969110315259"))["status"] == "error"
+    assert "not a tweet" in asyncio.run(agent.get_post("hello"))["error_message"]
@@ -0,0 +1,63 @@
+# test_notion_export.py
+import json
+import os
+
+import pytest
+
+import notion_export
+from notion_export import atomic_writer, sort_by_impressions, write_json
+
+
+def test_new_file_gets_umask_mode(tmp_path):
+    path = tmp_path / "out.jsonl"
+    notion_export.write_json_lines([{"a": 1}], str(path))
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~notion_export._UMASK
+
+
+def test_umask_matches_process():
+    umask = os.umask(0o022)
+    os.umask(umask)
+    assert notion_export._UMASK == umask
+
+
+def test_existing_file_keeps_mode(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_text("old")
+    os.chmod(path, 0o640)
+    write_json([{"a": 1}], str(path))
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    assert json.loads(path.read_text()) == {"data": [{"a": 1}], "record_count": 1}
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_text("old")
+    with pytest.raises(RuntimeError):
+        with atomic_writer(str(path)) as f:
+            f.write("partial")
+            raise RuntimeError
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["out.json"]
+
+
+def test_failed_chmod_closes_and_removes_temp_file(tmp_path, monkeypatch):
+    closed = []
+    real_close = os.close
+
+    def fchmod(fd, mode):
+        closed.append(fd)
+        raise PermissionError
+
+    monkeypatch.setattr(notion_export.os, "fchmod", fchmod)
+    with pytest.raises(PermissionError):
+        with atomic_writer(str(tmp_path / "out.json")):
+            pass
+    assert os.listdir(tmp_path) == []
+    with pytest.raises(OSError):
+        real_close(closed[0])
+
+
+def test_sort_by_impressions_spills_and_merges():
+    records = [{"id": i, "Impression Count": i % 7} for i in range(50)]
+    result = list(sort_by_impressions(iter(records), chunk_size=8))
+    assert result == sorted(records, key=lambda r: r["Impression Count"], reverse=True)
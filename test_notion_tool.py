@@ -0,0 +1,159 @@
+# test_notion_tool.py
+import time
+
+import pytest
+
+import notion_agent.notion_tool
+import notion_tool
+from notion_tool import NotionDatabaseTool
+
+
+@pytest.fixture
+def tool():
+    return NotionDatabaseTool("token", "db", backoff_base=1.0, backoff_cap=30.0)
+
+
+@pytest.mark.parametrize("retry_after, expected", [
+    ("2", 2.0),
+    ("0.5", 0.5),
+    ("0", 0.0),
+    ("120", 30.0),
+    ("-5", 0.0),
+])
+def test_retry_after_is_clamped(tool, retry_after, expected):
+    assert tool._retry_delay(0, retry_after) == expected
+
+
+@pytest.mark.parametrize("retry_after", [None, "nan", "inf", "-inf", "soon"])
+def test_unusable_retry_after_falls_back_to_backoff(tool, retry_after):
+    # Attempt 3: 1.0 * 2**3 = 8 seconds, jittered to [4, 8].
+    assert 4.0 <= tool._retry_delay(3, retry_after) <= 8.0
+
+
+def test_backoff_is_capped(tool):
+    assert tool._retry_delay(20) <= tool.backoff_cap
+
+
+def test_notion_agent_reexports_the_root_module():
+    assert notion_agent.notion_tool.NotionDatabaseTool is notion_tool.NotionDatabaseTool
+    assert notion_agent.notion_tool.sort_by is notion_tool.sort_by
+
+
+class FakeNotion:
+    """Serves a database query from a list of pages, honouring page_size,
+    start_cursor and the delta sync's last_edited_time filter."""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.payloads = []
+
+    def __call__(self, url, payload):
+        self.payloads.append(payload)
+        pages = self.pages
+        edited_since = (payload.get("filter") or {}).get("last_edited_time", {}).get("on_or_after")
+        if edited_since:
+            pages = [p for p in pages if p["last_edited_time"] >= edited_since]
+        start = int(payload.get("start_cursor") or 0)
+        end = start + payload["page_size"]
+        return {"results": pages[start:end], "has_more": end < len(pages),
+                "next_cursor": str(end) if end < len(pages) else None}
+
+
+def page(page_id, edited, likes=0, archived=False):
+    return {"id": page_id, "last_edited_time": edited, "archived": archived,
+            "properties": {"Name": {"title": [{"text": {"content": f"post {page_id}"}}]},
+                           "like_count": {"number": likes}}}
+
+
+@pytest.fixture
+def synced_tool(tool):
+    server = FakeNotion([page(f"p{i}", f"2024-05-01T10:0{i}:00.000Z") for i in range(5)])
+    tool._post = server
+    tool.sync()
+    return tool, server
+
+
+def test_first_sync_walks_everything(synced_tool):
+    tool, server = synced_tool
+    assert sorted(tool.replica) == ["p0", "p1", "p2", "p3", "p4"]
+    assert tool.mapped_replica["p3"]["Name"] == "post p3"
+    assert tool.high_water_mark == "2024-05-01T10:04:00.000Z"
+    assert "filter" not in server.payloads[0]
+
+
+def test_delta_sync_merges_edits_and_drops_archived_pages(synced_tool):
+    tool, server = synced_tool
+    server.pages[1] = page("p1", "2024-05-01T11:00:00.000Z", likes=7)
+    server.pages[2] = page("p2", "2024-05-01T11:01:00.000Z", archived=True)
+    server.pages.append(page("p5", "2024-05-01T11:02:00.000Z"))
+    server.payloads.clear()
+
+    pages = tool.sync()
+    assert server.payloads[0]["filter"]["last_edited_time"] == {"on_or_after": "2024-05-01T10:04:00.000Z"}
+    assert sorted(p["id"] for p in pages) == ["p0", "p1", "p3", "p4", "p5"]
+    assert tool.mapped_replica["p1"]["Like Count"] == 7
+    assert tool.last_sync_changes["removed"] == ["p2"]
+    assert tool.high_water_mark == "2024-05-01T11:02:00.000Z"
+
+
+def test_full_resync_drops_pages_deleted_upstream(synced_tool):
+    tool, server = synced_tool
+    del server.pages[0]
+    tool.sync(full=True)
+    assert "p0" not in tool.replica and "p0" not in tool.mapped_replica
+    assert tool.last_sync_changes == {"full": True, "changed": ["p1", "p2", "p3", "p4"], "removed": ["p0"]}
+
+
+def test_failed_sync_leaves_the_replica_untouched(synced_tool):
+    tool, server = synced_tool
+    server.pages.append(page("p5", "2024-05-01T12:00:00.000Z"))
+
+    def broken(url, payload):
+        raise RuntimeError("network down")
+
+    tool._post = broken
+    with pytest.raises(RuntimeError):
+        tool.sync()
+    assert "p5" not in tool.replica
+    assert tool.high_water_mark == "2024-05-01T10:04:00.000Z"
+
+
+def test_prefetch_yields_pages_in_order_and_stays_bounded(tool):
+    server = FakeNotion([page(f"p{i}", "2024-05-01T10:00:00.000Z") for i in range(10)])
+    tool._post = server
+    seen = []
+    for results in tool.iter_result_pages_prefetched(page_size=1, depth=2):
+        time.sleep(0.05)
+        # The page in hand, `depth` queued, and one the producer is waiting to queue.
+        assert len(server.payloads) <= len(seen) + 1 + 2 + 1
+        seen.extend(p["id"] for p in results)
+    assert seen == [f"p{i}" for i in range(10)]
+
+
+def test_prefetch_producer_stops_when_the_consumer_does(tool):
+    server = FakeNotion([page(f"p{i}", "2024-05-01T10:00:00.000Z") for i in range(50)])
+    tool._post = server
+    pages = tool.iter_result_pages_prefetched(page_size=1, depth=1)
+    next(pages)
+    pages.close()
+    time.sleep(0.3)
+    fetched = len(server.payloads)
+    time.sleep(0.3)
+    assert len(server.payloads) == fetched < 50
+
+
+def test_prefetch_reraises_errors_in_the_consumer(tool):
+    def broken(url, payload):
+        raise RuntimeError("network down")
+
+    tool._post = broken
+    with pytest.raises(RuntimeError, match="network down"):
+        list(tool.iter_result_pages_prefetched())
+
+
+def test_sync_all_syncs_every_database():
+    tools = [NotionDatabaseTool("token", f"db{n}") for n in range(3)]
+    for n, tool in enumerate(tools):
+        tool._post = FakeNotion([page(f"db{n}-p{i}", "2024-05-01T10:00:00.000Z") for i in range(n + 1)])
+    synced = notion_tool.sync_all(tools)
+    assert {database_id: len(pages) for database_id, pages in synced.items()} == {"db0": 1, "db1": 2, "db2": 3}
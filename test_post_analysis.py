@@ -0,0 +1,68 @@
+# test_post_analysis.py
+import numpy as np
+import pytest
+
+import post_analysis
+from post_analysis import cohort_masks, compare_cohorts, summarize, top_indices
+from post_table import PostTable
+
+
+def table_of(likes, thread_heads=None):
+    thread_heads = thread_heads or [False] * len(likes)
+    return PostTable.from_records(
+        [{"Name": f"post {i}", "Like Count": n, "Impression Count": 100, "Is Thread Head": head}
+         for i, (n, head) in enumerate(zip(likes, thread_heads))],
+        ids=[str(i) for i in range(len(likes))])
+
+
+@pytest.mark.parametrize("likes", [
+    [5] * 8,                          # everything tied
+    [0, 0, 0, 0, 0, 0, 1, 9],         # ties at the bottom cut
+    [1, 9, 9, 9, 9, 9, 9, 9],         # ties at the top cut
+    list(range(10)),
+])
+def test_numeric_cohorts_never_overlap(likes):
+    masks = cohort_masks(table_of(likes), "Like Count")
+    top, bottom = masks["Top 25% by Like Count"], masks["Bottom 25% by Like Count"]
+    assert not (top & bottom).any()
+    assert top.sum() == bottom.sum() == len(likes) // 4
+    assert min(np.asarray(likes)[top]) >= max(np.asarray(likes)[bottom])
+
+
+@pytest.mark.parametrize("n, size", [(0, 0), (1, 0), (2, 1), (3, 1), (7, 1), (8, 2)])
+def test_small_tables_get_disjoint_cohorts(n, size):
+    masks = cohort_masks(table_of(list(range(n))), "Like Count")
+    top, bottom = masks.values()
+    assert top.sum() == bottom.sum() == size and not (top & bottom).any()
+
+
+def test_flag_cohorts_split_on_the_flag():
+    masks = cohort_masks(table_of([1, 2, 3], [True, False, True]), "Is Thread Head")
+    assert masks["Is Thread Head"].tolist() == [True, False, True]
+    assert masks["Not Is Thread Head"].tolist() == [False, True, False]
+
+
+def test_compare_cohorts_reports_each_cohort():
+    result = compare_cohorts(table_of(list(range(8))), "Like Count", ["Like Count"], examples=1)
+    assert result["Top 25% by Like Count"]["Like Count"]["mean"] == 6.5
+    assert result["Bottom 25% by Like Count"]["count"] == 2
+    assert result["Top 25% by Like Count"]["examples"][0]["Like Count"] == 7
+
+
+def test_top_indices_best_first():
+    values = np.array([3, 9, 1, 7, 5])
+    assert top_indices(values, 2).tolist() == [1, 3]
+    assert top_indices(values, 2, largest=False).tolist() == [2, 0]
+    assert top_indices(values, 10).tolist() == [1, 3, 4, 0, 2]
+    assert top_indices(values, 0).tolist() == []
+
+
+def test_summarize_ignores_nan_and_handles_empty():
+    assert summarize([]) == {"count": 0}
+    stats = summarize([1.0, float("nan"), 3.0])
+    assert stats["count"] == 2 and stats["mean"] == 2.0
+
+
+def test_snippet_shortens_long_text():
+    assert post_analysis.snippet("a  b\nc") == "a b c"
+    assert len(post_analysis.snippet("x" * 500)) == post_analysis.SNIPPET_CHARS
@@ -0,0 +1,60 @@
+import asyncio
+
+from post_cache import PostCache
+
+
+def test_concurrent_misses_share_one_load():
+    async def run():
+        cache = PostCache(ttl_seconds=60)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        results = await asyncio.gather(*(cache.get_or_load("db", loader) for _ in range(5)))
+        assert results == [1] * 5
+        assert await cache.get_or_load("db", loader) == 1
+        assert (cache.misses, cache.coalesced, cache.hits) == (1, 4, 1)
+
+    asyncio.run(run())
+
+
+def test_get_after_invalidate_does_not_join_the_stale_load():
+    async def run():
+        cache = PostCache(ttl_seconds=60)
+        release_old = asyncio.Event()
+        versions = iter(["stale", "fresh"])
+
+        async def loader():
+            version = next(versions)
+            if version == "stale":
+                await release_old.wait()
+            return version
+
+        old = asyncio.ensure_future(cache.get_or_load("db", loader))
+        await asyncio.sleep(0)
+        cache.invalidate("db")
+        fresh = await cache.get_or_load("db", loader)
+        release_old.set()
+        assert await old == "stale"
+        assert fresh == "fresh"
+        # The stale load finished last but must not overwrite the fresh entry.
+        assert await cache.get_or_load("db", loader) == "fresh"
+
+    asyncio.run(run())
+
+
+def test_entries_expire():
+    async def run():
+        cache = PostCache(ttl_seconds=0)
+        values = iter([1, 2])
+
+        async def loader():
+            return next(values)
+
+        assert await cache.get_or_load("db", loader) == 1
+        assert await cache.get_or_load("db", loader) == 2
+
+    asyncio.run(run())
@@ -0,0 +1,55 @@
+# test_post_metrics.py
+import numpy as np
+import pytest
+
+from post_metrics import add_standard_metrics, percentile_rank, rolling_mean
+from post_table import PostTable
+
+
+def table_of(rows):
+    return PostTable.from_records([
+        {"Like Count": likes, "Retweet Count": retweets, "Reply Count": replies, "Bookmark Count": bookmarks,
+         "Impression Count": impressions, "Created At": created}
+        for likes, retweets, replies, bookmarks, impressions, created in rows])
+
+
+def test_standard_metrics():
+    table = add_standard_metrics(table_of([
+        (8, 1, 1, 2, 200, "2025-05-01"),
+        (0, 0, 0, 0, 0, "2025-05-02"),   # no impressions: rates are 0, not NaN
+    ]))
+    assert table.column("Engagement Rate").tolist() == [5.0, 0.0]
+    assert table.column("Bookmark Rate").tolist() == [1.0, 0.0]
+    assert table.column("Virality Ratio").tolist() == [0.125, 0.0]
+    assert table.column("Impression Percentile").tolist() == [75.0, 25.0]
+
+
+def test_percentiles_are_optional():
+    table = add_standard_metrics(table_of([(1, 0, 0, 0, 10, "")]), percentiles=False)
+    assert "Engagement Rate" in table.metrics and "Impression Percentile" not in table.metrics
+
+
+def test_percentile_rank_ties_share_their_rank():
+    assert percentile_rank([10, 20, 20, 30]).tolist() == [12.5, 50.0, 50.0, 87.5]
+    assert percentile_rank([]).tolist() == []
+
+
+def test_rolling_mean_matches_a_brute_force_window():
+    rng = np.random.default_rng(0)
+    days = rng.integers(0, 90, size=200)
+    created = [str(np.datetime64("2025-01-01") + np.timedelta64(int(d), "D")) for d in days]
+    created[5] = ""
+    values = rng.random(200)
+    table = table_of([(0, 0, 0, 0, 0, c) for c in created])
+
+    result = rolling_mean(table, values, window_days=7)
+    assert np.isnan(result[5])
+    for i in range(200):
+        if i == 5:
+            continue
+        in_window = [j for j in range(200) if j != 5 and days[i] - 7 <= days[j] <= days[i]]
+        assert result[i] == pytest.approx(values[in_window].mean())
+
+
+def test_rolling_mean_without_dates_is_all_nan():
+    assert np.isnan(rolling_mean(table_of([(0, 0, 0, 0, 0, "")]), [1.0])).all()
@@ -0,0 +1,57 @@
+# test_post_search.py
+import pytest
+
+from post_search import PostSearchIndex, search_terms
+from post_table import PostTable
+
+DOCS = {
+    "a": "Dumbbells are all you need for a home gym",
+    "b": "Fat loss tips: walk more, eat protein",
+    "c": "My dumbbell routine for arms https://example.com/dumbbells",
+    "d": "Protein protein protein",
+}
+
+
+def index_of(docs):
+    index = PostSearchIndex()
+    for doc, text in docs.items():
+        index.upsert(doc, text)
+    return index
+
+
+def test_search_terms_strip_urls_and_plurals():
+    assert search_terms("Dumbbells & class, gym: https://x.com/s/1") == ["dumbbell", "class", "gym"]
+
+
+def test_bm25_ranks_matches_and_honours_allowed():
+    index = index_of(DOCS)
+    assert {doc for doc, _ in index.search("dumbbells")} == {"a", "c"}
+    assert [doc for doc, _ in index.search("protein")] == ["d", "b"]
+    assert index.search("protein", allowed=lambda doc: doc != "d") == [("b", index.scores("protein")["b"])]
+    assert index.search("protein", k=1)[0][0] == "d"
+    assert index.search("kettlebell") == []
+
+
+def test_incremental_updates_match_a_rebuild():
+    index = index_of(DOCS)
+    index.upsert("b", "Dumbbell fat loss")
+    index.remove("d")
+    index.remove("missing")
+
+    rebuilt = index_of({"a": DOCS["a"], "b": "Dumbbell fat loss", "c": DOCS["c"]})
+    assert index.scores("dumbbell fat") == pytest.approx(rebuilt.scores("dumbbell fat"))
+    assert index.total_length == rebuilt.total_length
+    assert "protein" not in index.postings
+
+
+def test_apply_sync_reindexes_only_changed_rows():
+    table = PostTable.from_records([{"Name": DOCS[doc]} for doc in "abc"], ids=list("abc"))
+    index = PostSearchIndex()
+    index.apply_sync(table, {"full": False, "changed": [], "removed": []})   # empty index: full build
+    assert len(index) == 3
+
+    table = PostTable.from_records([{"Name": "Kettlebell swings"}, {"Name": DOCS["c"]}], ids=["a", "c"])
+    index.apply_sync(table, {"full": False, "changed": ["a"], "removed": ["b"]})
+    assert len(index) == 2
+    assert [doc for doc, _ in index.search("kettlebell")] == ["a"]
+    assert [doc for doc, _ in index.search("dumbbell")] == ["c"]
@@ -0,0 +1,75 @@
+# test_post_snapshot.py
+import json
+
+import numpy as np
+import pytest
+
+from post_snapshot import json_to_snapshot, load_snapshot, snapshot_to_json, write_snapshot
+from post_table import PostTable
+
+
+def record(name, likes, impressions, tweet_id=None, **extra):
+    url = f"https://x.com/a/status/{tweet_id}" if tweet_id else ""
+    return {"Name": name, "URL": url, "Like Count": likes, "Impression Count": impressions,
+            "Created At": "2024-05-01T12:00:00.000Z", **extra}
+
+
+@pytest.fixture
+def table():
+    table = PostTable.from_records([
+        record("first post", 3, 100, tweet_id=1790000000000000001),
+        record("zweiter Beitrag – ünïcode ✓", 7, 20, **{"Is Thread Head": True}),
+        record("", 0, 0, tweet_id=1790000000000000003),
+    ], ids=["p1", "p2", "p3"])
+    table.add_metric("Engagement Rate", [0.03, 0.35, 0.0])
+    return table
+
+
+def test_round_trip_keeps_every_row(table, tmp_path):
+    path = tmp_path / "posts.snap"
+    assert write_snapshot(table, path) == 3
+    loaded = load_snapshot(path)
+    assert len(loaded) == 3
+    assert loaded.rows() == table.rows()
+    assert [loaded.ids[i] for i in range(3)] == ["p1", "p2", "p3"]
+    assert loaded.tweet_ids.tolist() == table.tweet_ids.tolist()
+    assert loaded.created_ms.tolist() == table.created_ms.tolist()
+    assert loaded.flags["Is Thread Head"].dtype == np.bool_
+
+
+def test_loaded_table_supports_take_and_order_by(table, tmp_path):
+    path = tmp_path / "posts.snap"
+    write_snapshot(table, path)
+    loaded = load_snapshot(path)
+    order = loaded.order_by("Like Count")
+    top = loaded.take(order[:2])
+    assert [top.ids[i] for i in range(2)] == ["p2", "p1"]
+    assert top.text["Name"][0] == "zweiter Beitrag – ünïcode ✓"
+    assert loaded.find_tweet(1790000000000000003) == 2
+
+
+def test_columns_are_aligned(table, tmp_path):
+    path = tmp_path / "posts.snap"
+    write_snapshot(table, path)
+    loaded = load_snapshot(path)
+    for array in (loaded.tweet_ids, loaded.created_ms, *loaded.counts.values(), *loaded.metrics.values()):
+        assert array.ctypes.data % array.dtype.itemsize == 0
+
+
+def test_json_round_trip(tmp_path):
+    source = tmp_path / "posts.json"
+    records = [record("a", 1, 10, tweet_id=1790000000000000001), record("b", 2, 20)]
+    source.write_text(json.dumps({"data": records}), encoding="utf-8")
+    assert json_to_snapshot(source, tmp_path / "posts.snap") == 2
+    snapshot_to_json(tmp_path / "posts.snap", tmp_path / "back.json")
+    back = json.loads((tmp_path / "back.json").read_text(encoding="utf-8"))["data"]
+    assert [row["Name"] for row in back] == ["a", "b"]
+    assert [row["Like Count"] for row in back] == [1, 2]
+    assert back[0]["Tweet ID"] == 1790000000000000001
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "posts.snap"
+    path.write_bytes(b"NOTASNAP" + bytes(64))
+    with pytest.raises(ValueError, match="not a post snapshot"):
+        load_snapshot(path)
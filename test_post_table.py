@@ -0,0 +1,44 @@
+# test_post_table.py
+import numpy as np
+import pytest
+
+from post_table import MISSING_TIME, PostTable
+
+
+def record(likes=0, impressions=0, url="", created="2024-05-01T12:00:00.000Z", **extra):
+    return {"Name": "post", "URL": url, "Like Count": likes, "Impression Count": impressions,
+            "Created At": created, **extra}
+
+
+def test_from_records_builds_typed_columns():
+    table = PostTable.from_records([
+        record(likes=3, impressions=100, url="https://x.com/a/status/1790000000000000001"),
+        record(likes=None, impressions=50.0, created="", **{"Is Thread Head": True}),
+    ], ids=["p1", "p2"])
+    assert table.counts["Like Count"].dtype == np.int64
+    assert table.counts["Like Count"].tolist() == [3, 0]
+    assert table.counts["Impression Count"].tolist() == [100, 50]
+    assert table.tweet_ids[0] == 1790000000000000001
+    assert table.created_ms[1] == MISSING_TIME
+    assert table.row(1)["Is Thread Head"] is True
+
+
+@pytest.mark.parametrize("bad", [2.5, float("nan"), float("inf"), "many"])
+def test_non_integral_counts_are_rejected(bad):
+    with pytest.raises(ValueError, match="Like Count"):
+        PostTable.from_records([record(likes=1), record(likes=bad)])
+
+
+def test_order_by_is_stable_and_take_keeps_rows_together():
+    table = PostTable.from_records([record(likes=n, impressions=i) for n, i in [(1, 10), (5, 20), (1, 30)]],
+                                   ids=["a", "b", "c"])
+    order = table.order_by("Like Count")
+    assert order.tolist() == [1, 0, 2]
+    top = table.take(order[:2])
+    assert [top.ids[i] for i in range(len(top))] == ["b", "a"]
+    assert top.counts["Impression Count"].tolist() == [20, 10]
+
+
+def test_unknown_column_is_a_key_error():
+    with pytest.raises(KeyError, match="Unknown column"):
+        PostTable.from_records([record()]).column("Nope")
@@ -0,0 +1,124 @@
+# test_sqlite_session_service.py
+import asyncio
+
+import pytest
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.errors.session_not_found_error import SessionNotFoundError
+from google.adk.events import Event, EventActions
+from google.adk.sessions import Session
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+
+from agent_with_storage.sqlite_session_service import SqliteSessionService, split_state
+
+APP, USER = "app", "u"
+
+
+def event(text, **delta):
+    return Event(author="user", invocation_id="inv",
+                 content=types.Content(role="user", parts=[types.Part(text=text)]),
+                 actions=EventActions(state_delta=delta))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "sessions.db")
+
+
+def test_split_state_by_prefix():
+    assert split_state({"app:theme": "dark", "user:name": "Ann", "temp:scratch": 1, "count": 2}) == (
+        {"theme": "dark"}, {"name": "Ann"}, {"count": 2})
+
+
+def test_state_and_events_survive_a_restart(db_path):
+    async def write():
+        service = SqliteSessionService(db_path, batch_size=10)
+        session = await service.create_session(app_name=APP, user_id=USER, session_id="s1",
+                                               state={"count": 0, "user:name": "Ann", "app:theme": "dark"})
+        await service.append_event(session, event("one", count=1, **{"temp:scratch": "x"}))
+        await service.append_event(session, event("two", count=2, **{"user:name": "Bo"}))
+        service.close()
+
+    async def read():
+        service = SqliteSessionService(db_path)
+        session = await service.get_session(app_name=APP, user_id=USER, session_id="s1")
+        user_state = await service.get_user_state(app_name=APP, user_id=USER)
+        service.close()
+        return session, user_state
+
+    asyncio.run(write())
+    session, user_state = asyncio.run(read())
+    assert session.state == {"count": 2, "user:name": "Bo", "app:theme": "dark"}
+    assert [e.content.parts[0].text for e in session.events] == ["one", "two"]
+    assert user_state == {"name": "Bo"}
+
+
+def test_appends_are_batched_but_reads_see_them(db_path):
+    service = SqliteSessionService(db_path, batch_size=3)
+
+    def stored_events():
+        return service.connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    async def scenario():
+        session = await service.create_session(app_name=APP, user_id=USER, session_id="s1")
+        for n in range(2):
+            await service.append_event(session, event(str(n), count=n))
+        assert stored_events() == 0
+        await service.append_event(session, event("2", count=2))
+        assert stored_events() == 3
+        await service.append_event(session, event("3", count=3))
+        return await service.get_session(app_name=APP, user_id=USER, session_id="s1",
+                                         config=GetSessionConfig(num_recent_events=2))
+
+    session = asyncio.run(scenario())
+    assert [e.content.parts[0].text for e in session.events] == ["2", "3"]
+    assert session.state["count"] == 3
+    service.close()
+
+
+def test_partial_events_are_not_stored(db_path):
+    service = SqliteSessionService(db_path, batch_size=1)
+
+    async def scenario():
+        session = await service.create_session(app_name=APP, user_id=USER, session_id="s1")
+        partial = event("chunk")
+        partial.partial = True
+        await service.append_event(session, partial)
+        return await service.get_session(app_name=APP, user_id=USER, session_id="s1")
+
+    assert asyncio.run(scenario()).events == []
+    service.close()
+
+
+def test_errors_for_duplicate_and_unknown_sessions(db_path):
+    service = SqliteSessionService(db_path)
+
+    async def scenario():
+        await service.create_session(app_name=APP, user_id=USER, session_id="s1")
+        with pytest.raises(AlreadyExistsError):
+            await service.create_session(app_name=APP, user_id=USER, session_id="s1")
+        with pytest.raises(SessionNotFoundError):
+            await service.append_event(Session(app_name=APP, user_id=USER, id="missing"), event("hi"))
+        assert await service.get_session(app_name=APP, user_id=USER, session_id="missing") is None
+
+    asyncio.run(scenario())
+    service.close()
+
+
+def test_delete_removes_the_session_and_its_rows(db_path):
+    service = SqliteSessionService(db_path)
+
+    async def scenario():
+        for session_id in ("s1", "s2"):
+            session = await service.create_session(app_name=APP, user_id=USER, session_id=session_id,
+                                                   state={"n": session_id})
+            await service.append_event(session, event("hi"))
+        await service.delete_session(app_name=APP, user_id=USER, session_id="s1")
+        return await service.list_sessions(app_name=APP, user_id=USER)
+
+    listed = asyncio.run(scenario())
+    assert [s.id for s in listed.sessions] == ["s2"]
+    assert listed.sessions[0].state == {"n": "s2"}
+    rows = service.connection.execute("SELECT DISTINCT session_id FROM events").fetchall()
+    assert rows == [("s2",)]
+    service.close()
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from google.adk.sessions import InMemorySessionService
+
+from tutorial_with_memory.sessions.state_delta import StateConflictError, StateDelta, apply_state_delta
+
+
+@pytest.mark.parametrize("build, expected", [
+    (lambda d: d.set("n", 2).increment("n", 3), 5),
+    (lambda d: d.delete("n").increment("n"), 1),
+    (lambda d: d.increment("n", 2).increment("n", 3), 10),
+    (lambda d: d.increment("n").delete("n"), None),
+    (lambda d: d.increment("n").set("n", 7), 7),
+    (lambda d: d.set("n", 1).delete("n"), None),
+])
+def test_ops_keep_their_order(build, expected):
+    assert build(StateDelta()).resolve({"n": 5}) == {"n": expected}
+
+
+def test_increment_missing_key_starts_at_zero():
+    assert StateDelta().increment("n", 2).resolve({}) == {"n": 2}
+
+
+def test_increment_rejects_non_numbers():
+    with pytest.raises(TypeError):
+        StateDelta().increment("n").resolve({"n": "five"})
+    with pytest.raises(TypeError):
+        StateDelta().increment("n").resolve({"n": True})
+
+
+def test_apply_state_delta_writes_one_event_and_checks_version():
+    async def run():
+        service = InMemorySessionService()
+        session = await service.create_session(app_name="app", user_id="u", session_id="s", state={"n": 5})
+        version, written = await apply_state_delta(service, "app", "u", "s", StateDelta().increment("n"),
+                                                   expected_version=session.last_update_time)
+        assert written == {"n": 6}
+        stored = await service.get_session(app_name="app", user_id="u", session_id="s")
+        assert stored.state["n"] == 6
+        assert len(stored.events) == 1
+        with pytest.raises(StateConflictError):
+            await apply_state_delta(service, "app", "u", "s", StateDelta().set("n", 0),
+                                    expected_version=session.last_update_time)
+        assert (await service.get_session(app_name="app", user_id="u", session_id="s")).state["n"] == 6
+        return version
+
+    assert asyncio.run(run()) > 0
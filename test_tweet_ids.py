@@ -0,0 +1,52 @@
+# test_tweet_ids.py
+import pytest
+
+from post_table import PostTable
+from tweet_ids import INT64_MAX, exact_tweet_id, tweet_id_from_text, tweet_id_from_url
+
+EXACT = 1933843969110315258
+
+
+@pytest.mark.parametrize("url", [
+    f"https://x.com/someone/status/{EXACT}",
+    f"https://twitter.com/someone/status/{EXACT}?s=20",
+    f"https://twitter.com/someone/statuses/{EXACT}",
+])
+def test_id_from_status_urls(url):
+    assert tweet_id_from_url(url) == EXACT
+
+
+@pytest.mark.parametrize("url", [None, "", "https://x.com/someone", f"https://x.com/a/status/{INT64_MAX + 1}"])
+def test_no_id_from_other_urls(url):
+    assert tweet_id_from_url(url) is None
+
+
+def test_id_from_text():
+    assert tweet_id_from_text(f"  {EXACT} ") == EXACT
+    assert tweet_id_from_text("id 123") is None
+    assert tweet_id_from_text("0") is None
+
+
+def test_text_property_beats_url_and_number():
+    prop = {"rich_text": [{"plain_text": str(EXACT)}], "number": 1.9338439691103153e18}
+    assert exact_tweet_id(prop, "https://x.com/a/status/42") == EXACT
+
+
+def test_url_beats_rounded_number():
+    prop = {"rich_text": [], "number": 1.9338439691103153e18}
+    assert exact_tweet_id(prop, f"https://x.com/a/status/{EXACT}") == EXACT
+
+
+def test_falls_back_to_the_number():
+    assert exact_tweet_id({"number": 42.0}, "") == 42
+    assert exact_tweet_id(None, "") is None
+
+
+def test_table_indexes_posts_by_tweet_id():
+    records = [{"Name": name, "URL": f"https://x.com/a/status/{tweet_id}" if tweet_id else ""}
+               for name, tweet_id in [("a", EXACT), ("b", None), ("c", EXACT + 1)]]
+    table = PostTable.from_records(records)
+    assert table.tweet_ids.tolist() == [EXACT, 0, EXACT + 1]
+    assert table.find_tweet(str(EXACT + 1)) == 2
+    assert table.find_tweet(7) is None
+    assert table.join_tweet_ids([EXACT + 1, 7, EXACT]).tolist() == [2, -1, 0]
@@ -0,0 +1,82 @@
+# test_weather_backend.py
+import importlib.util
+import json
+import os
+
+from weather_backend import backend
+from weather_backend.backend import Observation, StaticProvider, WeatherBackend, load_backend, make_report
+
+
+class CountingProvider(StaticProvider):
+    def __init__(self, observations):
+        super().__init__(observations)
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return super().load()
+
+
+def test_data_is_loaded_once_and_repeat_queries_are_memoised():
+    provider = CountingProvider([Observation("London", 15, "cloudy")])
+    weather = WeatherBackend(provider)
+    first = weather.resolve("Londn")
+    assert weather.resolve("Londn") is first
+    assert provider.loads == 1
+    assert weather.lookup("LONDON").city == "London"
+
+
+def test_memo_is_bounded_and_reset_by_reload():
+    provider = StaticProvider([Observation("London", 15, "cloudy")])
+    weather = WeatherBackend(provider, memo_size=2)
+    for query in ("London", "london", "Londn", "nowhere"):
+        weather.resolve(query)
+    assert len(weather._snapshot[2]) <= 2
+    weather.reload()
+    assert weather._snapshot[2] == {}
+
+
+def test_exact_matches_do_not_report_a_substitution():
+    weather = WeatherBackend(StaticProvider())
+    assert weather.resolve("new york").tool_result("ok") == {"status": "success", "report": "ok"}
+    assert weather.resolve("NYC").tool_result("ok")["resolved_city"] == "New York"
+
+
+def test_missing_or_odd_city_names_are_misses():
+    weather = WeatherBackend(StaticProvider())
+    assert weather.resolve(None) is None
+    assert weather.resolve("") is None
+    assert weather.error_result("", "Unknown city.") == {"status": "error", "error_message": "Unknown city."}
+
+
+def test_reports_are_formatted_up_front():
+    report = make_report(Observation("Tokyo", 18, "light rain"))
+    assert report.temp_f == 64.4
+    assert report.both == "The weather in Tokyo is light rain with a temperature of 18°C (64°F)."
+    assert report.text() == report.celsius
+
+
+def test_load_backend_reads_a_json_file(tmp_path):
+    path = tmp_path / "weather.json"
+    path.write_text(json.dumps({"Oslo": {"temp_c": -5, "condition": "snowy"}}), encoding="utf-8")
+    assert [report.city for report in load_backend(str(path)).reports.values()] == ["Oslo"]
+    assert len(load_backend()) == 3
+
+
+def test_shared_tool_uses_the_module_backend():
+    # tutorail_multiple_llms/__init__.py imports a missing agent module, so
+    # the file is loaded directly.
+    spec = importlib.util.spec_from_file_location("shared_tools", os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "tutorail_multiple_llms", "agents", "shared_tools.py"))
+    shared_tools = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(shared_tools)
+    assert shared_tools.weather_backend is backend.weather_backend
+
+    assert shared_tools.get_weather("Tokio") == {
+        "status": "success",
+        "report": "The weather in Tokyo is light rain with a temperature of 18°C.",
+        "resolved_city": "Tokyo",
+        "match_score": 1.0,
+    }
+    result = shared_tools.get_weather("Newark")
+    assert result["status"] == "error" and result["suggestions"] == ["New York"]
@@ -1,11 +1,7 @@
+from weather_backend.backend import weather_backend
+
 def get_weather(city: str) -> dict:
-    city_normalized = city.lower().replace(" ", "")
-    mock_weather_db = {
-        "newyork": {"status": "success", "report": "Sunny in New York, 25°C"},
-        "london": {"status": "success", "report": "Cloudy in London, 15°C"},
-        "tokyo": {"status": "success", "report": "Rainy in Tokyo, 18°C"},
-    }
-    return mock_weather_db.get(city_normalized, {
-        "status": "error",
-        "error_message": f"Sorry, I don't have weather info for {city}."
-    })
+    match = weather_backend.resolve(city)
+    if match is not None:
+        return match.tool_result(match.report.celsius)
+    return weather_backend.error_result(city, f"Sorry, I don't have weather info for {city}.")
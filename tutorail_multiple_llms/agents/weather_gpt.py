@@ -1,12 +1,14 @@
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
 from agents.shared_tools import get_weather
-from config import MODEL_GPT_4O
+from models.cached_llm import CachedLlm
+from config import LLM_CACHE_PATH, MODEL_GPT_4O
 
 def build_gpt_agent():
     return Agent(
         name="weather_agent_gpt",
-        model=LiteLlm(model=MODEL_GPT_4O),
+        # Repeated questions are answered from the cache without calling the provider.
+        model=CachedLlm(inner=LiteLlm(model=MODEL_GPT_4O), db_path=LLM_CACHE_PATH),
         description="Weather agent using GPT-4o",
         instruction="Use get_weather to answer weather questions.",
         tools=[get_weather],
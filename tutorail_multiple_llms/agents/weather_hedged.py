@@ -0,0 +1,23 @@
+from google.adk.agents import Agent
+from google.adk.models.lite_llm import LiteLlm
+from agents.shared_tools import get_weather
+from config import LLM_CACHE_PATH, MODEL_CLAUDE_SONNET, MODEL_GPT_4O
+from models.cached_llm import CachedLlm
+from models.hedged_llm import HedgedLlm
+
+def build_hedged_agent():
+    return Agent(
+        name="weather_agent_hedged",
+        # GPT-4o answers; Claude Sonnet is raced in only when GPT-4o is slow or fails.
+        # Cache hits skip the providers altogether.
+        model=CachedLlm(
+            inner=HedgedLlm(
+                primary=LiteLlm(model=MODEL_GPT_4O),
+                secondary=LiteLlm(model=MODEL_CLAUDE_SONNET),
+            ),
+            db_path=LLM_CACHE_PATH,
+        ),
+        description="Weather agent using GPT-4o, hedged with Claude Sonnet",
+        instruction="Use get_weather to answer weather questions.",
+        tools=[get_weather],
+    )
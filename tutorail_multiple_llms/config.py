@@ -12,3 +12,6 @@ USER_ID = "user_123"
 # Model constants
 MODEL_GPT_4O = "openai/gpt-4o"
 MODEL_CLAUDE_SONNET = "anthropic/claude-sonnet-4-20250514"
+
+# On-disk tier of the LLM response cache (models/cached_llm.py)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.db")
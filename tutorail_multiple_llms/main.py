@@ -1,8 +1,11 @@
+# Run from this directory with the repo root (weather_backend/, agent_streaming.py) on the path:
+#   PYTHONPATH=.. python main.py
 import asyncio
 from agents.weather_gpt import build_gpt_agent
 from agents.weather_claude import build_claude_agent
+from agents.weather_hedged import build_hedged_agent
 from runners.runner_factory import build_runner
-from utils.interaction import call_agent_async
+from utils.interaction import run_batch
 from config import APP_NAME, USER_ID
 from google.adk.sessions import InMemorySessionService
 
@@ -20,11 +23,26 @@ async def main():
         session_id="claude_session"
     )
     
+    session_hedged = InMemorySessionService()
+    await session_hedged.create_session(
+        app_name=APP_NAME,
+        user_id=USER_ID,
+        session_id="hedged_session"
+    )
+
     runner_gpt = build_runner(build_gpt_agent(), session_gpt)
     runner_claude = build_runner(build_claude_agent(), session_claude)
+    hedged_agent = build_hedged_agent()
+    runner_hedged = build_runner(hedged_agent, session_hedged)
+
+    # The two sessions are independent, so both models are asked at the same time.
+    await asyncio.gather(
+        run_batch(runner_gpt, [(USER_ID, "gpt_session", "What's the weather in lndon?")], verbose=True),
+        run_batch(runner_claude, [(USER_ID, "claude_session", "What's the weather in Amsterdm?")], verbose=True),
+    )
 
-    await call_agent_async("What's the weather in lndon?", runner_gpt, USER_ID, "gpt_session")
-    await call_agent_async("What's the weather in Amsterdm?", runner_claude, USER_ID, "claude_session")
+    await run_batch(runner_hedged, [(USER_ID, "hedged_session", "What's the weather in Tokyo?")], verbose=True)
+    print(f"--- Hedged model: {hedged_agent.model.inner.stats} | cache: {hedged_agent.model.stats} ---")
 
 if __name__ == "__main__":
     asyncio.run(main())
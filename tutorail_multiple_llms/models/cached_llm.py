@@ -0,0 +1,234 @@
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import AsyncGenerator, Optional
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from pydantic import BaseModel, PrivateAttr
+
+WORD_RE = re.compile(r"\w+")
+
+# Words that change how a question is phrased but not what it asks. Negations
+# and anything naming a place, time or thing are deliberately not here.
+STOPWORDS = frozenset("""
+    a an the is are be what whats s how hows like it its in at for of on to
+    me i please tell show give can could would you do does there current currently
+    right now hey hi ok okay so just
+""".split())
+
+
+def normalize(text):
+    """Lowercase, punctuation-free, single-spaced text for cache keys."""
+    return " ".join(WORD_RE.findall((text or "").lower()))
+
+
+def _content_key(content):
+    parts = []
+    for part in content.parts or []:
+        if part.text:
+            parts.append(["text", normalize(part.text) if content.role == "user" else part.text])
+        elif part.function_call:
+            parts.append(["call", part.function_call.name, part.function_call.args or {}])
+        elif part.function_response:
+            parts.append(["result", part.function_response.name, part.function_response.response or {}])
+    return [content.role, parts]
+
+
+def _config_key(config):
+    """Every generation setting of a request config (temperature, response
+    schema, ...), for the cache key. Instruction and tools are keyed
+    separately; http_options only affects transport."""
+    if config is None:
+        return {}
+    fields = config.model_dump(exclude_none=True, exclude={"system_instruction", "tools", "http_options"})
+    schema = config.response_schema
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        fields["response_schema"] = schema.model_json_schema()
+    return fields
+
+
+def content_words(text):
+    """The words of `text` that carry meaning, in order: stopwords dropped."""
+    return [word for word in normalize(text).split() if word not in STOPWORDS]
+
+
+class CachedLlm(BaseLlm):
+    """Serves repeated requests to `inner` from a cache instead of the provider.
+
+    The key hashes the model name, the system instruction (ADK has already
+    filled in the state values its {placeholders} reference), the tool
+    declarations, the rest of the request config (temperature, response
+    schema, ...) and the conversation contents, with user text normalised.
+    `history_turns` limits the key to the last N user turns of history;
+    None keys on the whole conversation.
+
+    Tiers, checked in order:
+      - memory: LRU of `max_entries`, entries expire after `ttl_seconds`
+      - SQLite (`db_path`): survives restarts, same TTL
+      - rephrasings (opt-in, `match_rephrasings`): when everything but the
+        last user message matches exactly, a cached question with the same
+        content words in the same order counts as a hit. Only filler words
+        may differ ("What's the weather in London?" / "weather in london
+        please"); a different city, date or negation is always a miss.
+        Each SQLite row stores its rephrase key too, so this tier also
+        survives restarts.
+
+    Only complete responses without errors are stored. A hit is replayed as
+    one final response, which is also what a streaming caller gets at the
+    end of a live call.
+    """
+
+    inner: BaseLlm
+    model: str = "cached"
+    max_entries: int = 1024
+    ttl_seconds: float = 3600.0
+    history_turns: Optional[int] = None
+    db_path: Optional[str] = None
+    match_rephrasings: bool = False
+
+    _memory: OrderedDict = PrivateAttr(default=None)
+    _rephrasings: dict = PrivateAttr(default=None)
+    _db: sqlite3.Connection = PrivateAttr(default=None)
+    _stats: dict = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        self._memory = OrderedDict()   # key -> (expires_at, response json, seconds the live call took, rephrase key)
+        self._rephrasings = {}         # rephrase key -> key of the cached answer
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "rephrase_hits": 0, "misses": 0, "seconds_saved": 0.0}
+        if self.db_path:
+            self._db = sqlite3.connect(self.db_path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache ("
+                             "key TEXT PRIMARY KEY, expires_at REAL, response TEXT, seconds REAL, rephrase_key TEXT)")
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(llm_cache)")}
+            if "rephrase_key" not in columns:
+                # Caches written before the rephrase tier was persisted.
+                self._db.execute("ALTER TABLE llm_cache ADD COLUMN rephrase_key TEXT")
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_rephrase ON llm_cache (rephrase_key)")
+
+    @property
+    def stats(self):
+        return self._stats
+
+    @property
+    def capabilities(self):
+        return self.inner.capabilities
+
+    def cache_keys(self, llm_request):
+        """(exact key, rephrase key) for a request.
+
+        The rephrase key covers everything except the last user message, plus
+        that message's content words; None when there is no user message.
+        """
+        contents = list(llm_request.contents or [])
+        if self.history_turns is not None:
+            user_turns = [i for i, c in enumerate(contents)
+                          if c.role == "user" and any(p.text for p in c.parts or [])]
+            if len(user_turns) > self.history_turns:
+                contents = contents[user_turns[-self.history_turns - 1]:]
+        config = llm_request.config
+        tools = []
+        for tool in (config.tools if config and config.tools else []):
+            tools.append(tool.model_dump(mode="json", exclude_none=True))
+        context = {
+            "model": self.inner.model,
+            "instruction": str(config.system_instruction) if config and config.system_instruction else "",
+            "tools": tools,
+            "config": _config_key(config),
+        }
+        last_user = ""
+        if contents and contents[-1].role == "user":
+            last_user = " ".join(p.text for p in contents[-1].parts or [] if p.text)
+        history = [_content_key(c) for c in (contents[:-1] if last_user else contents)]
+        exact = _hash({**context, "history": [_content_key(c) for c in contents]})
+        rephrase_key = _hash({**context, "history": history, "words": content_words(last_user)}) if last_user else None
+        return exact, rephrase_key
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False
+                                     ) -> AsyncGenerator[LlmResponse, None]:
+        key, rephrase_key = self.cache_keys(llm_request)
+        cached = self._lookup(key, rephrase_key)
+        if cached is not None:
+            response_json, seconds = cached
+            self._stats["seconds_saved"] += seconds
+            yield LlmResponse.model_validate_json(response_json)
+            return
+
+        self._stats["misses"] += 1
+        request = llm_request.model_copy()
+        request.model = self.inner.model
+        started = time.perf_counter()
+        final = None
+        async for response in self.inner.generate_content_async(request, stream=stream):
+            if not response.partial:
+                final = response
+            yield response
+        if final is not None and final.content and not final.error_code:
+            self._store(key, rephrase_key, final.model_dump_json(exclude_none=True),
+                        time.perf_counter() - started)
+
+    def _lookup(self, key, rephrase_key):
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return entry[1], entry[2]
+            self._forget(key)
+
+        if self._db is not None:
+            row = self._db.execute("SELECT expires_at, response, seconds FROM llm_cache WHERE key = ?",
+                                   (key,)).fetchone()
+            if row is not None and row[0] > now:
+                self._remember(key, rephrase_key, row[1], row[2], expires_at=row[0])
+                self._stats["disk_hits"] += 1
+                return row[1], row[2]
+
+        if self.match_rephrasings and rephrase_key is not None:
+            entry = self._memory.get(self._rephrasings.get(rephrase_key))
+            if entry is not None and entry[0] > now:
+                self._stats["rephrase_hits"] += 1
+                return entry[1], entry[2]
+            if self._db is not None:
+                row = self._db.execute("SELECT key, expires_at, response, seconds FROM llm_cache "
+                                       "WHERE rephrase_key = ? AND expires_at > ? ORDER BY expires_at DESC LIMIT 1",
+                                       (rephrase_key, now)).fetchone()
+                if row is not None:
+                    self._remember(row[0], rephrase_key, row[2], row[3], expires_at=row[1])
+                    self._stats["rephrase_hits"] += 1
+                    return row[2], row[3]
+        return None
+
+    def _store(self, key, rephrase_key, response_json, seconds):
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, rephrase_key, response_json, seconds, expires_at)
+        if self._db is not None:
+            with self._db:
+                self._db.execute("INSERT OR REPLACE INTO llm_cache (key, expires_at, response, seconds, rephrase_key) "
+                                 "VALUES (?, ?, ?, ?, ?)", (key, expires_at, response_json, seconds, rephrase_key))
+                self._db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+
+    def _remember(self, key, rephrase_key, response_json, seconds, expires_at):
+        self._memory[key] = (expires_at, response_json, seconds, rephrase_key)
+        self._memory.move_to_end(key)
+        if self.match_rephrasings and rephrase_key is not None:
+            self._rephrasings[rephrase_key] = key
+        while len(self._memory) > self.max_entries:
+            oldest = next(iter(self._memory))
+            self._forget(oldest)
+
+    def _forget(self, key):
+        entry = self._memory.pop(key, None)
+        if entry is None:
+            return
+        rephrase_key = entry[3]
+        if self._rephrasings.get(rephrase_key) == key:
+            del self._rephrasings[rephrase_key]
+
+
+def _hash(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
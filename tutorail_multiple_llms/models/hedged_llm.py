@@ -0,0 +1,195 @@
+import asyncio
+import time
+from collections import deque
+from typing import AsyncGenerator
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from pydantic import PrivateAttr
+
+_DONE = object()
+
+
+class _Attempt:
+    """One provider call running as a task that feeds its responses into a queue."""
+
+    def __init__(self, model, llm_request, stream):
+        self.model = model
+        self.started = time.perf_counter()
+        self.queue = asyncio.Queue()
+        request = llm_request.model_copy(deep=True)
+        # LiteLlm prefers llm_request.model over its own, and ADK fills it in
+        # with the wrapper's name, so each attempt names its own model.
+        request.model = model.model
+        self.task = asyncio.ensure_future(self._run(request, stream))
+
+    async def _run(self, request, stream):
+        try:
+            async for response in self.model.generate_content_async(request, stream=stream):
+                await self.queue.put(response)
+            await self.queue.put(_DONE)
+        except Exception as e:
+            await self.queue.put(e)
+
+    def cancel(self):
+        self.task.cancel()
+
+
+class HedgedLlm(BaseLlm):
+    """Sends each request to `primary` and hedges to `secondary` when it is slow.
+
+    If the primary has not produced its first response within the hedge
+    deadline, the same request goes to the secondary as well, and whichever
+    responds first wins. The deadline is the p95 of the primary's recent
+    time to first response, clamped to [min_hedge_delay, max_hedge_delay],
+    so only the slow tail gets hedged.
+
+    With stream=True the first response is the first chunk, so the deadline
+    is about time to first token. With stream=False it is the whole
+    completion, so long answers look slow and the deadline covers the full
+    generation. The two modes keep separate latency windows.
+
+    A primary that loses the race is not cancelled straight away: it runs
+    until its first response (at most max_hedge_delay) so its latency is
+    still sampled. Recording only the calls the primary won would leave the
+    slow tail out of the p95.
+
+    An error before the first response fails over to the other provider
+    (starting it if needed). Once a provider has streamed output the
+    response is committed to it, and later errors are raised.
+    """
+
+    primary: BaseLlm
+    secondary: BaseLlm
+    model: str = "hedged"
+    initial_hedge_delay: float = 3.0
+    min_hedge_delay: float = 0.5
+    max_hedge_delay: float = 15.0
+    window: int = 200
+    min_samples: int = 20
+
+    _latencies: dict = PrivateAttr(default=None)
+    _observers: set = PrivateAttr(default=None)
+    _stats: dict = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        # stream flag -> recent primary times to first response
+        self._latencies = {False: deque(maxlen=self.window), True: deque(maxlen=self.window)}
+        self._observers = set()
+        self._stats = {"calls": 0, "hedged": 0, "secondary_wins": 0, "failovers": 0, "errors": 0}
+
+    @property
+    def stats(self):
+        return self._stats
+
+    @property
+    def capabilities(self):
+        return self.primary.capabilities
+
+    def hedge_delay(self, stream=False):
+        """Seconds to wait for the primary's first response before hedging."""
+        latencies = self._latencies[stream]
+        if len(latencies) < self.min_samples:
+            return self.initial_hedge_delay
+        ordered = sorted(latencies)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        return min(self.max_hedge_delay, max(self.min_hedge_delay, p95))
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False
+                                     ) -> AsyncGenerator[LlmResponse, None]:
+        self.stats["calls"] += 1
+        primary = _Attempt(self.primary, llm_request, stream)
+        started = [primary]
+        running = [primary]
+        deadline = primary.started + self.hedge_delay(stream)
+        winner = first = last_error = None
+        getters = {}
+        try:
+            while winner is None:
+                if not running:
+                    raise last_error
+                hedging = len(started) == 1
+                timeout = max(0.0, deadline - time.perf_counter()) if hedging else None
+                getters = {asyncio.ensure_future(attempt.queue.get()): attempt for attempt in running}
+                done, not_done = await asyncio.wait(getters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for getter in not_done:
+                    getter.cancel()
+
+                if not done:
+                    self.stats["hedged"] += 1
+                    print(f"--- Hedge: no response from {self.primary.model} after "
+                          f"{time.perf_counter() - primary.started:.2f}s, also asking {self.secondary.model} ---")
+                    running.append(self._start_secondary(llm_request, stream, started))
+                    continue
+
+                for getter in done:
+                    if winner is not None:
+                        break
+                    attempt, item = getters[getter], getter.result()
+                    if item is _DONE or isinstance(item, Exception):
+                        # Failed before answering: fail over to the other provider.
+                        running.remove(attempt)
+                        last_error = item if item is not _DONE else RuntimeError(
+                            f"{attempt.model.model} returned no response")
+                        print(f"--- Hedge: {attempt.model.model} failed: {last_error!r} ---")
+                        self.stats["errors"] += 1
+                        if len(started) == 1:
+                            running.append(self._start_secondary(llm_request, stream, started))
+                        # Only the primary failing moves the request; a failed hedge leaves it where it was.
+                        if attempt is primary and running:
+                            self.stats["failovers"] += 1
+                    else:
+                        winner, first = attempt, item
+
+            if winner is primary:
+                self._latencies[stream].append(time.perf_counter() - primary.started)
+            else:
+                self.stats["secondary_wins"] += 1
+                primary_getter = next((g for g, attempt in getters.items() if attempt is primary), None)
+                if primary_getter is not None and primary_getter.done() and not primary_getter.cancelled():
+                    # Both answered in the same wakeup; the primary's response is already here.
+                    if primary_getter.result() is not _DONE and not isinstance(primary_getter.result(), Exception):
+                        self._latencies[stream].append(time.perf_counter() - primary.started)
+                elif primary in running:
+                    self._observe_loser(primary, stream)
+                    started.remove(primary)
+            for attempt in running:
+                if attempt is not winner and attempt in started:
+                    attempt.cancel()
+
+            yield first
+            while True:
+                item = await winner.queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # A cancelled caller can leave queue.get() getters pending; don't leak them.
+            for getter in getters:
+                getter.cancel()
+            for attempt in started:
+                attempt.cancel()
+
+    def _observe_loser(self, attempt, stream):
+        """Sample the losing primary's time to first response, then cancel it."""
+        async def observe():
+            try:
+                timeout = max(0.0, attempt.started + self.max_hedge_delay - time.perf_counter())
+                item = await asyncio.wait_for(attempt.queue.get(), timeout)
+                if item is not _DONE and not isinstance(item, Exception):
+                    self._latencies[stream].append(time.perf_counter() - attempt.started)
+            except asyncio.TimeoutError:
+                # Slower than any deadline we would use; counts as the cap.
+                self._latencies[stream].append(time.perf_counter() - attempt.started)
+            finally:
+                attempt.cancel()
+
+        task = asyncio.ensure_future(observe())
+        self._observers.add(task)
+        task.add_done_callback(self._observers.discard)
+
+    def _start_secondary(self, llm_request, stream, started):
+        attempt = _Attempt(self.secondary, llm_request, stream)
+        started.append(attempt)
+        return attempt
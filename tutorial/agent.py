@@ -7,6 +7,7 @@ from google.adk.models.lite_llm import LiteLlm # For multi-model support
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 from google.genai import types 
+from weather_backend.backend import weather_backend
 
 warnings.filterwarnings("ignore")
 logging.basicConfig(level=logging.ERROR)
@@ -49,19 +50,12 @@ def get_weather(city: str) -> dict:
             If 'error', includes an 'error_message' key.
     """
     print(f"--- Tool: get_weather called for city: {city} ---") # Log tool execution
-    city_normalized = city.lower().replace(" ", "") # Basic normalization
+    match = weather_backend.resolve(city) # Also resolves typos and aliases like "NYC"
 
-    # Mock weather data
-    mock_weather_db = {
-        "newyork": {"status": "success", "report": "The weather in New York is sunny with a temperature of 25°C."},
-        "london": {"status": "success", "report": "It's cloudy in London with a temperature of 15°C."},
-        "tokyo": {"status": "success", "report": "Tokyo is experiencing light rain and a temperature of 18°C."},
-    }
-
-    if city_normalized in mock_weather_db:
-        return mock_weather_db[city_normalized]
+    if match is not None:
+        return match.tool_result(match.report.celsius)
     else:
-        return {"status": "error", "error_message": f"Sorry, I don't have weather information for '{city}'."}
+        return weather_backend.error_result(city, f"Sorry, I don't have weather information for '{city}'.")
 
 # Example tool usage (optional test)
 print(get_weather("New York"))
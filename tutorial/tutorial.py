@@ -1,3 +1,4 @@
+# Run from the repo root, which holds weather_backend/: PYTHONPATH=. python tutorial/tutorial.py
 import uuid
 import asyncio
 from dotenv import load_dotenv
@@ -7,6 +8,8 @@ from google.genai import types
 from google.adk.models.lite_llm import LiteLlm
 from google.adk.sessions import InMemorySessionService
 
+from weather_backend.backend import weather_backend
+
 load_dotenv()
 
 session_service = InMemorySessionService()
@@ -56,19 +59,12 @@ def get_weather(city: str) -> dict:
             If 'error', includes an 'error_message' key.
     """
     print(f"--- Tool: get_weather called for city: {city} ---") # Log tool execution
-    city_normalized = city.lower().replace(" ", "") # Basic normalization
-
-    # Mock weather data
-    mock_weather_db = {
-        "newyork": {"status": "success", "report": "The weather in New York is sunny with a temperature of 25°C."},
-        "london": {"status": "success", "report": "It's cloudy in London with a temperature of 15°C."},
-        "tokyo": {"status": "success", "report": "Tokyo is experiencing light rain and a temperature of 18°C."},
-    }
+    match = weather_backend.resolve(city) # Also resolves typos and aliases like "NYC"
 
-    if city_normalized in mock_weather_db:
-        return mock_weather_db[city_normalized]
+    if match is not None:
+        return match.tool_result(match.report.celsius)
     else:
-        return {"status": "error", "error_message": f"Sorry, I don't have weather information for '{city}'."}
+        return weather_backend.error_result(city, f"Sorry, I don't have weather information for '{city}'.")
 
 
 
@@ -1,21 +1,25 @@
 from config import MODEL_GPT_4O
 from google.adk.agents import Agent
-from agents.greeting_agent.agent import greeting_agent
+from agents.greeting_agent.agent import greeting_agent, say_hello
 from google.adk.models.lite_llm import LiteLlm
-from agents.farwell_agent.agent import farewell_agent
+from agents.farwell_agent.agent import farewell_agent, say_goodbye
+from utils.intent_router import IntentRouter
+from weather_backend.backend import weather_backend
+
 
 def get_weather(city: str) -> dict:
-    city_normalized = city.lower().replace(" ", "")
-    mock_weather_db = {
-        "newyork": {"status": "success", "report": "Sunny in New York, 25°C"},
-        "london": {"status": "success", "report": "Cloudy in London, 15°C"},
-        "tokyo": {"status": "success", "report": "Rainy in Tokyo, 18°C"},
-    }
-    return mock_weather_db.get(city_normalized, {
-        "status": "error",
-        "error_message": f"Sorry, I don't have weather info for {city}."
-    })
+    match = weather_backend.resolve(city)
+    if match is not None:
+        return match.tool_result(match.report.celsius)
+    return weather_backend.error_result(city, f"Sorry, I don't have weather info for {city}.")
+
 
+# "Hi!" and "Thanks, bye!" are answered locally instead of costing a routing
+# call plus the sub-agent's calls; anything less certain goes to the LLM.
+intent_router = IntentRouter(
+    handlers={"greeting": say_hello, "farewell": say_goodbye},
+    agent_names={"greeting": "greeting_agent", "farewell": "farewell_agent"},
+)
 
 if greeting_agent and farewell_agent:
     root_agent_model = MODEL_GPT_4O 
@@ -34,7 +38,9 @@ if greeting_agent and farewell_agent:
                     "For anything else, respond appropriately or state you cannot handle it.",
         tools=[get_weather], # Root agent still needs the weather tool for its core task
         # Key change: Link the sub-agents here!
-        sub_agents=[greeting_agent, farewell_agent]
+        sub_agents=[greeting_agent, farewell_agent],
+        before_agent_callback=intent_router.before_agent_callback,
+        after_agent_callback=intent_router.after_agent_callback,
     )
     print(f"✅ Root Agent '{weather_agent_team.name}' created using model '{root_agent_model}' with sub-agents: {[sa.name for sa in weather_agent_team.sub_agents]}")
 
@@ -1,7 +1,9 @@
+# Run from this directory with the repo root (weather_backend/, agent_streaming.py) on the path:
+#   PYTHONPATH=.. python main.py
 import asyncio
 from utils.interaction import call_agent_async
 from config import APP_NAME, USER_ID, SESSION_ID
-from agents.weather_agent.agent import weather_agent_team
+from agents.weather_agent.agent import intent_router, weather_agent_team
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 
@@ -37,6 +39,7 @@ async def main():
         user_id=USER_ID,
         session_id=SESSION_ID
     )
+    print(f"\n--- Router: {intent_router.summary()} ---")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,9 +1,13 @@
 from config import MODEL_GPT_4O
 from google.adk.agents import Agent
-from agents.greeting_agent.agent import greeting_agent
+from agents.greeting_agent.agent import greeting_agent, say_hello
 from google.adk.models.lite_llm import LiteLlm
 from google.adk.tools.tool_context import ToolContext
-from agents.farwell_agent.agent import farewell_agent
+from agents.farwell_agent.agent import farewell_agent, say_goodbye
+from utils.intent_router import IntentRouter
+from sessions.compaction import history_compactor
+from weather_backend.backend import weather_backend
+
 
 def get_weather_stateful(city: str, tool_context: ToolContext) -> dict:
     """Retrieves weather, converts temp unit based on session state."""
@@ -13,42 +17,31 @@ def get_weather_stateful(city: str, tool_context: ToolContext) -> dict:
     preferred_unit = tool_context.state.get("user_preference_temperature_unit", "Celsius") # Default to Celsius
     print(f"--- Tool: Reading state 'user_preference_temperature_unit': {preferred_unit} ---")
 
-    city_normalized = city.lower().replace(" ", "")
-
-    # Mock weather data (always stored in Celsius internally)
-    mock_weather_db = {
-        "newyork": {"temp_c": 25, "condition": "sunny"},
-        "london": {"temp_c": 15, "condition": "cloudy"},
-        "tokyo": {"temp_c": 18, "condition": "light rain"},
-    }
-
-    if city_normalized in mock_weather_db:
-        data = mock_weather_db[city_normalized]
-        temp_c = data["temp_c"]
-        condition = data["condition"]
+    # Reports are precomputed in both units; typos and aliases like "NYC" resolve too
+    match = weather_backend.resolve(city)
 
-        # Format temperature based on state preference
-        if preferred_unit == "Fahrenheit":
-            temp_value = (temp_c * 9/5) + 32 # Calculate Fahrenheit
-            temp_unit = "°F"
-        else: # Default to Celsius
-            temp_value = temp_c
-            temp_unit = "°C"
-
-        report = f"The weather in {city.capitalize()} is {condition} with a temperature of {temp_value:.0f}{temp_unit}."
-        result = {"status": "success", "report": report}
+    if match is not None:
+        data = match.report
+        result = match.tool_result(data.text(preferred_unit))
         print(f"--- Tool: Generated report in {preferred_unit}. Result: {result} ---")
 
-        tool_context.state["last_city_checked_stateful"] = city
-        print(f"--- Tool: Updated state 'last_city_checked_stateful': {city} ---")
+        tool_context.state["last_city_checked_stateful"] = data.city
+        print(f"--- Tool: Updated state 'last_city_checked_stateful': {data.city} ---")
 
         return result
     else:
         error_msg = f"Sorry, I don't have weather information for '{city}'."
         print(f"--- Tool: City '{city}' not found. ---")
-        return {"status": "error", "error_message": error_msg}
+        return weather_backend.error_result(city, error_msg)
+
 
 
+# "Hi!" and "Thanks, bye!" are answered locally instead of costing a routing
+# call plus the sub-agent's calls; anything less certain goes to the LLM.
+intent_router = IntentRouter(
+    handlers={"greeting": say_hello, "farewell": say_goodbye},
+    agent_names={"greeting": "greeting_agent", "farewell": "farewell_agent"},
+)
 
 if greeting_agent and farewell_agent:
     root_agent_model = MODEL_GPT_4O 
@@ -68,7 +61,11 @@ if greeting_agent and farewell_agent:
         tools=[get_weather_stateful], # Root agent still needs the weather tool for its core task
         # Key change: Link the sub-agents here!
         sub_agents=[greeting_agent, farewell_agent],
-        output_key="last_weather_report"
+        output_key="last_weather_report",
+        # Old turns are folded into a summary before each model call.
+        before_model_callback=history_compactor.before_model_callback,
+        before_agent_callback=intent_router.before_agent_callback,
+        after_agent_callback=intent_router.after_agent_callback,
     )
     print(f"✅ Root Agent '{weather_agent_team.name}' created using model '{root_agent_model}' with sub-agents: {[sa.name for sa in weather_agent_team.sub_agents]}")
 
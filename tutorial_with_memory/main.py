@@ -1,9 +1,13 @@
+# Run from this directory with the repo root (weather_backend/, agent_streaming.py) on the path:
+#   PYTHONPATH=.. python main.py
 import asyncio
 from utils.interaction import call_agent_async
 from config import APP_NAME, USER_ID, SESSION_ID
-from agents.weather_agent.agent import weather_agent_team
+from agents.weather_agent.agent import intent_router, weather_agent_team
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
+from sessions.eviction import EvictingSessionService
+from sessions.compaction import history_compactor
+from sessions.state_delta import StateDelta, StateConflictError, apply_state_delta
 
 initial_state = {
     "user_preference_temperature_unit": "Celsius"
@@ -12,7 +16,8 @@ initial_state = {
 
 async def main():
     print("\n--- Testing Agent Team Delegation ---")
-    session_service = InMemorySessionService()
+    # Idle sessions spill to disk instead of living in memory forever.
+    session_service = EvictingSessionService(max_sessions=1000, ttl_seconds=1800)
     await session_service.create_session(
         app_name=APP_NAME,
         user_id=USER_ID,
@@ -36,17 +41,20 @@ async def main():
         session_id=SESSION_ID
     )
 
-    # 2. Manually update state preference to Fahrenheit - DIRECTLY MODIFY STORAGE
-    print("\n--- Manually Updating State: Setting unit to Fahrenheit ---")
+    # 2. Update state preference to Fahrenheit through a state-delta event
+    print("\n--- Updating State: Setting unit to Fahrenheit ---")
     try:
-        stored_session = session_service.sessions[APP_NAME][USER_ID][SESSION_ID]
-        stored_session.state["user_preference_temperature_unit"] = "Fahrenheit"
-        
-        print(f"--- Stored session state updated. Current 'user_preference_temperature_unit': {stored_session.state.get('user_preference_temperature_unit', 'Not Set')} ---") # Added .get for safety
-    except KeyError:
-        print(f"--- Error: Could not retrieve session '{SESSION_ID}' from internal storage for user '{USER_ID}' in app '{APP_NAME}' to update state. Check IDs and if session was created. ---")
-    except Exception as e:
-            print(f"--- Error updating internal session state: {e} ---")
+        session = await session_service.get_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+        version, written = await apply_state_delta(
+            session_service, APP_NAME, USER_ID, SESSION_ID,
+            StateDelta().set("user_preference_temperature_unit", "Fahrenheit"),
+            expected_version=session.last_update_time,
+        )
+        print(f"--- Session state updated: {written} (version {version:.6f}) ---")
+    except StateConflictError as e:
+        print(f"--- Session changed while updating, not applied: {e} ---")
+    except KeyError as e:
+        print(f"--- Error: {e} ---")
 
     print("\n--- Turn 2: Requesting weather in New York (expect Fahrenheit) ---")
     await call_agent_async(query= "Tell me the weather in New York.",
@@ -61,5 +69,11 @@ async def main():
         session_id=SESSION_ID
     )
 
+    stats = history_compactor.stats
+    print(f"\n--- Compaction: {stats['compacted']} of {stats['calls']} model calls compacted, "
+          f"~{history_compactor.tokens_saved()} tokens saved ---")
+    print(f"\n--- Router: {intent_router.summary()} ---")
+    session_service.close()
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,181 @@
+# sessions/compaction.py
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a token in characters; good enough to compare before/after.
+CHARS_PER_TOKEN = 4
+# Session state key holding the last model call's token numbers for that session.
+LAST_TURN_KEY = "compaction_last_turn"
+
+
+def estimate_tokens(contents):
+    chars = 0
+    for content in contents:
+        for part in content.parts or []:
+            if part.text:
+                chars += len(part.text)
+            elif part.function_call:
+                chars += len(part.function_call.name or "") + len(str(part.function_call.args or {}))
+            elif part.function_response:
+                chars += len(part.function_response.name or "") + len(str(part.function_response.response or {}))
+    return chars // CHARS_PER_TOKEN
+
+
+def is_user_turn(content):
+    """A turn starts at a user message with text (not a tool result)."""
+    return content.role == "user" and any(part.text for part in content.parts or [])
+
+
+def shorten(text, max_chars):
+    text = " ".join(text.split())
+    return text if len(text) <= max_chars else text[:max_chars - 3] + "..."
+
+
+def hash_contents(contents, hasher=None):
+    """Feed `contents` into a sha256 (a new one unless `hasher` is given) and return it."""
+    hasher = hasher or hashlib.sha256()
+    for content in contents:
+        hasher.update(content.model_dump_json(exclude_none=True).encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher
+
+
+def describe_turn(contents, max_chars):
+    """One summary line for a user turn: the question, the tools called and
+    the agent's last answer. Tool results are left out; the answer carries them."""
+    question, answer, calls = "", "", []
+    for content in contents:
+        for part in content.parts or []:
+            if part.function_call:
+                args = ", ".join(f"{k}={v}" for k, v in (part.function_call.args or {}).items())
+                calls.append(f"{part.function_call.name}({args})")
+            elif part.text and content.role == "user" and not question:
+                question = shorten(part.text, max_chars)
+            elif part.text and content.role != "user":
+                answer = shorten(part.text, max_chars)
+    line = f"- User: {question}"
+    if calls:
+        line += f" | tools: {', '.join(calls)}"
+    if answer:
+        line += f" | Agent: {answer}"
+    return line
+
+
+class HistoryCompactor:
+    """before_model_callback that folds old turns into a rolling summary.
+
+    Once the history sent to the model is over `trigger_tokens`, everything
+    before the last `keep_turns` user turns is replaced by a single summary
+    message, followed by the current values of `state_keys`. Cutting only at
+    user turns keeps every tool call next to its result.
+
+    The summary is rolling: lines for turns that were already folded are
+    cached per session and agent, so each call only describes the contents
+    that aged out since the previous one. Each cache entry records a hash of
+    the contents it summarized; if that prefix of the history has changed
+    (edited or rewound), the summary is rebuilt from scratch. The cache is
+    keyed by app, user, session and agent (session ids are only unique per
+    app and user) and holds the `max_sessions` most recently used entries.
+    `max_summary_chars` bounds the summary by dropping its oldest lines.
+
+    `stats` adds up every session; the numbers for a session's latest model
+    call are kept in its state under LAST_TURN_KEY.
+    """
+
+    def __init__(self, keep_turns=3, trigger_tokens=1500, state_keys=(), max_line_chars=120,
+                 max_summary_chars=2000, max_sessions=256):
+        self.keep_turns = keep_turns
+        self.trigger_tokens = trigger_tokens
+        self.state_keys = tuple(state_keys)
+        self.max_line_chars = max_line_chars
+        self.max_summary_chars = max_summary_chars
+        self.max_sessions = max_sessions
+        # (app, user, session id, agent name) -> (contents folded, their hash, summary lines),
+        # least recently used first
+        self._summaries = OrderedDict()
+        self.stats = {"calls": 0, "compacted": 0, "tokens_before": 0, "tokens_after": 0}
+
+    def before_model_callback(self, callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        contents = llm_request.contents
+        tokens_before = estimate_tokens(contents)
+        self.stats["calls"] += 1
+        self.stats["tokens_before"] += tokens_before
+
+        cut = self._cut_index(contents)
+        if tokens_before <= self.trigger_tokens or cut == 0:
+            self.stats["tokens_after"] += tokens_before
+            self._record_turn(callback_context.state, tokens_before, tokens_before)
+            return None
+
+        session = callback_context.session
+        key = (session.app_name, session.user_id, session.id, callback_context.agent_name)
+        folded, digest, lines = self._summaries.get(key, (0, None, []))
+        hasher = hash_contents(contents[:folded]) if folded <= cut else None
+        if hasher is None or hasher.digest() != digest:
+            # History shrank or was rewritten (e.g. a rewound session): start over.
+            folded, lines, hasher = 0, [], hashlib.sha256()
+        lines = list(lines)
+        turn_start = folded
+        for i in range(folded + 1, cut + 1):
+            if i == cut or is_user_turn(contents[i]):
+                lines.append(describe_turn(contents[turn_start:i], self.max_line_chars))
+                turn_start = i
+        while lines and sum(len(line) + 1 for line in lines) > self.max_summary_chars:
+            lines.pop(0)
+        hash_contents(contents[folded:cut], hasher)
+        self._summaries[key] = (cut, hasher.digest(), lines)
+        self._summaries.move_to_end(key)
+        while len(self._summaries) > self.max_sessions:
+            self._summaries.popitem(last=False)
+
+        compacted = [self._summary_content(lines, callback_context.state)] + contents[cut:]
+        tokens_after = estimate_tokens(compacted)
+        if tokens_after >= tokens_before:
+            tokens_after = tokens_before
+            compacted = contents
+        llm_request.contents = compacted
+        self.stats["compacted"] += compacted is not contents
+        self.stats["tokens_after"] += tokens_after
+        self._record_turn(callback_context.state, tokens_before, tokens_after)
+        if compacted is not contents:
+            logger.info("Compaction: %d -> %d tokens (%d old turns summarized)", tokens_before, tokens_after, len(lines))
+        return None
+
+    @staticmethod
+    def _record_turn(state, tokens_before, tokens_after):
+        state[LAST_TURN_KEY] = {"tokens_before": tokens_before, "tokens_after": tokens_after,
+                                "tokens_saved": tokens_before - tokens_after}
+
+    def tokens_saved(self):
+        return self.stats["tokens_before"] - self.stats["tokens_after"]
+
+    def _cut_index(self, contents):
+        """Index of the first content to keep verbatim (0 = nothing to fold)."""
+        seen = 0
+        for i in range(len(contents) - 1, -1, -1):
+            if is_user_turn(contents[i]):
+                seen += 1
+                if seen == self.keep_turns:
+                    return i
+        return 0
+
+    def _summary_content(self, lines, state):
+        text = "Summary of the earlier conversation:\n" + "\n".join(lines)
+        known = [(key, state.get(key)) for key in self.state_keys if state.get(key) is not None]
+        if known:
+            text += "\n\nCurrent session state:\n" + "\n".join(f"{key}: {value}" for key, value in known)
+        return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+history_compactor = HistoryCompactor(
+    keep_turns=3,
+    state_keys=("user_preference_temperature_unit", "last_city_checked_stateful", "last_weather_report"),
+)
@@ -0,0 +1,189 @@
+# sessions/eviction.py
+import hashlib
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+
+class EvictingSessionService(InMemorySessionService):
+    """InMemorySessionService that stops growing in long-running processes.
+
+    Resident sessions are kept in LRU order together with an estimate of
+    their size (the JSON length of the session plus each appended event, so
+    the budget is tracked incrementally rather than re-measured). A session
+    is spilled to `spill_dir` when it has been idle for `ttl_seconds`, or
+    when the process holds more than `max_sessions` sessions or
+    `max_bytes` of them; the least recently used go first. Spill files go
+    to a temp directory owned by the service unless `spill_dir` is given.
+    close() (or garbage collection) deletes the spill files, and with them
+    every spilled session; an owned temp directory is removed as well.
+
+    Spilled sessions are loaded back on the next get_session or
+    append_event, so callers never notice. App and user state stay in
+    memory: they are shared between sessions and small.
+    """
+
+    def __init__(self, spill_dir=None, max_sessions=1000, max_bytes=64 * 1024 * 1024, ttl_seconds=1800):
+        super().__init__()
+        # Spill files only mean something to the process that wrote them.
+        self._own_dir = None
+        if spill_dir is None:
+            self._own_dir = tempfile.TemporaryDirectory(prefix="adk-sessions-")
+            spill_dir = self._own_dir.name
+        self.spill_dir = spill_dir
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self._resident = OrderedDict()   # (app, user, session) -> [size, last access]
+        self._spilled = {}               # (app, user, session) -> file path
+        self.resident_bytes = 0
+        self.stats = {"evicted": 0, "expired": 0, "rehydrated": 0}
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        if session_id:
+            # A spilled session still exists; let the base class see it.
+            self._rehydrate((app_name, user_id, session_id.strip()))
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id)
+        stored = self.sessions[app_name][user_id][session.id]
+        key = (app_name, user_id, session.id)
+        self._touch(key, len(stored.model_dump_json(exclude_none=True)))
+        self._enforce_limits(keep=key)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id.strip() if session_id else session_id)
+        self._rehydrate(key)
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config)
+        if session is not None:
+            self._touch(key)
+            self._enforce_limits(keep=key)
+        return session
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        response = await super().list_sessions(app_name=app_name, user_id=user_id)
+        for (app, user, _), path in self._spilled.items():
+            if app == app_name and (user_id is None or user == user_id):
+                session = self._merge_state(app, user, self._read(path))
+                session.events = []
+                response.sessions.append(session)
+        response.sessions.sort(key=lambda s: (s.last_update_time, s.user_id, s.id))
+        return response
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id.strip() if session_id else session_id)
+        path = self._spilled.pop(key, None)
+        if path is not None:
+            os.remove(path)
+        self._forget(key)
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def append_event(self, session, event):
+        key = (session.app_name, session.user_id, session.id)
+        self._rehydrate(key)
+        event = await super().append_event(session=session, event=event)
+        if not event.partial:
+            self._touch(key, len(event.model_dump_json(exclude_none=True)))
+            self._enforce_limits(keep=key)
+        return event
+
+    def close(self):
+        """Delete the spill files (and the temp directory, if the service made it)."""
+        spilled, self._spilled = getattr(self, "_spilled", {}), {}
+        for path in spilled.values():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        own_dir, self._own_dir = getattr(self, "_own_dir", None), None
+        if own_dir is not None:
+            own_dir.cleanup()
+
+    def __del__(self):
+        self.close()
+
+    def _touch(self, key, added_bytes=0):
+        entry = self._resident.get(key)
+        if entry is None:
+            entry = self._resident[key] = [0, 0.0]
+        entry[0] += added_bytes
+        entry[1] = time.monotonic()
+        self.resident_bytes += added_bytes
+        self._resident.move_to_end(key)
+
+    def _forget(self, key):
+        entry = self._resident.pop(key, None)
+        if entry is not None:
+            self.resident_bytes -= entry[0]
+
+    def _enforce_limits(self, keep=None):
+        if self.ttl_seconds is not None:
+            cutoff = time.monotonic() - self.ttl_seconds
+            while self._resident:
+                key, (_, last_access) = next(iter(self._resident.items()))
+                if last_access > cutoff or key == keep:
+                    break
+                self._spill(key)
+                self.stats["expired"] += 1
+        # The session the caller just used is never the one evicted.
+        while len(self._resident) > 1 and (
+                (self.max_sessions is not None and len(self._resident) > self.max_sessions)
+                or (self.max_bytes is not None and self.resident_bytes > self.max_bytes)):
+            key = next(iter(self._resident))
+            if key == keep:
+                self._resident.move_to_end(key)
+                key = next(iter(self._resident))
+            self._spill(key)
+            self.stats["evicted"] += 1
+
+    def _spill(self, key):
+        app_name, user_id, session_id = key
+        user_sessions = self.sessions[app_name][user_id]
+        session = user_sessions.pop(session_id)
+        path = os.path.join(self.spill_dir, hashlib.sha1("\0".join(key).encode("utf-8")).hexdigest() + ".json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(session.model_dump_json(exclude_none=True))
+        os.replace(tmp_path, path)
+        self._spilled[key] = path
+        self._forget(key)
+        if not user_sessions:
+            del self.sessions[app_name][user_id]
+
+    def _rehydrate(self, key):
+        path = self._spilled.pop(key, None)
+        if path is None:
+            return
+        session = self._read(path)
+        os.remove(path)
+        app_name, user_id, session_id = key
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[session_id] = session
+        # Re-measure once on the way in; appends are counted incrementally again after this.
+        self._touch(key, len(session.model_dump_json(exclude_none=True)))
+        self.stats["rehydrated"] += 1
+
+    @staticmethod
+    def _read(path):
+        with open(path, encoding="utf-8") as f:
+            return Session.model_validate_json(f.read())
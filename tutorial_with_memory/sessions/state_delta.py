@@ -0,0 +1,131 @@
+# sessions/state_delta.py
+import asyncio
+import time
+import weakref
+from typing import Any, Optional
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+SET, DELETE, INCREMENT = "set", "delete", "increment"
+
+
+class StateConflictError(ValueError):
+    """The session changed since the version the caller read."""
+
+
+class StateDelta:
+    """A batch of state changes: set, delete and increment.
+
+    Only the touched keys are recorded, so applying a delta costs the size
+    of the change rather than the size of the state. Prefixed keys
+    ("user:", "app:") work as usual.
+
+        delta = StateDelta().set("user_preference_temperature_unit", "Fahrenheit").increment("unit_changes")
+
+    ADK state has no key removal; delete() stores None, which is how an
+    unset key reads through state.get(key).
+    """
+
+    def __init__(self):
+        self.ops = {}  # key -> (op, value); a later op on a key replaces the earlier one
+
+    def set(self, key: str, value: Any) -> "StateDelta":
+        self.ops[key] = (SET, value)
+        return self
+
+    def delete(self, key: str) -> "StateDelta":
+        self.ops[key] = (DELETE, None)
+        return self
+
+    def increment(self, key: str, by: int | float = 1) -> "StateDelta":
+        op, value = self.ops.get(key, (None, None))
+        if op == INCREMENT:
+            by += value
+        elif op == SET:
+            self.ops[key] = (SET, (value or 0) + by)
+            return self
+        elif op == DELETE:
+            # Counting up from a deleted key starts at 0, not at the stored value.
+            self.ops[key] = (SET, by)
+            return self
+        self.ops[key] = (INCREMENT, by)
+        return self
+
+    def __bool__(self):
+        return bool(self.ops)
+
+    def resolve(self, state) -> dict[str, Any]:
+        """The concrete {key: new value} this delta produces against `state`."""
+        resolved = {}
+        for key, (op, value) in self.ops.items():
+            if op == INCREMENT:
+                current = state.get(key) or 0
+                if not isinstance(current, (int, float)) or isinstance(current, bool):
+                    raise TypeError(f"Cannot increment state key '{key}' holding {type(current).__name__}")
+                value = current + value
+            resolved[key] = value
+        return resolved
+
+    def apply_to(self, state) -> dict[str, Any]:
+        """Apply to a live State, e.g. tool_context.state or callback_context.state.
+
+        ADK records each assignment in the current event's state_delta, so
+        the write is persisted with that event like any other tool write.
+        """
+        resolved = self.resolve(state)
+        for key, value in resolved.items():
+            state[key] = value
+        return resolved
+
+
+# One lock per session, so the version check and the append cannot
+# interleave with another coroutine in this process. Weak values: a lock
+# only lives while someone holds or waits on it.
+_session_locks = weakref.WeakValueDictionary()
+
+
+async def apply_state_delta(
+    session_service,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    delta: StateDelta,
+    expected_version: Optional[float] = None,
+    author: str = "system",
+) -> tuple[float, dict[str, Any]]:
+    """Apply `delta` to a stored session as one state-only event.
+
+    Goes through session_service.append_event, so every backend applies
+    and persists it the same way it does agent writes: all keys or none,
+    and only the changed keys are written. `expected_version` is a
+    session's last_update_time as read earlier; if the session has moved
+    on since, StateConflictError is raised and nothing is written.
+
+    Returns (new version, the resolved {key: value} that was written).
+    """
+    key = (app_name, user_id, session_id)
+    lock = _session_locks.get(key)
+    if lock is None:
+        lock = _session_locks[key] = asyncio.Lock()
+    async with lock:
+        # State and version only; the event history is not needed.
+        session = await session_service.get_session(app_name=app_name, user_id=user_id, session_id=session_id,
+                                                    config=GetSessionConfig(num_recent_events=0))
+        if session is None:
+            raise KeyError(f"Session '{session_id}' not found for user '{user_id}' in app '{app_name}'")
+        if expected_version is not None and session.last_update_time != expected_version:
+            raise StateConflictError(
+                f"Session '{session_id}' is at version {session.last_update_time}, expected {expected_version}")
+        resolved = delta.resolve(session.state)
+        if not resolved:
+            return session.last_update_time, resolved
+        event = Event(
+            invocation_id=f"state-{Event.new_id()}",
+            author=author,
+            actions=EventActions(state_delta=resolved),
+            # Always move the version forward, even if the clock has not ticked.
+            timestamp=max(time.time(), session.last_update_time + 1e-6),
+        )
+        await session_service.append_event(session, event)
+        return event.timestamp, resolved
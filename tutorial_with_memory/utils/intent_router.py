@@ -0,0 +1,148 @@
+import re
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+WORD_RE = re.compile(r"[a-z_']+")
+
+# Multi-word phrases are folded into one token before matching.
+PHRASES = {
+    "good morning": "good_morning",
+    "good afternoon": "good_afternoon",
+    "good evening": "good_evening",
+    "good night": "good_night",
+    "see you": "see_you",
+    "see ya": "see_you",
+    "take care": "take_care",
+    "talk later": "talk_later",
+    "have a good one": "take_care",
+}
+PHRASE_RE = re.compile(r"\b(" + "|".join(re.escape(phrase) for phrase in PHRASES) + r")\b")
+
+INTENT_WORDS = {
+    "greeting": {"hi", "hello", "hey", "heya", "hiya", "howdy", "greetings", "yo",
+                 "good_morning", "good_afternoon", "good_evening"},
+    "farewell": {"bye", "goodbye", "byebye", "cya", "farewell", "later", "see_you", "take_care",
+                 "talk_later", "good_night", "cheers"},
+}
+# Words that may accompany a greeting or farewell without changing what it is.
+FILLER_WORDS = {"there", "all", "everyone", "again", "and", "so", "much", "you", "thanks", "thank",
+                "ok", "okay", "great", "well", "for", "now", "then", "the", "help", "a", "lot", "oh"}
+
+# Estimate of what a delegated greeting/farewell costs: the coordinator's
+# routing call plus the sub-agent's tool call and its final answer. Shadow
+# mode measures the real figure; this is used until it has.
+LLM_CALLS_PER_DELEGATION = 3
+
+
+def classify(text):
+    """(intent, confidence) for a message; intent is None when nothing matched.
+
+    Confidence is the share of words that belong to the intent or are
+    filler, so "Hi!" scores 1.0 while "Hi, what's the weather in London?"
+    scores low and is left to the model.
+    """
+    text = PHRASE_RE.sub(lambda m: PHRASES[m.group(1)], (text or "").lower())
+    words = WORD_RE.findall(text)
+    if not words:
+        return None, 0.0
+    hits = {intent: sum(word in vocabulary for word in words) for intent, vocabulary in INTENT_WORDS.items()}
+    matched = [intent for intent, count in hits.items() if count]
+    if len(matched) != 1:
+        return None, 0.0
+    intent = matched[0]
+    covered = hits[intent] + sum(word in FILLER_WORDS for word in words)
+    return intent, covered / len(words)
+
+
+class IntentRouter:
+    """Answers trivial greetings and farewells locally, before the coordinator's LLM runs.
+
+    Use before_agent_callback on the coordinator. A message classified with
+    at least `threshold` confidence is answered by calling the intent's
+    handler (the sub-agent's tool) directly; anything else falls through to
+    the LLM router unchanged.
+
+    With shadow=True nothing is short-circuited: the router only records its
+    prediction, and after_agent_callback compares it with the sub-agent the
+    LLM actually delegated to and counts the LLM calls the delegation made.
+    The misroute rate is the share of would-be fast-path turns the LLM routed
+    differently. It is a pre-deployment metric: once the fast path is live,
+    those turns never reach the LLM, so there is nothing to compare against.
+    """
+
+    def __init__(self, handlers, agent_names, threshold=0.8, shadow=False):
+        self.handlers = handlers          # intent -> function returning the reply text
+        self.agent_names = agent_names    # intent -> sub-agent the LLM would delegate to
+        self.threshold = threshold
+        self.shadow = shadow
+        self._predictions = {}            # invocation id -> predicted intent (shadow mode)
+        self.stats = {"turns": 0, "fast_path": 0, "fallback": 0,
+                      "shadow_checked": 0, "misroutes": 0, "shadow_delegations": 0, "shadow_llm_calls": 0}
+
+    def before_agent_callback(self, callback_context: CallbackContext) -> Optional[types.Content]:
+        message = callback_context.user_content
+        text = " ".join(part.text for part in (message.parts if message else None) or [] if part.text)
+        intent, confidence = classify(text)
+        self.stats["turns"] += 1
+        if intent is None or confidence < self.threshold or intent not in self.handlers:
+            self.stats["fallback"] += 1
+            return None
+        if self.shadow:
+            self._predictions[callback_context.invocation_id] = intent
+            self.stats["fallback"] += 1
+            return None
+
+        reply = self.handlers[intent]()
+        self.stats["fast_path"] += 1
+        return types.Content(role="model", parts=[types.Part(text=reply)])
+
+    def after_agent_callback(self, callback_context: CallbackContext) -> Optional[types.Content]:
+        invocation_id = callback_context.invocation_id
+        if invocation_id not in self._predictions:
+            return None
+        predicted = self._predictions.pop(invocation_id)
+        authors = {event.author for event in callback_context.session.events if event.invocation_id == invocation_id}
+        chosen = next((intent for intent, name in self.agent_names.items() if name in authors), None)
+        self.stats["shadow_checked"] += 1
+        if predicted != chosen:
+            self.stats["misroutes"] += 1
+        else:
+            # One model response per LLM call; tool results and streamed
+            # chunks are not calls of their own.
+            self.stats["shadow_delegations"] += 1
+            self.stats["shadow_llm_calls"] += sum(
+                1 for event in callback_context.session.events
+                if event.invocation_id == invocation_id and event.author != "user"
+                and not event.partial and not event.get_function_responses())
+        return None
+
+    def misroute_rate(self):
+        checked = self.stats["shadow_checked"]
+        return self.stats["misroutes"] / checked if checked else 0.0
+
+    def llm_calls_per_delegation(self):
+        """LLM calls per delegated greeting/farewell: measured in shadow mode,
+        else the LLM_CALLS_PER_DELEGATION estimate."""
+        delegations = self.stats["shadow_delegations"]
+        if delegations:
+            return self.stats["shadow_llm_calls"] / delegations
+        return LLM_CALLS_PER_DELEGATION
+
+    def llm_calls_saved(self):
+        return self.stats["fast_path"] * self.llm_calls_per_delegation()
+
+    def summary(self):
+        stats = self.stats
+        if self.shadow:
+            text = f"shadow mode: {stats['shadow_checked']} of {stats['turns']} turns would have been answered locally"
+            if stats["shadow_checked"]:
+                text += f", misroute rate {self.misroute_rate():.1%}"
+            if stats["shadow_delegations"]:
+                text += f", {self.llm_calls_per_delegation():.1f} LLM calls per delegation (measured)"
+            return text
+        measured = "measured" if stats["shadow_delegations"] else "estimated"
+        return (f"{stats['fast_path']} of {stats['turns']} turns answered locally, "
+                f"~{self.llm_calls_saved():.0f} LLM calls saved "
+                f"({self.llm_calls_per_delegation():.1f} per delegation, {measured})")
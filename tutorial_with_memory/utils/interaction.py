@@ -1,9 +1,111 @@
+import asyncio
+import time
+
+from google.adk.sessions.base_session_service import GetSessionConfig
 from google.genai import types
 
-async def call_agent_async(query, runner, user_id, session_id):
+from agent_streaming import stream_agent_async
+
+async def call_agent_async(query, runner, user_id, session_id, verbose=True, stream=False):
+    """Runs one turn and returns the agent's final response text (None if it gave none).
+
+    With stream=True the answer is printed chunk by chunk as the model
+    produces it, followed by the time to first token and to the final answer.
+    """
+    if stream:
+        return await _print_streamed(query, runner, user_id, session_id, verbose)
     content = types.Content(role='user', parts=[types.Part(text=query)])
+    final_text = None
+    # Drain the whole run instead of breaking at the first final response, so the
+    # runner finishes the turn (and closes its generator) before the next one starts.
     async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
-        if event.is_final_response() and event.content and event.content.parts:
-            print(f"\nUser: {query}")
-            print(f"Agent: {event.content.parts[0].text}")
-            break
+        if event.is_final_response() and event.content and event.content.parts and final_text is None:
+            final_text = event.content.parts[0].text
+            if verbose:
+                print(f"\nUser: {query}")
+                print(f"Agent: {final_text}")
+    return final_text
+
+
+async def _print_streamed(query, runner, user_id, session_id, verbose):
+    timings = {}
+    chunks = []
+    if verbose:
+        print(f"\nUser: {query}")
+        print("Agent: ", end="", flush=True)
+    async for chunk in stream_agent_async(query, runner, user_id, session_id, timings=timings):
+        chunks.append(chunk)
+        if verbose:
+            print(chunk, end="", flush=True)
+    if verbose and timings:
+        print(f"\n--- first token {timings.get('time_to_first_token', 0):.2f}s, "
+              f"final {timings.get('time_to_final', 0):.2f}s ---")
+    return "".join(chunks) or None
+
+
+async def run_batch(runner, jobs, concurrency=8, create_sessions=True, verbose=False):
+    """Runs many (user_id, session_id, query) jobs against one runner.
+
+    Turns of the same session run one after another in job order, different
+    sessions run in parallel, and at most `concurrency` turns are in flight at
+    once. Missing sessions are created first when `create_sessions` is set.
+
+    Returns one result dict per job, in job order, with the response text,
+    the latency in seconds and the error (if the turn failed). With `verbose`
+    each turn and a latency summary are printed; print_batch_summary()
+    prints the summary on its own.
+    """
+    jobs = list(jobs)
+    results = [None] * len(jobs)
+    by_session = {}
+    for i, (user_id, session_id, _) in enumerate(jobs):
+        by_session.setdefault((user_id, session_id), []).append(i)
+
+    if create_sessions:
+        for user_id, session_id in by_session:
+            existing = await runner.session_service.get_session(
+                app_name=runner.app_name, user_id=user_id, session_id=session_id,
+                config=GetSessionConfig(num_recent_events=0))
+            if existing is None:
+                await runner.session_service.create_session(
+                    app_name=runner.app_name, user_id=user_id, session_id=session_id)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_session(indices):
+        for i in indices:
+            user_id, session_id, query = jobs[i]
+            async with semaphore:
+                start = time.perf_counter()
+                response, error = None, None
+                try:
+                    response = await call_agent_async(query, runner, user_id, session_id, verbose=verbose)
+                except Exception as e:
+                    error = repr(e)
+                results[i] = {
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "query": query,
+                    "response": response,
+                    "latency": time.perf_counter() - start,
+                    "error": error,
+                }
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(indices) for indices in by_session.values()))
+    if verbose:
+        print_batch_summary(results, time.perf_counter() - start)
+    return results
+
+
+def print_batch_summary(results, wall_seconds):
+    latencies = sorted(result["latency"] for result in results)
+    if not latencies:
+        return
+    errors = sum(1 for result in results if result["error"])
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+    print(f"\n--- Batch: {len(results)} turns in {wall_seconds:.2f}s ({errors} failed) | "
+          f"latency p50 {percentile(0.5):.2f}s p95 {percentile(0.95):.2f}s max {latencies[-1]:.2f}s ---")
@@ -0,0 +1,46 @@
+# tweet_ids.py
+import re
+
+STATUS_RE = re.compile(r"/status(?:es)?/(\d{1,19})")
+DIGITS_RE = re.compile(r"^\s*(\d{1,19})\s*$")
+
+INT64_MAX = 2 ** 63 - 1
+
+
+def tweet_id_from_url(url):
+    """Exact tweet id from an x.com / twitter.com status URL, or None."""
+    match = STATUS_RE.search(url or "")
+    return _checked(match.group(1)) if match else None
+
+
+def tweet_id_from_text(text):
+    """Exact tweet id from a string holding only digits, or None."""
+    match = DIGITS_RE.match(text or "")
+    return _checked(match.group(1)) if match else None
+
+
+def exact_tweet_id(tweet_id_property, url):
+    """Best exact id for a Notion row.
+
+    Notion `number` properties are doubles, which cannot hold 19-digit ids
+    (1933843969110315258 comes back as ...315300). So a text-typed tweet_id
+    property wins, then the id in the status URL, and only then the rounded
+    number.
+    """
+    prop = tweet_id_property or {}
+    for key in ("rich_text", "title"):
+        if prop.get(key):
+            exact = tweet_id_from_text("".join(part.get("plain_text") or part.get("text", {}).get("content", "")
+                                               for part in prop[key]))
+            if exact is not None:
+                return exact
+    exact = tweet_id_from_url(url)
+    if exact is not None:
+        return exact
+    number = prop.get("number")
+    return int(number) if number is not None else None
+
+
+def _checked(digits):
+    value = int(digits)
+    return value if 0 < value <= INT64_MAX else None
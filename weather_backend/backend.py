@@ -0,0 +1,182 @@
+# weather_backend/backend.py
+import json
+import os
+from abc import ABC, abstractmethod
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+from weather_backend.city_index import DEFAULT_ALIASES, RESOLVE_MIN_SCORE, CityIndex, normalize_city
+
+
+class Observation(NamedTuple):
+    city: str
+    temp_c: float
+    condition: str
+
+
+class Report(NamedTuple):
+    """Everything a weather tool returns for one city, formatted ahead of time."""
+    city: str
+    condition: str
+    temp_c: float
+    temp_f: float
+    celsius: str
+    fahrenheit: str
+    both: str
+
+    def text(self, unit="Celsius"):
+        return self.fahrenheit if unit == "Fahrenheit" else self.celsius
+
+
+class Match(NamedTuple):
+    """A report and how well its city matched the name that was asked for."""
+    report: Report
+    score: float
+    exact: bool
+
+    def tool_result(self, text):
+        """Success dict for a weather tool. A fuzzy or alias match names the
+        city it used and the score, so a substitution is never silent."""
+        result = {"status": "success", "report": text}
+        if not self.exact:
+            result["resolved_city"] = self.report.city
+            result["match_score"] = self.score
+        return result
+
+
+DEFAULT_OBSERVATIONS = (
+    Observation("New York", 25, "sunny"),
+    Observation("London", 15, "cloudy"),
+    Observation("Tokyo", 18, "light rain"),
+)
+
+
+class WeatherProvider(ABC):
+    """Where the weather data comes from: a real API, a file, or a fixed table."""
+
+    @abstractmethod
+    def load(self) -> list[Observation]:
+        """Current observations for every city the provider knows."""
+
+
+class StaticProvider(WeatherProvider):
+    """A fixed table of observations, the tutorials' mock data by default."""
+
+    def __init__(self, observations=DEFAULT_OBSERVATIONS):
+        self.observations = list(observations)
+
+    def load(self):
+        return list(self.observations)
+
+
+class JsonFileProvider(WeatherProvider):
+    """Observations from a JSON file, a local stand-in for a weather API.
+
+        {"New York": {"temp_c": 25, "condition": "sunny"}, ...}
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        return [Observation(city, entry["temp_c"], entry["condition"]) for city, entry in data.items()]
+
+
+def make_report(observation):
+    temp_f = observation.temp_c * 9 / 5 + 32
+    prefix = f"The weather in {observation.city} is {observation.condition} with a temperature of"
+    return Report(
+        city=observation.city,
+        condition=observation.condition,
+        temp_c=observation.temp_c,
+        temp_f=temp_f,
+        celsius=f"{prefix} {observation.temp_c:.0f}°C.",
+        fahrenheit=f"{prefix} {temp_f:.0f}°F.",
+        both=f"{prefix} {observation.temp_c:.0f}°C ({temp_f:.0f}°F).",
+    )
+
+
+class WeatherBackend:
+    """Loads a provider's data once and serves ready-made reports.
+
+    Reports are keyed by normalised city name in a read-only mapping; names
+    that miss (typos, aliases) go through the CityIndex. Each query string
+    is resolved once and remembered (up to `memo_size` of them), so a repeat
+    call is a single dict lookup. reload() builds a fresh snapshot and swaps
+    it in with one assignment, so readers never see a half-built one.
+    """
+
+    def __init__(self, provider: WeatherProvider, aliases=DEFAULT_ALIASES, min_score=RESOLVE_MIN_SCORE,
+                 memo_size=4096):
+        self.provider = provider
+        self.aliases = aliases
+        self.min_score = min_score
+        self.memo_size = memo_size
+        self.reload()
+
+    def reload(self):
+        reports = {}
+        for observation in self.provider.load():
+            reports[normalize_city(observation.city)] = make_report(observation)
+        index = CityIndex([report.city for report in reports.values()], aliases=self.aliases)
+        self._snapshot = (MappingProxyType(reports), index, {})
+
+    @property
+    def reports(self):
+        return self._snapshot[0]
+
+    @property
+    def index(self):
+        return self._snapshot[1]
+
+    def __len__(self):
+        return len(self.reports)
+
+    def resolve(self, city) -> Optional[Match]:
+        """The report for `city`, tolerating typos and aliases; None if unknown."""
+        reports, index, memo = self._snapshot
+        try:
+            return memo[city]
+        except (KeyError, TypeError):
+            pass
+        key = normalize_city(city or "")
+        report = reports.get(key)
+        match = Match(report, 1.0, True) if report is not None else None
+        if match is None:
+            found = index.resolve(city or "", min_score=self.min_score)
+            if found:
+                match = Match(reports[normalize_city(found[0])], found[1], False)
+        if isinstance(city, str):
+            if len(memo) >= self.memo_size:
+                memo.clear()
+            memo[city] = match
+        return match
+
+    def suggestions(self, city, limit=3):
+        """Known cities close to `city`, for an error that resolve() would not guess past."""
+        return [name for name, _ in self.index.lookup(city or "", limit=limit)]
+
+    def error_result(self, city, message):
+        """Error dict for a weather tool, with "suggestions" when some city is close."""
+        result = {"status": "error", "error_message": message}
+        suggestions = self.suggestions(city)
+        if suggestions:
+            result["suggestions"] = suggestions
+            result["error_message"] += f" Did you mean {' or '.join(suggestions)}?"
+        return result
+
+    def lookup(self, city) -> Optional[Report]:
+        """Like resolve(), without the match details."""
+        match = self.resolve(city)
+        return match.report if match is not None else None
+
+
+def load_backend(path=None):
+    """A backend over the JSON file at `path`, or over the built-in mock data."""
+    return WeatherBackend(JsonFileProvider(path) if path else StaticProvider())
+
+
+# Shared by every weather tool. Set WEATHER_DATA_PATH to serve a JSON file instead.
+weather_backend = load_backend(os.getenv("WEATHER_DATA_PATH"))
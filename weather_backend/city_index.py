@@ -0,0 +1,162 @@
+# weather_backend/city_index.py
+import re
+import unicodedata
+
+import numpy as np
+
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+# Common nicknames, abbreviations and exonyms. Only aliases whose target is
+# in the index are used.
+DEFAULT_ALIASES = {
+    "nyc": "New York",
+    "new york city": "New York",
+    "ny": "New York",
+    "big apple": "New York",
+    "manhattan": "New York",
+    "ldn": "London",
+    "londres": "London",
+    "tokio": "Tokyo",
+    "la": "Los Angeles",
+    "sf": "San Francisco",
+    "frisco": "San Francisco",
+    "dam": "Amsterdam",
+    "mokum": "Amsterdam",
+}
+
+
+# lookup() lists anything this close as a suggestion...
+SUGGEST_MIN_SCORE = 0.6
+# ...but resolve() only answers for a city when the match is this good and
+# this far ahead of the next one. "Newark" is 0.71 from New York: a different
+# place, not a typo.
+RESOLVE_MIN_SCORE = 0.8
+RESOLVE_MARGIN = 0.1
+
+
+def normalize_city(name):
+    """Accent-free, lowercase letters and digits only: "São Paulo" -> "saopaulo"."""
+    name = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode("ascii")
+    return NON_ALNUM_RE.sub("", name.lower())
+
+
+def trigrams(key):
+    """Distinct trigrams of a normalized key, padded so short names still have some."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, max_distance=None):
+    """Levenshtein distance with adjacent transpositions ("lnodon" -> "london" is 1).
+
+    With `max_distance`, gives up as soon as the distance must exceed it
+    and returns max_distance + 1.
+    """
+    if a == b:
+        return 0
+    if max_distance is None:
+        max_distance = max(len(a), len(b))
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = previous[j - 1] + cost
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class CityIndex:
+    """Typo-tolerant city name lookup.
+
+    Exact names and aliases resolve through a dict. Everything else goes
+    through a trigram index: postings are kept as CSR arrays (the cities of
+    trigram t are _cities[_offsets[t]:_offsets[t + 1]]), so counting shared
+    trigrams for every city is one np.bincount over the query's postings.
+    The best `candidates` by trigram overlap are then re-scored by edit
+    distance, which decides the final score in [0, 1].
+    """
+
+    def __init__(self, names, aliases=DEFAULT_ALIASES, candidates=20):
+        self.names = list(dict.fromkeys(names))
+        self.keys = [normalize_city(name) for name in self.names]
+        self.candidates = candidates
+        self.exact = {key: i for i, key in enumerate(self.keys)}
+        for alias, target in (aliases or {}).items():
+            target_id = self.exact.get(normalize_city(target))
+            if target_id is not None:
+                self.exact.setdefault(normalize_city(alias), target_id)
+
+        vocabulary = {}
+        gram_ids, city_ids = [], []
+        for city_id, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                gram_ids.append(vocabulary.setdefault(gram, len(vocabulary)))
+                city_ids.append(city_id)
+        gram_ids = np.asarray(gram_ids, dtype=np.int32)
+        self.vocabulary = vocabulary
+        self.gram_counts = np.bincount(np.asarray(city_ids, dtype=np.int64), minlength=len(self.keys)).astype(np.int32)
+        self._cities = np.asarray(city_ids, dtype=np.int32)[np.argsort(gram_ids, kind="stable")]
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(gram_ids, minlength=len(vocabulary)))))
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, query, limit=5, min_score=SUGGEST_MIN_SCORE):
+        """Best matches for `query` as [(name, score)], highest score first."""
+        key = normalize_city(query)
+        if not key:
+            return []
+        city_id = self.exact.get(key)
+        if city_id is not None:
+            return [(self.names[city_id], 1.0)]
+
+        query_grams = [self.vocabulary[gram] for gram in trigrams(key) if gram in self.vocabulary]
+        if not query_grams:
+            return []
+        postings = np.concatenate([self._cities[self._offsets[g]:self._offsets[g + 1]] for g in query_grams])
+        candidates, shared = np.unique(postings, return_counts=True)
+        # Dice coefficient between the query's trigrams and each candidate's.
+        dice = 2.0 * shared / (len(trigrams(key)) + self.gram_counts[candidates])
+        if len(candidates) > self.candidates:
+            top = np.argpartition(-dice, self.candidates - 1)[:self.candidates]
+            candidates, dice = candidates[top], dice[top]
+
+        # Best trigram overlap first; each edit distance is cut off at the
+        # worst distance that could still make it into the results.
+        order = np.argsort(-dice, kind="stable")
+        scored = []
+        for city_id, overlap in zip(candidates[order].tolist(), dice[order].tolist()):
+            candidate = self.keys[city_id]
+            length = max(len(key), len(candidate))
+            bound = int((1.0 - min_score) * length)
+            if len(scored) >= limit:
+                bound = min(bound, int((1.0 - scored[limit - 1][0]) * length))
+            distance = edit_distance(key, candidate, bound)
+            if distance > bound:
+                continue
+            scored.append((1.0 - distance / length, overlap, city_id))
+            scored.sort(reverse=True)
+        return [(self.names[city_id], round(score, 3)) for score, _, city_id in scored[:limit]]
+
+    def resolve(self, query, min_score=RESOLVE_MIN_SCORE, margin=RESOLVE_MARGIN):
+        """The best (name, score) for `query`, or None when nothing is close
+        enough or the runner-up is within `margin` of it (ambiguous)."""
+        matches = self.lookup(query, limit=2, min_score=max(0.0, min_score - margin))
+        if not matches or matches[0][1] < min_score:
+            return None
+        if len(matches) > 1 and matches[0][1] < 1.0 and matches[0][1] - matches[1][1] < margin:
+            return None
+        return matches[0]